@@ -0,0 +1,220 @@
+import asyncio
+import functools
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Literal, Optional
+
+import numpy as np
+from fastapi import FastAPI, HTTPException
+from pydantic import BaseModel, Field
+
+import game
+import game_ai
+from game_bitboard import ONE_KET, PSI, ZERO_KET, from_string_board, to_string_board, validate_bits
+from game_store import get_game_service
+from bb84_simulation import (
+    MAX_BB84_BITS, QBER_ABORT_THRESHOLD, bb84_protocol, distill_key, estimate_qber, expected_qber
+)
+from circuit_builder import build_circuit, choose_builder_method, measure_circuit
+from entanglement_circuits import bell_circuit, run_circuit, superposition_circuit
+from simulator_backends import MAX_SIMULATION_BYTES, estimate_memory_bytes
+
+API_WORKERS = int(os.environ.get("QUANTUM_API_WORKERS", os.cpu_count() or 1))
+API_MAX_PENDING = int(os.environ.get("QUANTUM_API_MAX_PENDING", 4 * API_WORKERS))
+MAX_SHOTS = 10**6
+
+app = FastAPI(title="Quantum Tic Tac Toe & Quantum Computing Demos")
+
+# Simulator jobs run on a fixed pool of threads; at most API_MAX_PENDING may be queued or
+# running, beyond that requests get 503 instead of piling up behind the event loop
+_executor = ThreadPoolExecutor(max_workers=API_WORKERS, thread_name_prefix="simulator")
+_admission = threading.BoundedSemaphore(API_MAX_PENDING)
+
+
+async def run_job(fn, *args, **kwargs):
+    """Runs a blocking simulator call in the worker pool, or fails fast with 503 when the pool is saturated."""
+    if not _admission.acquire(blocking=False):
+        raise HTTPException(503, "The simulator is busy, retry later", headers={"Retry-After": "1"})
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_executor, functools.partial(fn, *args, **kwargs))
+    except ValueError as e:
+        raise HTTPException(422, str(e))
+    finally:
+        _admission.release()
+
+
+# --- Game ---
+
+class MoveRequest(BaseModel):
+    move: int = Field(ge=1, le=9)
+    opponent: Literal["random", "expectimax"] = "random"
+
+
+Cell = Literal[ZERO_KET, ONE_KET, PSI]
+
+
+class BoardRequest(BaseModel):
+    board: List[List[Cell]]
+
+
+def _game_json(game_id, state):
+    return {
+        "game_id": game_id,
+        "board": to_string_board(state.board).tolist(),
+        "available_moves": state.available_moves,
+        "player_moves": state.player_moves,
+        "computer_moves": state.computer_moves,
+        "game_over": state.game_over,
+        "message": state.message,
+    }
+
+
+def _load_game(game_id):
+    state = get_game_service().load(game_id)
+    if state is None:
+        raise HTTPException(404, f"Unknown game {game_id}")
+    return state
+
+
+def _play_round(game_id, move, opponent):
+    """The user's move and, if the game goes on, the computer's reply."""
+    service = get_game_service()
+    state = service.play(game_id, move, game.get_bit_pool().get_bit())
+    if not state.game_over:
+        if opponent == "expectimax":
+            comp_move = game_ai.ai_move(state.board)
+        else:
+            comp_move = int(np.random.choice(state.available_moves))
+        state = service.play(game_id, comp_move, game.get_bit_pool().get_bit())
+    return state
+
+
+@app.post("/games")
+async def new_game():
+    game_id = get_game_service().new_game()
+    return _game_json(game_id, _load_game(game_id))
+
+
+@app.get("/games/{game_id}")
+async def get_game(game_id: str):
+    return _game_json(game_id, _load_game(game_id))
+
+
+@app.post("/games/{game_id}/moves")
+async def play_move(game_id: str, request: MoveRequest):
+    state = _load_game(game_id)
+    if state.game_over:
+        raise HTTPException(409, "The game is already over")
+    if request.move not in state.available_moves:
+        raise HTTPException(409, f"Position {request.move} is already taken")
+    # Drawing the collapse may refill the quantum bit pool on the simulator
+    try:
+        state = await run_job(_play_round, game_id, request.move, request.opponent)
+    except KeyError:
+        # Evicted (or deleted) between the check above and the move
+        raise HTTPException(404, f"Unknown game {game_id}")
+    return _game_json(game_id, state)
+
+
+@app.post("/validate")
+async def validate(request: BoardRequest):
+    # Ragged rows would not make a (3, 3) array, so check the lengths before converting
+    if len(request.board) != 3 or any(len(row) != 3 for row in request.board):
+        raise HTTPException(422, "board must be a 3x3 array of '|0>', '|1>' or '|ψ>'")
+    status, message = validate_bits(from_string_board(request.board))
+    return {"status": status, "message": message}
+
+
+# --- BB84 ---
+
+class BB84Request(BaseModel):
+    num_bits: int = Field(50, ge=1, le=MAX_BB84_BITS)
+    method: Literal["numpy", "circuit"] = "numpy"
+    eve_rate: float = Field(0.0, ge=0, le=1)
+    noise: float = Field(0.0, ge=0, le=1)
+    seed: Optional[int] = None
+    distill: bool = True
+
+
+def _bb84(request):
+    start = time.perf_counter()
+    result = bb84_protocol(request.num_bits, method=request.method, seed=request.seed,
+                           eve_rate=request.eve_rate, noise=request.noise)
+    qber = estimate_qber(result, seed=request.seed)
+    response = {
+        "num_bits": request.num_bits,
+        "sifted_bits": len(result["key"]),
+        "qber": qber["qber"],
+        "expected_qber": expected_qber(request.eve_rate, request.noise),
+        "sampled_bits": qber["sampled_bits"],
+        "aborted": qber["qber"] > QBER_ABORT_THRESHOLD,
+    }
+    if request.distill and not response["aborted"]:
+        distilled = distill_key(result, qber)
+        response.update({
+            "final_bits": distilled["final_bits"],
+            "corrected_bits": distilled["corrected_bits"],
+            "leaked_bits": distilled["leaked_bits"],
+            "key_hex": distilled["key"].tobytes().hex(),
+        })
+    response["seconds"] = time.perf_counter() - start
+    return response
+
+
+@app.post("/bb84")
+async def bb84(request: BB84Request):
+    return await run_job(_bb84, request)
+
+
+# --- Circuits ---
+
+class Gate(BaseModel):
+    gate: str
+    qubits: List[int]
+    angle: Optional[float] = None  # radians, for rx, ry, rz and p
+
+
+class CircuitRequest(BaseModel):
+    num_qubits: int = Field(ge=1)
+    gates: List[Gate] = []
+    shots: int = Field(1000, ge=1, le=MAX_SHOTS)
+    mode: Literal["sampling", "exact"] = "sampling"
+
+
+def _measure(request):
+    gates = [(g.gate, g.qubits) if g.angle is None else (g.gate, g.qubits, g.angle) for g in request.gates]
+    qc = build_circuit(request.num_qubits, gates)
+    method = choose_builder_method(qc, request.mode)
+    memory = estimate_memory_bytes(qc, method)
+    if memory > MAX_SIMULATION_BYTES:
+        raise ValueError(f"The circuit needs about {memory / 2**30:.1f} GiB with the {method} method")
+
+    start = time.perf_counter()
+    counts, _ = measure_circuit(qc, request.shots, mode=request.mode, method=method)
+    return {"counts": counts, "method": method, "seconds": time.perf_counter() - start}
+
+
+@app.post("/circuits/measure")
+async def measure(request: CircuitRequest):
+    return await run_job(_measure, request)
+
+
+# --- Superposition & entanglement demos ---
+
+DEMO_CIRCUITS = {"superposition": superposition_circuit, "bell": bell_circuit}
+
+
+@app.get("/demos/{demo}")
+async def demo(demo: Literal["superposition", "bell"], shots: int = 1000, seed: Optional[int] = None):
+    if not 1 <= shots <= MAX_SHOTS:
+        raise HTTPException(422, f"shots must be between 1 and {MAX_SHOTS}")
+    counts = await run_job(run_circuit, DEMO_CIRCUITS[demo](), shots=shots, use_cache=True, seed=seed)
+    return {"demo": demo, "shots": shots, "counts": counts}
+
+
+@app.get("/health")
+async def health():
+    return {"workers": API_WORKERS, "max_pending": API_MAX_PENDING}
@@ -1,22 +1,10 @@
 import streamlit as st
 import numpy as np
-from game import get_random_value, validate
-import game_instructions
-import game_about
-import bit_vs_qubit
-import quantum_cryptography_qkd
-import quantum_gates_circuits
-import superpostion_entanglement
-
-# Initialize session state
-if 'board' not in st.session_state:
-    st.session_state.board = np.full((3, 3), '|ψ>')
-    st.session_state.available_moves = list(range(1, 10))
-    st.session_state.game_over = False
-    st.session_state.player_moves = []
-    st.session_state.computer_moves = []
-
-psi = '|ψ>'
+import page_registry
+from game_bitboard import to_string_board
+
+# Page modules (and qiskit, matplotlib, pandas behind them) are imported on first use
+page_registry.record_startup()
 
 # Sidebar menu
 menu = [
@@ -25,97 +13,85 @@ menu = [
         "Superposition and Entanglement", "Quantum Cryptography"
         ]
 choice = st.sidebar.selectbox("Menu", menu)
+st.sidebar.toggle(
+    "Lightweight charts",
+    key="native_charts",
+    help="Draw histograms with Streamlit's native charts instead of matplotlib images."
+)
 
 if choice == "Play Game":
-    st.title("Quantum Tic Tac Toe")
+    game = page_registry.load_module("game")
+    game_ai = page_registry.load_module("game_ai")
+    game_store = page_registry.load_module("game_store")
+    service = game_store.get_game_service()
+
+    # The game id lives in the URL, so a refresh or a bookmark resumes the game
+    game_id = st.query_params.get("game")
+    state = service.load(game_id)
+    if state is None:
+        game_id = service.new_game()
+        st.query_params["game"] = game_id
+        state = service.load(game_id)
 
-    if st.session_state.game_over:
-        st.warning("Game Over! Refresh to play again.")
-        st.dataframe(st.session_state.board)
-        st.stop()
+    st.title("Quantum Tic Tac Toe")
 
-    st.markdown("You: ``|1>`` | Computer: ``|0>``")
+    if st.button("New Game"):
+        st.query_params["game"] = service.new_game()
+        st.rerun()
 
-    move = st.selectbox("Choose your move (1–9):", st.session_state.available_moves)
+    if state.game_over:
+        st.success(state.message)
+        st.warning("Game Over! Start a new game to play again.")
+        st.dataframe(to_string_board(state.board))
+    else:
+        st.markdown("You: ``|1>`` | Computer: ``|0>``")
+        opponent = st.radio(
+            "Computer opponent", ["Random", "Expectimax AI"], key="opponent", horizontal=True,
+            help="The AI picks the cell with the best expected outcome over the |0>/|1> collapse."
+        )
 
-    if st.button("Submit Move"):
-        row = (move - 1) // 3
-        col = (move - 1) % 3
+        move = st.selectbox("Choose your move (1–9):", state.available_moves)
 
-        if st.session_state.board[row][col] == psi:
+        if st.button("Submit Move"):
             # User's move
-            user_value = get_random_value()
-            st.session_state.board[row][col] = user_value
-            st.session_state.player_moves.append(move)
-
-            status, message = validate(st.session_state.board)
-            if status == 0:
-                st.success(message)
-                st.session_state.game_over = True
-                st.dataframe(st.session_state.board)
-                st.stop()
-
-            # Computer's move
-            comp_move = None
-            comp_row = comp_col = -1
-
-            while True:
-                comp_move = np.random.randint(1, 10)
-                comp_row = (comp_move - 1) // 3
-                comp_col = (comp_move - 1) % 3
-                if st.session_state.board[comp_row][comp_col] == psi:
-                    comp_value = get_random_value()
-                    st.session_state.board[comp_row][comp_col] = comp_value
-                    st.session_state.computer_moves.append(comp_move)
-                    break
-
-            status, message = validate(st.session_state.board)
-            if status == 0:
-                st.success(message)
-                st.session_state.game_over = True
-
-            # Remove used move
-            st.session_state.available_moves.remove(move)
+            state = service.play(game_id, move, game.get_bit_pool().get_bit())
+
+            # Computer's move: a policy-table lookup for the AI, otherwise a random free cell
+            if not state.game_over:
+                if opponent == "Expectimax AI":
+                    comp_move = game_ai.ai_move(state.board)
+                else:
+                    comp_move = int(np.random.choice(state.available_moves))
+                service.play(game_id, comp_move, game.get_bit_pool().get_bit())
 
             # Rerun to reflect changes
             st.rerun()
-        else:
-            st.error("Position already taken. Choose another.")
 
-    # Always display current board
-    st.dataframe(st.session_state.board)
+        # Always display current board
+        st.dataframe(to_string_board(state.board))
 
     # Display last move
-    if st.session_state.player_moves:
-        last_player_move = st.session_state.player_moves[-1]
+    if state.player_moves:
+        last_player_move = state.player_moves[-1]
         st.markdown(f"You: ``|1>`` chose position → ``{last_player_move}``")
 
-    if st.session_state.computer_moves:
-        last_comp_move = st.session_state.computer_moves[-1]
+    if state.computer_moves:
+        last_comp_move = state.computer_moves[-1]
         st.markdown(f"Computer: ``|0>`` placed at → ``{last_comp_move}``")
 
     # Display full move history
-    if st.session_state.player_moves or st.session_state.computer_moves:
+    if state.player_moves or state.computer_moves:
         st.markdown("### Move History")
-        for i in range(max(len(st.session_state.player_moves), len(st.session_state.computer_moves))):
-            p_move = st.session_state.player_moves[i] if i < len(st.session_state.player_moves) else "---"
-            c_move = st.session_state.computer_moves[i] if i < len(st.session_state.computer_moves) else "---"
+        for i in range(max(len(state.player_moves), len(state.computer_moves))):
+            p_move = state.player_moves[i] if i < len(state.player_moves) else "---"
+            c_move = state.computer_moves[i] if i < len(state.computer_moves) else "---"
             st.markdown(f"Player: ``{p_move}`` | Computer: ``{c_move}``")
 
-elif choice == "Game Instructions":
-    game_instructions.show_instructions()
-
-elif choice == "About Game":
-    game_about.show_about()
-
-elif choice == "Classical Bit vs Qubit":
-    bit_vs_qubit.display_bits_vs_qubits()
-
-elif choice == "Quantum Gates and Circuits":
-    quantum_gates_circuits.display_quantum_gates_circuit()
-
-elif choice == "Superposition and Entanglement":
-    superpostion_entanglement.display_superposition_entanglement()
+        with st.expander("Replay"):
+            boards = service.replay(game_id)
+            step = st.slider("Placement", 1, len(boards), len(boards)) if len(boards) > 1 else 1
+            st.dataframe(to_string_board(boards[step - 1]))
+            st.caption(f"Game `{game_id}` is stored in {len(state.history)} bytes.")
 
-elif choice == "Quantum Cryptography":
-    quantum_cryptography_qkd.display_quantum_cryptography()
\ No newline at end of file
+else:
+    page_registry.load_page(choice)()
\ No newline at end of file
@@ -0,0 +1,316 @@
+import random
+import time
+
+import numpy as np
+from qiskit import QuantumCircuit
+
+from qkd_postprocessing import frame_arguments, merge_frames, pack_bits, postprocess_frame
+from simulator_backends import get_backend
+from transpile_cache import cached_transpile
+
+MAX_BB84_BITS = 10**6
+MAX_CIRCUIT_BITS = 10**4  # the circuit engine simulates every qubit, keep it small
+CIRCUIT_WIDTH = 64  # qubits packed into each circuit of the single batched job
+QBER_ABORT_THRESHOLD = 0.11  # above this, BB84 cannot distil a secure key
+SWEEP_CHUNK_SIZE = 2**20  # qubits simulated per batch in eavesdropper sweeps
+
+
+# --- BB84 Simulation Functions ---
+def _eve_intercepts(rng, num_bits, eve_rate):
+    """Picks which qubits Eve intercepts and the bases she measures them in."""
+    intercepted = rng.random(num_bits) < eve_rate
+    eve_bases = rng.integers(0, 2, num_bits, dtype=np.uint8)
+    return intercepted, eve_bases
+
+
+def _measure_bb84_numpy(rng, alice_bits, alice_bases, bob_bases, eve_rate=0.0, noise=0.0):
+    """
+    Closed-form measurement outcomes for a batch of qubits.
+
+    Measuring in the basis the qubit was prepared in returns the prepared bit,
+    any other basis returns a fair coin flip. An intercept-resend Eve measures
+    in a random basis and re-prepares what she saw, and the channel flips each
+    of Bob's results with probability noise.
+    """
+    num_bits = len(alice_bits)
+    sent_bits = alice_bits
+    sent_bases = alice_bases
+
+    if eve_rate > 0:
+        intercepted, eve_bases = _eve_intercepts(rng, num_bits, eve_rate)
+        eve_coins = rng.integers(0, 2, num_bits, dtype=np.uint8)
+        eve_bits = np.where(eve_bases == alice_bases, alice_bits, eve_coins)
+        sent_bits = np.where(intercepted, eve_bits, alice_bits)
+        sent_bases = np.where(intercepted, eve_bases, alice_bases)
+
+    coin_flips = rng.integers(0, 2, num_bits, dtype=np.uint8)
+    bob_bits = np.where(sent_bases == bob_bases, sent_bits, coin_flips)
+
+    if noise > 0:
+        bob_bits ^= (rng.random(num_bits) < noise).astype(np.uint8)
+    return bob_bits
+
+
+def _measure_bb84_circuits(rng, alice_bits, alice_bases, bob_bases, eve_rate=0.0, noise=0.0):
+    """
+    Encodes and measures every qubit on the simulator in a single job.
+    Qubits are packed CIRCUIT_WIDTH at a time into wide circuits; since the
+    circuits only use X, H and measurements they run on the stabilizer method.
+    Eve's intercept-resend is a mid-circuit measurement in her basis.
+    """
+    num_bits = len(alice_bits)
+    intercepted, eve_bases = _eve_intercepts(rng, num_bits, eve_rate)
+
+    circuits = []
+    for start in range(0, num_bits, CIRCUIT_WIDTH):
+        width = min(CIRCUIT_WIDTH, num_bits - start)
+        qc = QuantumCircuit(width, width)
+        for q in range(width):
+            i = start + q
+            if alice_bits[i] == 1:
+                qc.x(q)
+            if alice_bases[i] == 1:  # X-basis: apply Hadamard
+                qc.h(q)
+            if intercepted[i]:
+                # Eve measures in her basis and resends the collapsed state
+                if eve_bases[i] == 1:
+                    qc.h(q)
+                qc.measure(q, q)
+                if eve_bases[i] == 1:
+                    qc.h(q)
+            if bob_bases[i] == 1:
+                qc.h(q)
+        qc.measure(range(width), range(width))
+        circuits.append(qc)
+
+    backend = get_backend("bb84")
+    result = backend.run(circuits, shots=1, memory=True).result()
+
+    bob_bits = np.empty(num_bits, dtype=np.uint8)
+    for index, start in enumerate(range(0, num_bits, CIRCUIT_WIDTH)):
+        # Memory strings put clbit 0 on the right
+        bits = result.get_memory(index)[0][::-1]
+        bob_bits[start:start + len(bits)] = np.frombuffer(bits.encode(), dtype=np.uint8) - ord('0')
+
+    if noise > 0:
+        bob_bits ^= (rng.random(num_bits) < noise).astype(np.uint8)
+    return bob_bits
+
+
+def bb84_protocol(num_bits=50, method="numpy", seed=None, eve_rate=0.0, noise=0.0):
+    """
+    Simulates the BB84 exchange for num_bits qubits (up to MAX_BB84_BITS).
+
+    method="numpy" computes the outcomes in closed form, method="circuit" runs
+    every qubit on the simulator in one batched job. eve_rate is the fraction
+    of qubits an intercept-resend eavesdropper measures, noise the probability
+    that the channel flips one of Bob's results.
+
+    Returns a dict of NumPy arrays with the same keys as before
+    (alice_bits, alice_bases, bob_bits, bob_bases, key, matching_bases), plus
+    bob_key, Bob's half of the sifted key.
+    """
+    if not 1 <= num_bits <= MAX_BB84_BITS:
+        raise ValueError(f"num_bits must be between 1 and {MAX_BB84_BITS}")
+    if not (0 <= eve_rate <= 1 and 0 <= noise <= 1):
+        raise ValueError("eve_rate and noise must be probabilities")
+
+    rng = np.random.default_rng(seed)
+
+    # Alice generates random bits and bases, Bob picks his bases (0 = Z-basis, 1 = X-basis)
+    alice_bits = rng.integers(0, 2, num_bits, dtype=np.uint8)
+    alice_bases = rng.integers(0, 2, num_bits, dtype=np.uint8)
+    bob_bases = rng.integers(0, 2, num_bits, dtype=np.uint8)
+
+    if method == "numpy":
+        bob_bits = _measure_bb84_numpy(rng, alice_bits, alice_bases, bob_bases, eve_rate, noise)
+    elif method == "circuit":
+        if num_bits > MAX_CIRCUIT_BITS:
+            raise ValueError(f"The circuit engine supports at most {MAX_CIRCUIT_BITS} bits")
+        bob_bits = _measure_bb84_circuits(rng, alice_bits, alice_bases, bob_bases, eve_rate, noise)
+    else:
+        raise ValueError(f"Unknown BB84 method: {method}")
+
+    # Compare bases and extract matching key
+    matching_bases = np.flatnonzero(alice_bases == bob_bases)
+    key = alice_bits[matching_bases]
+
+    return {
+        "alice_bits": alice_bits,
+        "alice_bases": alice_bases,
+        "bob_bits": bob_bits,
+        "bob_bases": bob_bases,
+        "key": key,
+        "bob_key": bob_bits[matching_bases],
+        "matching_bases": matching_bases
+    }
+
+
+def estimate_qber(result, sample_fraction=0.25, seed=None):
+    """
+    Sacrifices a random subset of the sifted key to estimate the quantum bit
+    error rate. Returns a dict with the estimate, the number of sampled and
+    mismatched bits, and the indices (into the sifted key) of the bits kept.
+    """
+    key = result["key"]
+    bob_key = result["bob_key"]
+
+    rng = np.random.default_rng(seed)
+    sampled = rng.random(len(key)) < sample_fraction
+    errors = int(np.count_nonzero(key[sampled] != bob_key[sampled]))
+    num_sampled = int(np.count_nonzero(sampled))
+
+    return {
+        "qber": errors / num_sampled if num_sampled else 0.0,
+        "sampled_bits": num_sampled,
+        "errors": errors,
+        "kept_indices": np.flatnonzero(~sampled)
+    }
+
+
+def distillation_frames(result, qber):
+    """
+    Returns the postprocess_frame arguments for the sifted bits that
+    estimate_qber did not sacrifice, and how many bits that is.
+    """
+    alice_packed, kept_bits = pack_bits(result["key"][qber["kept_indices"]])
+    bob_packed, _ = pack_bits(result["bob_key"][qber["kept_indices"]])
+    # Never assume a perfect channel: the sampled estimate can be 0 for short keys
+    pp_qber = max(qber["qber"], 0.01)
+    return list(frame_arguments(alice_packed, bob_packed, kept_bits, pp_qber)), kept_bits
+
+
+def distill_key(result, qber):
+    """
+    Runs error correction and privacy amplification on the sifted bits that
+    estimate_qber did not sacrifice. Returns the final key (packed) with its
+    length and the Cascade statistics summed over all frames.
+    """
+    frames, kept_bits = distillation_frames(result, qber)
+    return {**merge_frames(postprocess_frame(*args) for args in frames), "kept_bits": kept_bits}
+
+
+def expected_qber(eve_rate, noise=0.0):
+    """Theoretical QBER: an intercepted sifted bit is wrong 25% of the time, then the channel flips with probability noise."""
+    eve_error = 0.25 * eve_rate
+    return eve_error * (1 - noise) + (1 - eve_error) * noise
+
+
+def sweep_eve_rates(num_bits, eve_rates, noise=0.0, sample_fraction=0.25, chunk_size=SWEEP_CHUNK_SIZE, seed=None):
+    """
+    Runs num_bits qubits (up to MAX_BB84_BITS) through BB84 for each
+    eavesdropping rate and yields one QBER estimate per rate as soon as it is
+    ready, so callers can stream results. Qubits are simulated in batches of
+    chunk_size to bound memory.
+    """
+    if not 1 <= num_bits <= MAX_BB84_BITS:
+        raise ValueError(f"num_bits must be between 1 and {MAX_BB84_BITS}")
+    rng = np.random.default_rng(seed)
+
+    for eve_rate in eve_rates:
+        start = time.perf_counter()
+        sifted = sampled = errors = 0
+
+        for offset in range(0, num_bits, chunk_size):
+            n = min(chunk_size, num_bits - offset)
+            alice_bits = rng.integers(0, 2, n, dtype=np.uint8)
+            alice_bases = rng.integers(0, 2, n, dtype=np.uint8)
+            bob_bases = rng.integers(0, 2, n, dtype=np.uint8)
+            bob_bits = _measure_bb84_numpy(rng, alice_bits, alice_bases, bob_bases, eve_rate, noise)
+
+            same_basis = alice_bases == bob_bases
+            check = same_basis & (rng.random(n) < sample_fraction)
+            sifted += int(np.count_nonzero(same_basis))
+            sampled += int(np.count_nonzero(check))
+            errors += int(np.count_nonzero(check & (alice_bits != bob_bits)))
+
+        yield {
+            "eve_rate": float(eve_rate),
+            "qber": errors / sampled if sampled else 0.0,
+            "expected_qber": expected_qber(eve_rate, noise),
+            "sifted_bits": sifted,
+            "sampled_bits": sampled,
+            "errors": errors,
+            "seconds": time.perf_counter() - start
+        }
+
+
+def bb84_protocol_loop(num_bits=50):
+    """Original per-qubit implementation (one simulator job per qubit), kept as the benchmark reference."""
+    # Alice generates random bits and bases
+    alice_bits = [random.randint(0, 1) for _ in range(num_bits)]
+    alice_bases = [random.randint(0, 1) for _ in range(num_bits)]  # 0 = Z-basis, 1 = X-basis
+
+    # Alice encodes her bits into qubits
+    qubits = []
+    for bit, basis in zip(alice_bits, alice_bases):
+        qc = QuantumCircuit(1, 1)
+        if bit == 1:
+            qc.x(0)
+        if basis == 1:  # X-basis: apply Hadamard
+            qc.h(0)
+        qubits.append(qc)
+
+    # Bob measures using his randomly chosen bases
+    bob_bases = [random.randint(0, 1) for _ in range(num_bits)]
+    bob_bits = []
+
+    backend = get_backend("default")
+
+    for i in range(num_bits):
+        qc = qubits[i].copy()
+        if bob_bases[i] == 1:
+            qc.h(0)
+        qc.measure(0, 0)
+
+        # Use the transpile cache and run instead of execute
+        compiled_qc = cached_transpile(qc, backend)
+        job = backend.run(compiled_qc, shots=1)
+        result = job.result()
+        counts = result.get_counts()
+
+        measured_bit = int(list(counts.keys())[0], 2)
+        bob_bits.append(measured_bit)
+
+    # Compare bases and extract matching key
+    key = []
+    matching_bases = []
+    for i in range(num_bits):
+        if alice_bases[i] == bob_bases[i]:
+            key.append(alice_bits[i])
+            matching_bases.append(i)
+
+    return {
+        "alice_bits": alice_bits,
+        "alice_bases": alice_bases,
+        "bob_bits": bob_bits,
+        "bob_bases": bob_bases,
+        "key": key,
+        "matching_bases": matching_bases
+    }
+
+
+def benchmark_bb84(sizes=(50, 500, 5000, 10**6), loop_limit=500):
+    """
+    Times the per-qubit loop against the batched circuit engine and the NumPy
+    engine. Engines that would be too slow for a size are skipped.
+    Returns one dict per size with the runtime in seconds for each engine.
+    """
+    engines = [
+        ("loop", bb84_protocol_loop, loop_limit),
+        ("circuit", lambda n: bb84_protocol(n, method="circuit"), MAX_CIRCUIT_BITS),
+        ("numpy", lambda n: bb84_protocol(n, method="numpy"), MAX_BB84_BITS),
+    ]
+
+    rows = []
+    for num_bits in sizes:
+        row = {"num_bits": num_bits}
+        for name, run, limit in engines:
+            if num_bits > limit:
+                row[name] = None
+                continue
+            start = time.perf_counter()
+            run(num_bits)
+            row[name] = time.perf_counter() - start
+        rows.append(row)
+    return rows
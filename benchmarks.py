@@ -0,0 +1,332 @@
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+DEFAULT_REPEAT = 20
+DEFAULT_TOLERANCE = 0.25  # allowed slowdown (or memory growth) before a result counts as a regression
+MIN_TIME_DELTA = 50e-6  # differences below 50 µs are timer noise
+MIN_MEMORY_DELTA = 64 * 1024
+BASELINE_PATH = "benchmark_baseline.json"
+
+# name -> (setup, repeat); setup() runs once, untimed, and returns the function to time
+BENCHMARKS = {}
+
+
+def benchmark(name, repeat=DEFAULT_REPEAT):
+    def register(setup):
+        BENCHMARKS[name] = (setup, repeat)
+        return setup
+    return register
+
+
+# --- Game ---
+
+@benchmark("game.quantum_superposition")
+def _quantum_superposition():
+    import game
+    return game.quantum_superposition
+
+
+@benchmark("game.validate", repeat=1000)
+def _validate():
+    import game
+    board = np.array([['|1>', '|0>', '|ψ>'], ['|0>', '|1>', '|ψ>'], ['|ψ>', '|ψ>', '|0>']])
+    return lambda: game.validate(board)
+
+
+# --- BB84 ---
+
+for _num_bits in (100, 10**4, 10**6):
+    @benchmark(f"bb84_protocol[numpy,{_num_bits}]", repeat=5 if _num_bits >= 10**6 else DEFAULT_REPEAT)
+    def _bb84_numpy(num_bits=_num_bits):
+        from bb84_simulation import bb84_protocol
+        return lambda: bb84_protocol(num_bits, method="numpy")
+
+for _num_bits in (100, 10**4):
+    @benchmark(f"bb84_protocol[circuit,{_num_bits}]", repeat=5)
+    def _bb84_circuit(num_bits=_num_bits):
+        from bb84_simulation import bb84_protocol
+        return lambda: bb84_protocol(num_bits, method="circuit")
+
+
+@benchmark("qkd_postprocessing[2^18 bits]", repeat=5)
+def _postprocessing():
+    from qkd_postprocessing import pack_bits, postprocess_frame
+    rng = np.random.default_rng(0)
+    alice = rng.integers(0, 2, 2**18, dtype=np.uint8)
+    bob = alice ^ (rng.random(2**18) < 0.03).astype(np.uint8)
+    alice_packed, num_bits = pack_bits(alice)
+    bob_packed, _ = pack_bits(bob)
+    return lambda: postprocess_frame(alice_packed, bob_packed, num_bits, 0.03, seed=1)
+
+
+# --- Circuit builder ---
+
+for _num_qubits in (1, 2, 5, 10, 15, 20):
+    @benchmark(f"measure_circuit[ghz,{_num_qubits}q]", repeat=10)
+    def _measure_circuit(num_qubits=_num_qubits):
+        from circuit_builder import build_circuit, measure_circuit
+        gates = [("h", [0])] + [("cx", [q, q + 1]) for q in range(num_qubits - 1)]
+        qc = build_circuit(num_qubits, gates)
+        return lambda: measure_circuit(qc, shots=1000)
+
+def _h_ccx_circuit(num_qubits):
+    from circuit_builder import build_circuit
+    gates = [("h", [q]) for q in range(num_qubits)]
+    if num_qubits >= 3:
+        gates.append(("ccx", [0, 1, 2]))
+    return build_circuit(num_qubits, gates)
+
+
+for _num_qubits in (2, 10, 20):
+    @benchmark(f"measure_circuit[h+ccx,{_num_qubits}q]", repeat=10)
+    def _measure_circuit_non_clifford(num_qubits=_num_qubits):
+        # A Toffoli rules out the stabilizer method: 2 and 10 qubits run on the
+        # NumPy engine, 20 qubits on Aer's matrix product state method
+        from circuit_builder import measure_circuit
+        qc = _h_ccx_circuit(num_qubits)
+        return lambda: measure_circuit(qc, shots=1000)
+
+
+@benchmark("measure_circuit[statevector,20q]", repeat=10)
+def _measure_circuit_statevector():
+    # Aer's statevector method and its transpile step, as exact mode and the method override use them
+    from circuit_builder import measure_circuit
+    qc = _h_ccx_circuit(20)
+    return lambda: measure_circuit(qc, shots=1000, method="statevector")
+
+
+@benchmark("circuit_optimizer[1000 gates,20q]")
+def _optimize_circuit():
+    # Random H/CX layers with redundant blocks: every H·CX·CX·H on the same qubits cancels out
+    from circuit_optimizer import PeepholeOptimizer
+    rng = np.random.default_rng(0)
+    gates = []
+    for q in rng.integers(0, 19, 250):
+        q = int(q)
+        if rng.random() < 0.5:
+            gates += [("h", [q]), ("cx", [q, q + 1]), ("cx", [q, q + 1]), ("h", [q])]
+        else:
+            gates += [("h", [q]), ("cx", [q, q + 1]), ("h", [q + 1]), ("cx", [q + 1, q])]
+
+    def optimize():
+        optimizer = PeepholeOptimizer(20)
+        for name, qubits in gates:
+            optimizer.append(name, qubits)
+        return optimizer
+    return optimize
+
+
+# --- Superposition & entanglement ---
+
+@benchmark("run_circuit[superposition]")
+def _superposition():
+    from entanglement_circuits import run_circuit, superposition_circuit
+    qc = superposition_circuit()
+    return lambda: run_circuit(qc)
+
+
+@benchmark("run_circuit[bell]")
+def _bell():
+    from entanglement_circuits import bell_circuit, run_circuit
+    qc = bell_circuit()
+    return lambda: run_circuit(qc)
+
+for _num_qubits in (50, 500):
+    @benchmark(f"ghz_parity_statistics[{_num_qubits}q]", repeat=5)
+    def _ghz(num_qubits=_num_qubits):
+        # As many shots as the page allows at this size
+        from entanglement_circuits import ghz_circuit, max_multiqubit_shots, parity_statistics, run_memory
+        qc = ghz_circuit(num_qubits, "x")
+        shots = min(1000, max_multiqubit_shots(num_qubits))
+        return lambda: parity_statistics(run_memory(qc, shots=shots))
+
+
+@benchmark("graph_state_stabilizers[ring,101q]", repeat=5)
+def _graph_state():
+    from entanglement_circuits import graph_edges, max_multiqubit_shots, stabilizer_expectations
+    edges = graph_edges("ring", 101)
+    shots = min(1000, max_multiqubit_shots(101))
+    return lambda: stabilizer_expectations(101, edges, shots=shots)
+
+
+# --- Noise ---
+
+def _ghz_measured(num_qubits):
+    from circuit_builder import build_circuit, measured_copy
+    gates = [("h", [0])] + [("cx", [q, q + 1]) for q in range(num_qubits - 1)]
+    return measured_copy(build_circuit(num_qubits, gates))
+
+
+for _num_qubits in (2, 6, 8):
+    @benchmark(f"noise.density_matrix[ghz,{_num_qubits}q]", repeat=5)
+    def _noise_density_matrix(num_qubits=_num_qubits):
+        from noise_simulation import NoiseModel, run_density_matrix
+        qc = _ghz_measured(num_qubits)
+        return lambda: run_density_matrix(qc, NoiseModel(0.01, 0.01, 0.01))
+
+for _workers in (1, None):
+    @benchmark(f"noise.trajectories[ghz,10q,{'all cores' if _workers is None else '1 worker'}]", repeat=3)
+    def _noise_trajectories(workers=_workers):
+        from job_queue import MAX_WORKERS
+        from noise_simulation import NoiseModel, run_trajectories
+        qc = _ghz_measured(10)
+        return lambda: run_trajectories(qc, NoiseModel(0.01, 0.01, 0.01), 2000, max_workers=workers or MAX_WORKERS)
+
+
+# --- Classical bit vs qubit ---
+
+for _shots in (10**4, 10**6):
+    @benchmark(f"compare_bits_vs_qubits[{_shots}]", repeat=10)
+    def _bits_vs_qubits(shots=_shots):
+        from bit_vs_qubit import compare_bits_vs_qubits
+        return lambda: [stats for stats in compare_bits_vs_qubits(shots, seed=0)]
+
+
+def run_benchmark(setup, repeat):
+    """
+    Times repeat calls (after one warm-up call) and reports latency
+    percentiles in seconds, then makes one more call under tracemalloc for
+    the peak Python memory it allocates.
+    """
+    fn = setup()
+    fn()
+
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        fn()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    times = np.array(times)
+    return {
+        "runs": repeat,
+        "mean": float(times.mean()),
+        "min": float(times.min()),
+        "p50": float(np.percentile(times, 50)),
+        "p90": float(np.percentile(times, 90)),
+        "p99": float(np.percentile(times, 99)),
+        "peak_memory_bytes": int(peak),
+    }
+
+
+def run_benchmarks(names=None, repeat=None):
+    """Runs the selected benchmarks (all by default). Returns the report as a dict."""
+    results = {}
+    for name, (setup, default_repeat) in BENCHMARKS.items():
+        if names and not any(n in name for n in names):
+            continue
+        try:
+            results[name] = run_benchmark(setup, repeat or default_repeat)
+        except Exception as e:
+            results[name] = {"error": f"{type(e).__name__}: {e}"}
+    return {
+        "names": list(names or []),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "time": time.time(),
+        "results": results,
+    }
+
+
+def compare(report, baseline, tolerance=DEFAULT_TOLERANCE):
+    """
+    Compares the median latency and peak memory of every benchmark with the
+    baseline. Returns rows of (name, p50 ratio, memory ratio, regressed).
+    A benchmark that fails, or a baseline one this run left out, is a
+    regression with both ratios None.
+    """
+    rows = []
+    for name, result in report["results"].items():
+        base = baseline["results"].get(name)
+        if "error" in result:
+            rows.append((name, None, None, True))
+            continue
+        if base is None or "error" in base:
+            continue
+        time_ratio = result["p50"] / base["p50"] if base["p50"] else float("inf")
+        memory_ratio = result["peak_memory_bytes"] / max(base["peak_memory_bytes"], 1)
+        slower = time_ratio > 1 + tolerance and result["p50"] - base["p50"] > MIN_TIME_DELTA
+        bigger = (memory_ratio > 1 + tolerance
+                  and result["peak_memory_bytes"] - base["peak_memory_bytes"] > MIN_MEMORY_DELTA)
+        rows.append((name, time_ratio, memory_ratio, slower or bigger))
+
+    names = report.get("names")
+    for name in baseline["results"]:
+        if name not in report["results"] and (not names or any(n in name for n in names)):
+            rows.append((name, None, None, True))
+    return rows
+
+
+def _format_seconds(seconds):
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:8.1f} µs"
+    if seconds < 1:
+        return f"{seconds * 1e3:8.2f} ms"
+    return f"{seconds:8.3f} s "
+
+
+def print_report(report):
+    print(f"{'benchmark':<36} {'p50':>11} {'p90':>11} {'p99':>11} {'peak mem':>10}")
+    for name, result in report["results"].items():
+        if "error" in result:
+            print(f"{name:<36} error: {result['error']}")
+            continue
+        print(f"{name:<36} {_format_seconds(result['p50'])} {_format_seconds(result['p90'])} "
+              f"{_format_seconds(result['p99'])} {result['peak_memory_bytes'] / 2**20:7.2f} MiB")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Times every simulation hot path, headless.")
+    parser.add_argument("names", nargs="*", help="only run benchmarks whose name contains one of these")
+    parser.add_argument("--repeat", type=int, help="timed runs per benchmark (default: per benchmark)")
+    parser.add_argument("--output", help="write the report as JSON to this file")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="baseline report to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="store this run as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(args.names, args.repeat)
+    print_report(report)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Saved baseline to {args.baseline}")
+        return 0
+
+    try:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    except FileNotFoundError:
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one.")
+        return 0
+
+    rows = compare(report, baseline, args.tolerance)
+    print(f"\nCompared with {args.baseline} (tolerance {args.tolerance:.0%}):")
+    for name, time_ratio, memory_ratio, regressed in rows:
+        if time_ratio is None:
+            print(f"{name:<36} {'error' if name in report['results'] else 'missing from this run'}  REGRESSION")
+            continue
+        print(f"{name:<36} time x{time_ratio:5.2f}  memory x{memory_ratio:5.2f}  {'REGRESSION' if regressed else 'ok'}")
+    return 1 if any(row[3] for row in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
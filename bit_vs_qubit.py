@@ -1,10 +1,98 @@
 import streamlit as st
-from qiskit import QuantumCircuit, transpile
-from qiskit_aer import Aer
-import matplotlib.pyplot as plt
-import random
+from qiskit import QuantumCircuit
+from simulator_backends import get_backend
+from transpile_cache import cached_transpile
+from charts import show_histogram
+import math
+import numpy as np
 import pandas as pd
 
+MAX_SHOTS = 10**8
+CHUNK_SIZE = 2**18  # shots per side and per batch (one simulator run for the qubit); bounds memory at any shot count
+CURVE_POINTS = 60
+
+
+class RunningBitStats:
+    """
+    Running statistics of a stream of 0/1 measurements: mean, chi-square
+    against a fair 50/50 source, and the mean at log-spaced checkpoints
+    (the convergence curve).
+    """
+
+    def __init__(self, total_shots, curve_points=CURVE_POINTS):
+        self.shots = 0
+        self.ones = 0
+        self.checkpoints = np.unique(np.geomspace(10, max(total_shots, 10), curve_points).astype(np.int64))
+        self.curve = []  # (shots so far, mean so far)
+
+    def update(self, bits):
+        """Folds one chunk of uint8 0/1 samples into the statistics."""
+        n = len(bits)
+        due = self.checkpoints[(self.checkpoints > self.shots) & (self.checkpoints <= self.shots + n)]
+        if len(due):
+            running_ones = np.cumsum(bits, dtype=np.int64)[due - self.shots - 1] + self.ones
+            self.curve.extend(zip(due.tolist(), (running_ones / due).tolist()))
+
+        self.ones += int(np.count_nonzero(bits))
+        self.shots += n
+
+    @property
+    def mean(self):
+        return self.ones / self.shots if self.shots else 0.0
+
+    @property
+    def chi_square(self):
+        if not self.shots:
+            return 0.0
+        return (2 * self.ones - self.shots) ** 2 / self.shots
+
+    @property
+    def p_value(self):
+        return math.erfc(math.sqrt(self.chi_square / 2))
+
+    def counts(self):
+        return {'0': self.shots - self.ones, '1': self.ones}
+
+
+def hadamard_circuit():
+    qc = QuantumCircuit(1, 1)
+    qc.h(0)  # Apply Hadamard gate to create superposition
+    qc.measure(0, 0)
+    return qc
+
+
+def measure_qubit(backend, qc, shots, seed=None):
+    """Measures qc shots times in one simulator run and returns the outcomes as a uint8 0/1 array."""
+    options = {} if seed is None else {"seed_simulator": seed}
+    memory = backend.run(qc, shots=shots, memory=True, **options).result().get_memory()
+    return np.frombuffer("".join(memory).encode(), dtype=np.uint8) - ord("0")
+
+
+def compare_bits_vs_qubits(shots, chunk_size=CHUNK_SIZE, seed=None):
+    """
+    Samples the classical bit (NumPy coin flips) and the qubit (one batched
+    simulator run of the Hadamard circuit per chunk) side by side and yields
+    (classical_stats, qubit_stats) after every chunk, so callers can show
+    progress. Memory stays at O(chunk_size) whatever the shot count.
+    """
+    if not 1 <= shots <= MAX_SHOTS:
+        raise ValueError(f"shots must be between 1 and {MAX_SHOTS}")
+
+    rng = np.random.default_rng(seed)
+    backend = get_backend("demos")
+    qc = cached_transpile(hadamard_circuit(), backend)
+    classical = RunningBitStats(shots)
+    qubit = RunningBitStats(shots)
+
+    for start in range(0, shots, chunk_size):
+        n = min(chunk_size, shots - start)
+        # Classical bit: a fair coin decided before it is read
+        classical.update(rng.integers(0, 2, n, dtype=np.uint8))
+        # Qubit: measured collapses of the superposition, from the simulator
+        qubit.update(measure_qubit(backend, qc, n, None if seed is None else int(rng.integers(2**31))))
+        yield classical, qubit
+
+
 def display_bits_vs_qubits():
     # st.set_page_config(page_title="Classical Bit vs Qubit", layout="wide")
     st.title("Classical Bit vs Quantum Bit (Qubit)")
@@ -19,29 +107,24 @@ def display_bits_vs_qubits():
     """)
 
     # Slider for number of shots
-    shots = st.slider("Number of Shots (Measurements)", min_value=100, max_value=10000, value=1000)
+    shots = st.select_slider(
+        "Number of Shots (Measurements)",
+        options=[100, 1000, 10**4, 10**5, 10**6, 10**7, MAX_SHOTS],
+        value=1000
+    )
 
     # Run simulation button
     run_simulation = st.button("Run Simulation")
 
     if run_simulation:
-        # --- Classical Bit Simulation ---
-        classical_results = {'0': 0, '1': 0}
-        for _ in range(shots):
-            bit = str(random.randint(0, 1))
-            classical_results[bit] += 1
-
-        # --- Quantum Bit Simulation ---
-        qc = QuantumCircuit(1, 1)
-        qc.h(0)  # Apply Hadamard gate to create superposition
-        qc.measure(0, 0)
+        # --- Classical Bit and Quantum Bit Simulation (one pass, in chunks) ---
+        progress = st.progress(0.0)
+        for classical_stats, qubit_stats in compare_bits_vs_qubits(shots):
+            progress.progress(classical_stats.shots / shots)
+        progress.empty()
 
-        backend = Aer.get_backend('qasm_simulator')
-        qc_compiled = transpile(qc, backend)
-
-        job = backend.run(qc_compiled, shots=shots)
-        result = job.result()
-        qubit_counts = result.get_counts()
+        classical_results = classical_stats.counts()
+        qubit_counts = qubit_stats.counts()
 
         # --- Display Results Side by Side ---
         col1, col2 = st.columns(2)
@@ -53,19 +136,8 @@ def display_bits_vs_qubits():
             Since this is a fair random choice, you should see roughly equal counts.
             """)
 
-            fig, ax = plt.subplots()
-            bars = ax.bar(classical_results.keys(), classical_results.values(), color=['#4E79A7', '#F28E2B'])
-            ax.set_title("Classical Bit Measurement Outcomes")
-            ax.set_xlabel("Bit Value")
-            ax.set_ylabel("Frequency")
-
-            for bar in bars:
-                height = bar.get_height()
-                ax.text(bar.get_x() + bar.get_width()/2., height,
-                        f'{int(height)}',
-                        ha='center', va='bottom', fontsize=10)
-
-            st.pyplot(fig)
+            show_histogram(classical_results, "Classical Bit Measurement Outcomes",
+                           xlabel="Bit Value", ylabel="Frequency", colors=['#4E79A7', '#F28E2B'])
 
             st.markdown("""
             ### What does this graph mean?
@@ -81,19 +153,8 @@ def display_bits_vs_qubits():
             The qubit has a **50% chance of collapsing to `0` or `1`** upon measurement.
             """)
 
-            fig, ax = plt.subplots()
-            bars = ax.bar(qubit_counts.keys(), qubit_counts.values(), color=['#4E79A7', '#F28E2B'])
-            ax.set_title("Qubit Measurement Outcomes (Superposition)")
-            ax.set_xlabel("Measured State")
-            ax.set_ylabel("Frequency")
-
-            for bar in bars:
-                height = bar.get_height()
-                ax.text(bar.get_x() + bar.get_width()/2., height,
-                        f'{int(height)}',
-                        ha='center', va='bottom', fontsize=10)
-
-            st.pyplot(fig)
+            show_histogram(qubit_counts, "Qubit Measurement Outcomes (Superposition)",
+                           xlabel="Measured State", ylabel="Frequency", colors=['#4E79A7', '#F28E2B'])
 
             st.markdown("""
             ### What does this graph mean?
@@ -104,6 +165,25 @@ def display_bits_vs_qubits():
             > ⚠️ Note: Even though the probabilities are 50/50, the actual outcomes may vary slightly due to randomness in measurement.
             """)
 
+        # --- Convergence ---
+        st.markdown("## How Fast Do They Converge?")
+        st.markdown("""
+        Both sources are fair, so the fraction of `1`s drifts towards **0.5** as more shots are taken.
+        The chart shows the distance from 0.5 as the number of shots grows; it shrinks roughly like $1/\\sqrt{N}$.
+        A chi-square p-value above 0.05 means the counts are consistent with a 50/50 split.
+        """)
+        curve = pd.DataFrame({
+            "Classical Bit": [abs(mean - 0.5) for _, mean in classical_stats.curve],
+            "Qubit": [abs(mean - 0.5) for _, mean in qubit_stats.curve],
+        }, index=pd.Index([n for n, _ in classical_stats.curve], name="Shots"))
+        st.line_chart(curve)
+
+        st.table(pd.DataFrame({
+            "Fraction of 1s": [classical_stats.mean, qubit_stats.mean],
+            "Chi-square (vs 50/50)": [classical_stats.chi_square, qubit_stats.chi_square],
+            "p-value": [classical_stats.p_value, qubit_stats.p_value],
+        }, index=["Classical Bit", "Qubit"]))
+
         # Final Summary
         st.markdown("## Key Difference Explained")
 
@@ -0,0 +1,89 @@
+import io
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+import streamlit as st
+from matplotlib.figure import Figure
+
+DEFAULT_COLORS = ['#4E79A7', '#F28E2B', '#E15759', '#76B7B2', '#59A869']
+DEFAULT_FIGSIZE = (6.4, 4.8)
+PNG_DPI = 150
+PNG_CACHE_MAX_ENTRIES = 256
+
+# Figures are created with matplotlib.figure.Figure, not pyplot, so they never
+# enter pyplot's global registry. One figure per size is cleared and reused.
+_figures = {}
+_png_cache = OrderedDict()
+_lock = threading.Lock()
+
+
+def _draw(fig, counts, title, xlabel, ylabel, colors, fontsize, title_fontsize):
+    ax = fig.subplots()
+    bars = ax.bar(list(counts.keys()), list(counts.values()), color=colors)
+    ax.set_title(title, fontsize=title_fontsize)
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel(ylabel)
+
+    # Add value labels on top of bars
+    for bar in bars:
+        height = bar.get_height()
+        ax.text(bar.get_x() + bar.get_width()/2., height,
+                f'{int(height)}',
+                ha='center', va='bottom', fontsize=fontsize)
+
+
+def render_histogram_png(counts, title, xlabel="State", ylabel="Count", colors=DEFAULT_COLORS,
+                         figsize=DEFAULT_FIGSIZE, fontsize=10, title_fontsize=None):
+    """
+    Renders a labelled bar chart of counts to PNG bytes.
+    Results are cached by their inputs, so identical counts are never drawn twice.
+    """
+    key = (tuple(counts.items()), title, xlabel, ylabel, tuple(colors), tuple(figsize), fontsize, title_fontsize)
+
+    with _lock:
+        png = _png_cache.get(key)
+        if png is not None:
+            _png_cache.move_to_end(key)
+            return png
+
+        fig = _figures.get(tuple(figsize))
+        if fig is None:
+            fig = Figure(figsize=figsize)
+            _figures[tuple(figsize)] = fig
+        fig.clear()
+        _draw(fig, counts, title, xlabel, ylabel, colors, fontsize, title_fontsize)
+
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format="png", dpi=PNG_DPI, bbox_inches="tight")
+        fig.clear()
+        png = buffer.getvalue()
+
+        _png_cache[key] = png
+        while len(_png_cache) > PNG_CACHE_MAX_ENTRIES:
+            _png_cache.popitem(last=False)
+    return png
+
+
+def show_histogram(counts, title, xlabel="State", ylabel="Count", colors=DEFAULT_COLORS,
+                   figsize=DEFAULT_FIGSIZE, fontsize=10, title_fontsize=None, native=None):
+    """
+    Displays a histogram of counts on the page.
+    With native=True it is drawn as a Streamlit bar chart instead of a
+    matplotlib image; when native is None the sidebar setting decides.
+    """
+    if native is None:
+        native = st.session_state.get("native_charts", False)
+
+    if native:
+        st.caption(title)
+        st.bar_chart(pd.DataFrame({ylabel: list(counts.values())}, index=list(counts.keys())))
+        return
+
+    png = render_histogram_png(counts, title, xlabel, ylabel, colors, figsize, fontsize, title_fontsize)
+    st.image(png, use_column_width=True)
+
+
+def chart_cache_stats():
+    with _lock:
+        return {"png_entries": len(_png_cache), "figures": len(_figures)}
@@ -0,0 +1,123 @@
+import numpy as np
+from qiskit import QuantumCircuit
+from qiskit.circuit import Parameter
+from qiskit.quantum_info import Statevector
+
+import numpy_statevector
+from probability_sampler import sample_basis_counts
+from simulator_backends import choose_simulation_method, get_backend
+from transpile_cache import cached_transpile
+
+MAX_QUBITS = 30
+GATE_ARITY = {"h": 1, "x": 1, "y": 1, "z": 1, "cx": 2, "swap": 2, "ccx": 3, "cz": 2, "rx": 1, "ry": 1, "rz": 1, "p": 1}
+ROTATION_GATES = {"rx", "ry", "rz", "p"}  # take one angle
+
+# Symbolic angle of the builder; a circuit using it can be swept over many values at once
+THETA = Parameter("θ")
+
+
+def build_circuit(num_qubits, gates):
+    """
+    Builds a circuit from (gate, qubits) pairs, e.g. [("h", [0]), ("cx", [0, 1])],
+    using the builder's gate names. Rotation gates take a third element, the
+    angle in radians or THETA, e.g. ("ry", [0], THETA). Raises ValueError for
+    anything the builder page could not produce.
+    """
+    if not 1 <= num_qubits <= MAX_QUBITS:
+        raise ValueError(f"num_qubits must be between 1 and {MAX_QUBITS}")
+    qc = QuantumCircuit(num_qubits, num_qubits)
+    for gate, qubits, *params in gates:
+        if gate not in GATE_ARITY:
+            raise ValueError(f"Unknown gate: {gate}")
+        if len(qubits) != GATE_ARITY[gate] or len(set(qubits)) != len(qubits):
+            raise ValueError(f"{gate} needs {GATE_ARITY[gate]} distinct qubits")
+        if not all(0 <= q < num_qubits for q in qubits):
+            raise ValueError(f"Qubits of {gate} must be between 0 and {num_qubits - 1}")
+        if len(params) != (gate in ROTATION_GATES):
+            raise ValueError(f"{gate} needs an angle" if gate in ROTATION_GATES else f"{gate} takes no angle")
+        getattr(qc, gate)(*params, *qubits)
+    return qc
+
+
+def bind_theta(qc, theta):
+    """Returns qc with THETA set to theta, or qc itself if it does not use THETA."""
+    if THETA not in qc.parameters:
+        return qc
+    return qc.assign_parameters({THETA: theta})
+
+
+def first_theta_gate(qc):
+    """Index of the first gate of qc whose angle uses THETA, or len(qc.data) if none does."""
+    for index, instruction in enumerate(qc.data):
+        if any(THETA in getattr(param, "parameters", ()) for param in instruction.operation.params):
+            return index
+    return len(qc.data)
+
+
+def measured_copy(qc):
+    """Copy of qc measuring every qubit i into clbit i."""
+    qc_meas = qc.copy()
+    for i in range(qc.num_qubits):
+        qc_meas.measure(i, i)
+    return qc_meas
+
+
+def sweep_theta(qc, points):
+    """
+    Outcome probabilities of qc for points values of THETA evenly spaced over
+    [0, 2π], computed as one batched NumPy statevector run. Returns (angles,
+    labels, probabilities) with probabilities of shape (points, len(labels)).
+    """
+    angles = np.linspace(0, 2 * np.pi, points)
+    labels, probabilities = numpy_statevector.sweep_probabilities(measured_copy(qc), THETA, angles)
+    return angles, labels, probabilities
+
+
+def choose_builder_method(qc, mode="sampling"):
+    """
+    Method used to measure a builder circuit: the NumPy engine for small
+    circuits, otherwise the Aer method that fits its gates. Exact mode always
+    needs the statevector.
+    """
+    if mode == "exact":
+        return "statevector"
+    if numpy_statevector.supports(qc):
+        return "numpy"
+    return choose_simulation_method(qc)
+
+
+def measure_circuit(qc, shots=1000, mode="sampling", probabilities=None, method=None):
+    """
+    Measures every qubit of qc and returns (counts, probabilities).
+
+    mode="sampling" runs the shots on the simulator (probabilities is None)
+    with the given method ("numpy" or an Aer method), picked by
+    choose_builder_method when None.
+    mode="exact" simulates qc once as a statevector and draws all shots with a
+    single multinomial call, so the cost no longer grows with the shot count.
+    probabilities is then an array indexed by basis state; pass it (or a
+    LiveStatevector's) back in to skip the statevector simulation as well.
+    """
+    if mode == "exact":
+        if probabilities is None:
+            probabilities = Statevector(qc).probabilities()
+        return sample_basis_counts(probabilities, shots, qc.num_qubits), probabilities
+
+    # Run on simulator
+    qc_meas = measured_copy(qc)
+    if method is None:
+        method = choose_builder_method(qc)
+    backend = get_backend("circuit_builder")
+    if method == "statevector":
+        compiled_qc = cached_transpile(qc_meas, backend)
+    else:
+        # Builder gates are native to Aer; transpiling could fuse Clifford gates into generic unitaries
+        compiled_qc = qc_meas
+    job = backend.run(compiled_qc, shots=shots, method=method)
+    result = job.result()
+    return result.get_counts(), None
+
+
+def sample_chunk(qc, shots, method):
+    """One chunk of a background measurement job; runs in a worker process."""
+    return measure_circuit(qc, shots=shots, mode="sampling", method=method)[0]
@@ -0,0 +1,157 @@
+import math
+
+from qiskit import QuantumCircuit
+
+ANGLE_TOLERANCE = 1e-9
+
+# Single-qubit gates that rotate about one axis: name -> (axis, angle; None when it is the gate's parameter).
+# Gates about the same axis merge into one rotation; Z, RZ and P differ only by a global phase
+_ROTATIONS = {
+    "x": ("x", math.pi), "rx": ("x", None),
+    "y": ("y", math.pi), "ry": ("y", None),
+    "z": ("z", math.pi), "rz": ("z", None), "p": ("z", None),
+}
+_SELF_INVERSE = {"h", "cx", "cz", "swap", "ccx"}
+
+
+def _local_axes(name, qubits):
+    """
+    Basis in which the gate acts on each of its qubits: "z" when it is
+    diagonal there (phases, controls), "x" or "y" when it only applies
+    functions of that Pauli (targets, rotations), None otherwise.
+    """
+    if name in _ROTATIONS:
+        return {qubits[0]: _ROTATIONS[name][0]}
+    if name == "cx":
+        return {qubits[0]: "z", qubits[1]: "x"}
+    if name == "cz":
+        return {qubits[0]: "z", qubits[1]: "z"}
+    if name == "ccx":
+        return {qubits[0]: "z", qubits[1]: "z", qubits[2]: "x"}
+    return {q: None for q in qubits}
+
+
+def commute(first, second):
+    """
+    True if two gates (name, qubits, params) provably commute: on every
+    shared qubit both act in the same local basis, e.g. CXs sharing only a
+    control, or an RZ on a CX control.
+    """
+    first_axes, second_axes = _local_axes(first[0], first[1]), _local_axes(second[0], second[1])
+    return all(
+        first_axes[q] is not None and first_axes[q] == second_axes[q]
+        for q in first_axes.keys() & second_axes.keys()
+    )
+
+
+def _gate_key(name, qubits):
+    """Identifies a self-inverse gate up to the qubit orders that do not change it."""
+    if name in ("cz", "swap"):
+        return name, frozenset(qubits)
+    if name == "ccx":
+        return name, frozenset(qubits[:2]), qubits[2]
+    return name, tuple(qubits)
+
+
+def _numeric(angle):
+    """The angle as a float, or None while it still depends on an unbound parameter."""
+    try:
+        return float(angle)
+    except TypeError:
+        return None
+
+
+def _merge_rotations(first, second):
+    """
+    Product of two rotations about the same axis on the same qubit: a list
+    with the single merged gate, or an empty list when it is the identity
+    (up to a global phase).
+    """
+    axis = _ROTATIONS[first[0]][0]
+    angles = [_ROTATIONS[name][1] if _ROTATIONS[name][1] is not None else params[0]
+              for name, _, params in (first, second)]
+    total = angles[0] + angles[1]
+    rotation = first[0] if _ROTATIONS[first[0]][1] is None else second[0]
+
+    value = _numeric(total)
+    if value is None:
+        return [(rotation, first[1], [total])]
+    value %= 2 * math.pi
+    if min(value, 2 * math.pi - value) < ANGLE_TOLERANCE:
+        return []
+    if abs(value - math.pi) < ANGLE_TOLERANCE:
+        return [(axis, first[1], [])]
+    return [(rotation, first[1], [value])]
+
+
+class PeepholeOptimizer:
+    """
+    Incremental peephole optimizer for the circuit builder. Each appended gate
+    looks back past the gates it commutes with for a partner:
+
+    - self-inverse pairs (H·H, CX·CX on the same pair, SWAP·SWAP, ...) cancel
+    - rotations about the same axis (X, RX; Y, RY; Z, RZ, P) merge into one,
+      and disappear when the total angle is a multiple of 2π
+
+    so appending costs time proportional to the commuting run it scans, not
+    the circuit length. Gates are (name, qubit indices, params) tuples.
+    """
+
+    def __init__(self, num_qubits):
+        self.num_qubits = num_qubits
+        self.gates = []
+        self.source_gates = 0  # gates appended so far, before optimization
+        self._circuit = None
+
+    def append(self, name, qubits, params=()):
+        gate = (name, list(qubits), list(params))
+        self.source_gates += 1
+        self._circuit = None
+
+        for i in range(len(self.gates) - 1, -1, -1):
+            earlier = self.gates[i]
+            if not set(earlier[1]) & set(gate[1]):
+                continue
+            if name in _SELF_INVERSE and _gate_key(*earlier[:2]) == _gate_key(*gate[:2]):
+                del self.gates[i]
+                return
+            if (name in _ROTATIONS and earlier[0] in _ROTATIONS and earlier[1] == gate[1]
+                    and _ROTATIONS[name][0] == _ROTATIONS[earlier[0]][0]):
+                self.gates[i:i + 1] = _merge_rotations(earlier, gate)
+                return
+            if not commute(earlier, gate):
+                break
+        self.gates.append(gate)
+
+    def append_instruction(self, qc, instruction):
+        """Appends a gate of a Qiskit circuit."""
+        self.append(instruction.operation.name, [qc.find_bit(q).index for q in instruction.qubits],
+                    instruction.operation.params)
+
+    def to_circuit(self):
+        """The optimized circuit (with as many clbits as qubits, like the builder's), rebuilt only after changes."""
+        if self._circuit is None:
+            qc = QuantumCircuit(self.num_qubits, self.num_qubits)
+            for name, qubits, params in self.gates:
+                getattr(qc, name)(*params, *qubits)
+            self._circuit = qc
+        return self._circuit
+
+
+def optimize_circuit(qc):
+    """Runs every gate of qc through a fresh PeepholeOptimizer and returns it."""
+    optimizer = PeepholeOptimizer(qc.num_qubits)
+    for instruction in qc.data:
+        optimizer.append_instruction(qc, instruction)
+    return optimizer
+
+
+def sync_optimizer(qc, optimizer=None):
+    """
+    Returns a PeepholeOptimizer matching qc: the given one when it has seen
+    every gate of qc, otherwise (after an undo, or a new session) a fresh one
+    fed with the whole circuit.
+    """
+    if optimizer is not None and optimizer.num_qubits == qc.num_qubits and optimizer.source_gates == len(qc.data):
+        return optimizer
+    return optimize_circuit(qc)
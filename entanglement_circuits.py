@@ -0,0 +1,162 @@
+import numpy as np
+from qiskit import QuantumCircuit
+
+from result_cache import cached_run
+from simulator_backends import get_backend
+from transpile_cache import cached_transpile
+
+MULTIQUBIT_MAX_QUBITS = 500
+# Sampling a stabilizer circuit costs about shots × qubits², so large states get fewer shots
+MULTIQUBIT_MAX_SHOT_WORK = 10**7
+
+
+# --- Helper Function to Run Circuit ---
+def run_circuit(qc, shots=1000, use_cache=False, seed=None):
+    """
+    Runs qc and returns its counts. With use_cache the result cache may answer
+    instead of the simulator (fresh samples when seed is None, an exact replay
+    otherwise).
+    """
+    if use_cache:
+        return cached_run(qc, shots=shots, seed=seed, use_case="demos")
+
+    backend = get_backend("demos")
+    compiled_qc = cached_transpile(qc, backend)
+    job = backend.run(compiled_qc, shots=shots)
+    result = job.result()
+    counts = result.get_counts()
+    return counts
+
+
+def superposition_circuit():
+    """One qubit in equal superposition, measured."""
+    qc = QuantumCircuit(1, 1)
+    qc.h(0)
+    qc.measure(0, 0)
+    return qc
+
+
+def bell_circuit():
+    """The Bell state |Φ+⟩ on two qubits, measured."""
+    qc = QuantumCircuit(2, 2)
+    qc.h(0)
+    qc.cx(0, 1)
+    qc.measure([0, 1], [0, 1])
+    return qc
+
+
+# --- Many-qubit entanglement (stabilizer simulation) ---
+
+def ghz_circuit(num_qubits, basis="z"):
+    """
+    The GHZ state (|0...0⟩ + |1...1⟩)/√2, every qubit measured in the Z basis
+    or, with basis="x", in the X basis.
+    """
+    qc = QuantumCircuit(num_qubits, num_qubits)
+    qc.h(0)
+    for q in range(num_qubits - 1):
+        qc.cx(q, q + 1)
+    if basis == "x":
+        qc.h(range(num_qubits))
+    qc.measure(range(num_qubits), range(num_qubits))
+    return qc
+
+
+def graph_edges(kind, num_qubits):
+    """Edges of a line, ring or star graph on num_qubits vertices."""
+    if kind == "line":
+        return [(q, q + 1) for q in range(num_qubits - 1)]
+    if kind == "ring" and num_qubits > 2:
+        return [(q, (q + 1) % num_qubits) for q in range(num_qubits)]
+    if kind == "ring":
+        return graph_edges("line", num_qubits)
+    if kind == "star":
+        return [(0, q) for q in range(1, num_qubits)]
+    raise ValueError(f"Unknown graph: {kind}")
+
+
+def graph_state_circuit(num_qubits, edges, x_qubits=()):
+    """
+    The graph state of edges (H on every qubit, CZ on every edge), measured
+    in the X basis on x_qubits and in the Z basis elsewhere.
+    """
+    qc = QuantumCircuit(num_qubits, num_qubits)
+    qc.h(range(num_qubits))
+    for a, b in edges:
+        qc.cz(a, b)
+    if len(x_qubits):
+        qc.h([int(q) for q in x_qubits])
+    qc.measure(range(num_qubits), range(num_qubits))
+    return qc
+
+
+def greedy_coloring(num_qubits, edges):
+    """Colors vertices so that no edge joins two of the same color. Returns one color index per vertex."""
+    neighbors = [set() for _ in range(num_qubits)]
+    for a, b in edges:
+        neighbors[a].add(b)
+        neighbors[b].add(a)
+    colors = []
+    for v in range(num_qubits):
+        used = {colors[u] for u in neighbors[v] if u < v}
+        colors.append(next(c for c in range(num_qubits) if c not in used))
+    return np.array(colors)
+
+
+def run_memory(qc, shots=1000, seed=None):
+    """
+    Runs qc on the stabilizer simulator and returns the per-shot memory as a
+    (shots, num_clbits) uint8 array whose column i is clbit i.
+    """
+    options = {} if seed is None else {"seed_simulator": seed}
+    memory = get_backend("entanglement").run(qc, shots=shots, memory=True, **options).result().get_memory()
+    # One byte per character; Aer strings put clbit 0 last, so reverse the columns
+    bits = np.frombuffer("".join(memory).encode(), dtype=np.uint8).reshape(shots, qc.num_clbits)
+    return (bits[:, ::-1] - ord("0")).astype(np.uint8)
+
+
+def correlation_matrix(bits):
+    """Matrix of ⟨Z_i Z_j⟩ (in the measured basis) over all shots: one matrix product of the ±1 outcomes."""
+    signs = 1.0 - 2.0 * bits
+    return signs.T @ signs / len(bits)
+
+
+def parity_statistics(bits):
+    """Share of shots where all qubits agree and where the number of 1s is even, plus the mean pairwise correlation."""
+    n = bits.shape[1]
+    weight = bits.sum(axis=1)
+    correlations = correlation_matrix(bits)
+    return {
+        "all_equal": float(np.mean((weight == 0) | (weight == n))),
+        "even_parity": float(np.mean(weight % 2 == 0)),
+        "mean_pairwise_correlation": float((correlations.sum() - n) / (n * (n - 1))) if n > 1 else 1.0,
+        "correlations": correlations,
+    }
+
+
+def stabilizer_expectations(num_qubits, edges, shots=1000, seed=None):
+    """
+    Estimates ⟨K_v⟩ for every stabilizer K_v = X_v ∏ Z_u (u a neighbor of v)
+    of the graph state. Vertices of one color share no edge, so one circuit
+    per color measures them all in X and every other qubit in Z and checks
+    all their stabilizers at once. Returns (expectations, number of circuits).
+    """
+    colors = greedy_coloring(num_qubits, edges)
+    adjacency = np.zeros((num_qubits, num_qubits), dtype=np.int64)
+    for a, b in edges:
+        adjacency[a, b] = adjacency[b, a] = 1
+
+    expectations = np.zeros(num_qubits)
+    num_colors = colors.max() + 1
+    for color in range(num_colors):
+        x_qubits = np.flatnonzero(colors == color)
+        bits = run_memory(graph_state_circuit(num_qubits, edges, x_qubits), shots, seed).astype(np.int64)
+        # Outcome of K_v per shot: X result of v plus the Z results of its neighbors, mod 2
+        parity = (bits[:, x_qubits] + bits @ adjacency[:, x_qubits]) % 2
+        expectations[x_qubits] = 1.0 - 2.0 * parity.mean(axis=0)
+    return expectations, int(num_colors)
+
+
+def max_multiqubit_shots(num_qubits):
+    """Most shots the page runs for num_qubits-qubit GHZ or graph states (at least 100)."""
+    return max(100, MULTIQUBIT_MAX_SHOT_WORK // num_qubits ** 2)
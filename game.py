@@ -1,7 +1,151 @@
+import math
+import threading
+
 from qiskit import QuantumCircuit
-from qiskit_aer import AerSimulator
 import numpy as np
 
+from game_bitboard import from_string_board, validate_bits
+from simulator_backends import get_backend
+
+
+class QuantumBitPool:
+    """
+    Ring buffer of measured qubit outcomes.
+
+    One multi-shot simulator run with per-shot memory fills the buffer, and a
+    background refill starts once it drops below the low-water mark. All
+    buffer access is guarded by a lock so concurrent sessions can share it;
+    simulator runs happen outside it, and readers that find the buffer empty
+    wait for the fill already under way instead of starting another one.
+    """
+
+    def __init__(self, pool_size=4096, low_water=None):
+        if pool_size < 1:
+            raise ValueError("pool_size must be at least 1")
+        self.pool_size = pool_size
+        self.low_water = pool_size // 4 if low_water is None else min(low_water, pool_size)
+
+        self._buffer = np.zeros(pool_size, dtype=np.uint8)
+        self._read = 0
+        self._size = 0
+        self._refilling = False
+        self._lock = threading.Lock()
+        self._filled = threading.Condition(self._lock)  # notified whenever a fill ends
+
+        self._circuit = QuantumCircuit(1, 1)
+        self._circuit.h(0)
+        self._circuit.measure(0, 0)
+
+        self.bits_served = 0
+        self.ones_served = 0
+
+    def _measure_bits(self, shots):
+        """Runs the Hadamard circuit once and returns every shot as a bit."""
+        result = get_backend("game").run(self._circuit, shots=shots, memory=True).result()
+        return np.fromiter((int(bit) for bit in result.get_memory()), dtype=np.uint8, count=shots)
+
+    def _write(self, bits):
+        """Appends bits to the ring buffer. Caller must hold the lock."""
+        free = self.pool_size - self._size
+        bits = bits[:free]
+        start = (self._read + self._size) % self.pool_size
+        positions = (start + np.arange(len(bits))) % self.pool_size
+        self._buffer[positions] = bits
+        self._size += len(bits)
+
+    def _fill(self):
+        """Measures a pool of bits without holding the lock, stores them and wakes the waiting readers."""
+        try:
+            bits = self._measure_bits(self.pool_size)
+            with self._lock:
+                self._write(bits)
+        finally:
+            with self._filled:
+                self._refilling = False
+                self._filled.notify_all()
+
+    def get_bit(self):
+        """Returns one measured bit (0 or 1) from the pool."""
+        while True:
+            with self._filled:
+                while self._size == 0 and self._refilling:
+                    self._filled.wait()
+                if self._size:
+                    bit = int(self._buffer[self._read])
+                    self._read = (self._read + 1) % self.pool_size
+                    self._size -= 1
+                    self.bits_served += 1
+                    self.ones_served += bit
+
+                    start_refill = self._size < self.low_water and not self._refilling
+                    if start_refill:
+                        self._refilling = True
+                    break
+                # Nothing buffered yet (or a burst drained it) and no fill under way: fill synchronously
+                self._refilling = True
+            self._fill()
+
+        if start_refill:
+            threading.Thread(target=self._fill, daemon=True).start()
+        return bit
+
+    def bias_report(self):
+        """
+        Chi-square test of the bits served so far against a fair 50/50 source.
+        Returns a dict with the counts, the fraction of ones, the statistic and
+        its p-value (1 degree of freedom).
+        """
+        with self._lock:
+            n = self.bits_served
+            ones = self.ones_served
+
+        if n == 0:
+            return {"bits": 0, "ones": 0, "ones_fraction": None, "chi_square": 0.0, "p_value": 1.0}
+
+        expected = n / 2
+        chi_square = ((ones - expected) ** 2 + ((n - ones) - expected) ** 2) / expected
+        return {
+            "bits": n,
+            "ones": ones,
+            "ones_fraction": ones / n,
+            "chi_square": chi_square,
+            "p_value": math.erfc(math.sqrt(chi_square / 2)),
+        }
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_bit_pool():
+    """Returns the process-wide bit pool, creating it on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = QuantumBitPool()
+        return _pool
+
+
+def configure_pool(pool_size=4096, low_water=None):
+    """Replaces the process-wide bit pool with one of the given size."""
+    global _pool
+    with _pool_lock:
+        _pool = QuantumBitPool(pool_size=pool_size, low_water=low_water)
+        return _pool
+
+
+def check_unbiased(num_bits=10000, alpha=0.01):
+    """
+    Draws num_bits fresh bits from the pool and tests them for bias.
+    Returns (passed, report) where passed is False if the chi-square test
+    rejects a fair source at significance level alpha.
+    """
+    pool = QuantumBitPool(pool_size=get_bit_pool().pool_size)
+    for _ in range(num_bits):
+        pool.get_bit()
+    report = pool.bias_report()
+    return report["p_value"] >= alpha, report
+
 
 def quantum_superposition():
     """Generates a random |0> or |1> using quantum superposition."""
@@ -9,53 +153,23 @@ def quantum_superposition():
     qc.h(0)
     qc.measure(0, 0)
 
-    simulator = AerSimulator()
+    simulator = get_backend("game")
     result = simulator.run(qc).result().get_counts()
     outcome = max(result, key=result.get)  # Get most probable result
     return f"|{outcome}>"
 
 
 def get_random_value():
-    """Returns either |0> or |1> randomly using quantum circuit."""
-    return quantum_superposition()
+    """Returns either |0> or |1> randomly, read from the pooled quantum bit source."""
+    return f"|{get_bit_pool().get_bit()}>"
 
 
 def validate(board):
     """
     Checks if any player has won or if it's a draw.
+    Takes the 3x3 string board and checks it through the bitboard engine.
     Returns:
         0 if game ends (win or draw)
         1 if game continues
     """
-    zero_ket = '|0>'
-    one_ket = '|1>'
-
-    # Check diagonals
-    if board[0, 0] == board[1, 1] == board[2, 2] == one_ket:
-        return 0, "User wins!"
-    if board[0, 0] == board[1, 1] == board[2, 2] == zero_ket:
-        return 0, "Computer wins!"
-    if board[0, 2] == board[1, 1] == board[2, 0] == one_ket:
-        return 0, "User wins!"
-    if board[0, 2] == board[1, 1] == board[2, 0] == zero_ket:
-        return 0, "Computer wins!"
-
-    # Check rows
-    for row in range(3):
-        if all(cell == one_ket for cell in board[row]):
-            return 0, "User wins!"
-        if all(cell == zero_ket for cell in board[row]):
-            return 0, "Computer wins!"
-
-    # Check columns
-    for col in range(3):
-        if all(cell == one_ket for cell in board[:, col]):
-            return 0, "User wins!"
-        if all(cell == zero_ket for cell in board[:, col]):
-            return 0, "Computer wins!"
-
-    # Check draw
-    if '|ψ>' not in board:
-        return 0, "It is a draw!"
-
-    return 1, ""  # Continue game
\ No newline at end of file
+    return validate_bits(from_string_board(board))
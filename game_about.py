@@ -1,4 +1,7 @@
 import streamlit as st
+import pandas as pd
+
+from game_selfplay import simulate_games
 
 def show_about():
     st.subheader("About Quantum Tic Tac Toe")
@@ -22,4 +25,30 @@ def show_about():
     $$
     |\psi\\rangle = \\alpha |0\\rangle + \\beta |1\\rangle
     $$
-    """)
\ No newline at end of file
+    """)
+
+    st.subheader("How Often Does Each Side Win?")
+
+    st.markdown("""
+    Because every square collapses to `|0>` or `|1>` at random, it does not matter who places it — luck decides.
+    The simulator below plays many games headlessly with random moves on both sides and reports the outcome distribution.
+    """)
+
+    num_games = st.select_slider("Games to simulate", options=[10**4, 10**5, 10**6, 10**7], value=10**6)
+
+    if st.button("Simulate Games"):
+        stats = simulate_games(num_games)
+        st.success(f"Played {stats['games']:,} games in {stats['seconds']:.2f} s ({stats['games_per_second']:,.0f} games/s).")
+        st.table(pd.DataFrame({
+            "Games": stats["outcomes"],
+            "Probability": stats["probabilities"],
+        }))
+
+        st.markdown("Share of wins in which each square is part of the winning line:")
+        col1, col2 = st.columns(2)
+        with col1:
+            st.markdown("User: ``|1>``")
+            st.dataframe(pd.DataFrame(stats["user_win_cells"]).style.format("{:.1%}"))
+        with col2:
+            st.markdown("Computer: ``|0>``")
+            st.dataframe(pd.DataFrame(stats["computer_win_cells"]).style.format("{:.1%}"))
\ No newline at end of file
@@ -0,0 +1,182 @@
+import functools
+import os
+import sys
+
+import numpy as np
+
+from game_bitboard import FULL_MASK, WINNING_LINE, BitBoard
+
+POLICY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "game_ai_policy.npy")
+NUM_STATES = 3**9
+NO_MOVE = -1
+
+# The 8 symmetries of the square as cell permutations: symmetry s moves cell i to SYMMETRIES[s][i]
+_ROTATE = (6, 3, 0, 7, 4, 1, 8, 5, 2)
+_REFLECT = (2, 1, 0, 5, 4, 3, 8, 7, 6)
+
+
+def _compose(first, second):
+    return tuple(second[first[i]] for i in range(9))
+
+
+def _build_symmetries():
+    rotations = [tuple(range(9))]
+    for _ in range(3):
+        rotations.append(_compose(rotations[-1], _ROTATE))
+    return rotations + [_compose(r, _REFLECT) for r in rotations]
+
+
+SYMMETRIES = _build_symmetries()
+# _MASK_MAPS[s][mask] is mask with every cell moved by symmetry s
+_MASK_MAPS = [
+    tuple(sum(1 << perm[i] for i in range(9) if mask >> i & 1) for mask in range(1 << 9))
+    for perm in SYMMETRIES
+]
+# Base-3 state index (cell digit 0 = empty, 1 = |1>, 2 = |0>) split into per-mask lookups
+_TERNARY_ONES = tuple(sum(3**i for i in range(9) if mask >> i & 1) for mask in range(1 << 9))
+_TERNARY_ZEROS = tuple(2 * t for t in _TERNARY_ONES)
+
+
+def state_index(board):
+    """Index of a board in the policy table, in O(1)."""
+    return _TERNARY_ONES[board.ones] + _TERNARY_ZEROS[board.zeros]
+
+
+def canonical(board):
+    """Returns (canonical board, symmetry index) where the canonical board is the smallest symmetric image."""
+    return min(
+        ((BitBoard(mask_map[board.ones], mask_map[board.zeros]), s) for s, mask_map in enumerate(_MASK_MAPS)),
+        key=lambda item: (item[0].ones, item[0].zeros)
+    )
+
+
+def _terminal_value(board):
+    """+1 computer win, -1 user win, 0 draw, None while the game goes on (same order as validate_bits)."""
+    if WINNING_LINE[board.ones]:
+        return -1.0
+    if WINNING_LINE[board.zeros]:
+        return 1.0
+    if board.occupied == FULL_MASK:
+        return 0.0
+    return None
+
+
+def computer_to_move(board):
+    """The user always moves first, so the computer moves after an odd number of placements."""
+    return bin(board.occupied).count("1") % 2 == 1
+
+
+class ExpectimaxSolver:
+    """
+    Solves Quantum Tic Tac Toe from the computer's point of view.
+
+    A move picks a free cell, then a chance node collapses it to |1> or |0>
+    with probability p_one / 1 - p_one (the get_random_value distribution).
+    The computer maximizes the expected result (+1 win, 0 draw, -1 loss) and
+    the user is assumed to pick cells that minimize it. Values are memoized
+    on the canonical form of each board, so symmetric positions are solved once.
+    """
+
+    def __init__(self, p_one=0.5):
+        self.p_one = p_one
+        self._values = {}
+
+    def value(self, board):
+        """Expected result of a position with the side to move derived from the board."""
+        terminal = _terminal_value(board)
+        if terminal is not None:
+            return terminal
+
+        key = canonical(board)[0]
+        cached = self._values.get(key)
+        if cached is not None:
+            return cached
+
+        values = [self.move_value(board, move) for move in board.available_moves()]
+        result = max(values) if computer_to_move(board) else min(values)
+        self._values[key] = result
+        return result
+
+    def move_value(self, board, move):
+        """Expected result of placing a cell, averaged over its |1>/|0> collapse."""
+        return (self.p_one * self.value(board.place(move, 1))
+                + (1 - self.p_one) * self.value(board.place(move, 0)))
+
+    def best_move(self, board):
+        """Computer's best cell (1-9); ties go to the lowest cell number."""
+        moves = board.available_moves()
+        values = [round(self.move_value(board, move), 12) for move in moves]
+        return moves[int(np.argmax(values))]
+
+
+def _all_boards():
+    """Every assignment of empty/|1>/|0> to the 9 cells, in state_index order."""
+    for index in range(NUM_STATES):
+        ones = zeros = 0
+        for cell in range(9):
+            digit = index // 3**cell % 3
+            if digit == 1:
+                ones |= 1 << cell
+            elif digit == 2:
+                zeros |= 1 << cell
+        yield index, BitBoard(ones, zeros)
+
+
+def solve_policy(p_one=0.5):
+    """
+    Builds the full policy table: for every reachable position where the
+    computer is to move, the cell it should pick (NO_MOVE elsewhere).
+    Best moves are solved on canonical boards and mapped back through the
+    symmetry, so each equivalence class is searched once.
+    """
+    solver = ExpectimaxSolver(p_one)
+    policy = np.full(NUM_STATES, NO_MOVE, dtype=np.int8)
+    canonical_moves = {}
+
+    for index, board in _all_boards():
+        if not computer_to_move(board) or _terminal_value(board) is not None:
+            continue
+
+        key, symmetry = canonical(board)
+        move = canonical_moves.get(key)
+        if move is None:
+            move = solver.best_move(key)
+            canonical_moves[key] = move
+
+        # Map the canonical cell back: symmetry s sends cell i to SYMMETRIES[s][i]
+        cell = SYMMETRIES[symmetry].index(move - 1)
+        policy[index] = cell + 1
+    return policy
+
+
+def save_policy(policy, path=POLICY_PATH):
+    np.save(path, policy)
+
+
+@functools.lru_cache(maxsize=None)
+def load_policy(path=POLICY_PATH):
+    """Loads the precomputed policy table, solving (and saving) it if the file is missing."""
+    try:
+        return np.load(path)
+    except OSError:
+        policy = solve_policy()
+        try:
+            save_policy(policy, path)
+        except OSError:
+            pass
+        return policy
+
+
+def ai_move(board):
+    """The expectimax computer's move (1-9) for a BitBoard, as a single table lookup."""
+    move = int(load_policy()[state_index(board)])
+    if move == NO_MOVE:
+        raise ValueError("The computer has no move in this position")
+    return move
+
+
+if __name__ == "__main__":
+    path = sys.argv[1] if len(sys.argv) > 1 else POLICY_PATH
+    table = solve_policy()
+    save_policy(table, path)
+    print(f"Saved policy for {np.count_nonzero(table != NO_MOVE)} positions to {path} ({table.nbytes} bytes)")
@@ -0,0 +1,96 @@
+from collections import namedtuple
+
+import numpy as np
+
+ONE_KET = '|1>'
+ZERO_KET = '|0>'
+PSI = '|ψ>'
+
+FULL_MASK = 0x1FF  # all nine cells
+
+# Cell for move m (1-9) is bit m - 1, in the same row-major order as the board numbering
+LINE_MASKS = (
+    0b000000111, 0b000111000, 0b111000000,  # rows
+    0b001001001, 0b010010010, 0b100100100,  # columns
+    0b100010001, 0b001010100,               # diagonals
+)
+
+# WINNING_LINE[mask] is the first line fully covered by mask, or 0 if there is none
+WINNING_LINE = tuple(next((line for line in LINE_MASKS if mask & line == line), 0) for mask in range(1 << 9))
+# The same table as an array, for vectorized lookups over many boards at once
+WINNING_LINE_TABLE = np.array(WINNING_LINE, dtype=np.uint16)
+
+
+class BitBoard(namedtuple("BitBoard", ["ones", "zeros"])):
+    """
+    Quantum Tic Tac Toe board as two 9-bit masks: cells collapsed to |1>
+    (the user's) and cells collapsed to |0> (the computer's).
+    """
+    __slots__ = ()
+
+    @property
+    def occupied(self):
+        return self.ones | self.zeros
+
+    def place(self, move, value):
+        """Returns the board after cell move (1-9) collapsed to value (0 or 1)."""
+        bit = 1 << (move - 1)
+        if self.occupied & bit:
+            raise ValueError(f"Position {move} is already taken")
+        if value:
+            return BitBoard(self.ones | bit, self.zeros)
+        return BitBoard(self.ones, self.zeros | bit)
+
+    def available_moves(self):
+        free = ~self.occupied & FULL_MASK
+        return [m for m in range(1, 10) if free >> (m - 1) & 1]
+
+
+EMPTY_BOARD = BitBoard(0, 0)
+
+
+def winner(board):
+    """Returns 1 if the user has a line, 0 if the computer has one, otherwise None."""
+    if WINNING_LINE[board.ones]:
+        return 1
+    if WINNING_LINE[board.zeros]:
+        return 0
+    return None
+
+
+def validate_bits(board):
+    """
+    Bitboard version of game.validate.
+    Returns:
+        0 if game ends (win or draw)
+        1 if game continues
+    """
+    if WINNING_LINE[board.ones]:
+        return 0, "User wins!"
+    if WINNING_LINE[board.zeros]:
+        return 0, "Computer wins!"
+    if board.occupied == FULL_MASK:
+        return 0, "It is a draw!"
+    return 1, ""  # Continue game
+
+
+def from_string_board(board):
+    """Converts the 3x3 array of '|0>', '|1>', '|ψ>' strings used for display into a BitBoard."""
+    ones = zeros = 0
+    for index, cell in enumerate(np.asarray(board).reshape(-1)):
+        if cell == ONE_KET:
+            ones |= 1 << index
+        elif cell == ZERO_KET:
+            zeros |= 1 << index
+    return BitBoard(ones, zeros)
+
+
+def to_string_board(board):
+    """Converts a BitBoard into the 3x3 array of ket strings shown on the page."""
+    cells = np.full(9, PSI)
+    for index in range(9):
+        if board.ones >> index & 1:
+            cells[index] = ONE_KET
+        elif board.zeros >> index & 1:
+            cells[index] = ZERO_KET
+    return cells.reshape(3, 3)
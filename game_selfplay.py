@@ -0,0 +1,115 @@
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from game_bitboard import WINNING_LINE_TABLE
+
+DEFAULT_BATCH_SIZE = 2**18
+OUTCOMES = ("User wins!", "Computer wins!", "It is a draw!")
+
+
+def simulate_batch(num_games, seed=None, p_one=0.5):
+    """
+    Plays num_games headless games at once with NumPy.
+
+    Both sides pick a uniformly random free cell (so the fill order is a
+    random permutation of the 9 cells) and every placed cell collapses to
+    |1> with probability p_one, exactly like game.get_random_value. After
+    each placement the game.validate rules apply: the first line of |1>s is a
+    user win, the first line of |0>s a computer win, a full board a draw.
+
+    Returns a dict of raw counts that merge_results() can add together.
+    """
+    rng = np.random.default_rng(seed)
+    games = np.arange(num_games)
+
+    order = np.argsort(rng.random((num_games, 9)), axis=1)
+    values = (rng.random((num_games, 9)) < p_one).astype(np.uint16)
+    cell_bits = (1 << order).astype(np.uint16)
+
+    # Masks after each placement (cells are distinct, so a running sum is a running OR)
+    ones = np.cumsum(cell_bits * values, axis=1, dtype=np.uint16)
+    zeros = np.cumsum(cell_bits * (1 - values), axis=1, dtype=np.uint16)
+    user_line = WINNING_LINE_TABLE[ones]
+    computer_line = WINNING_LINE_TABLE[zeros]
+
+    ended = (user_line | computer_line) != 0
+    last_move = np.where(ended.any(axis=1), ended.argmax(axis=1), 8)
+    user_won = user_line[games, last_move]
+    computer_won = computer_line[games, last_move]
+
+    # Unpack the winning line masks into per-cell counts
+    cells = np.arange(9, dtype=np.uint16)
+    user_cells = ((user_won[:, None] >> cells) & 1).sum(axis=0)
+    computer_cells = ((computer_won[:, None] >> cells) & 1).sum(axis=0)
+
+    num_user = int(np.count_nonzero(user_won))
+    num_computer = int(np.count_nonzero(computer_won))
+    return {
+        "games": num_games,
+        "outcomes": np.array([num_user, num_computer, num_games - num_user - num_computer], dtype=np.int64),
+        "user_win_cells": user_cells.astype(np.int64),
+        "computer_win_cells": computer_cells.astype(np.int64),
+        "game_lengths": np.bincount(last_move + 1, minlength=10).astype(np.int64),
+    }
+
+
+def merge_results(results):
+    """Adds up the counts of several simulate_batch() results."""
+    results = list(results)
+    return {key: sum(r[key] for r in results) for key in results[0]}
+
+
+def _run_batch(args):
+    return simulate_batch(*args)
+
+
+def simulate_games(num_games, batch_size=DEFAULT_BATCH_SIZE, workers=None, seed=None, p_one=0.5):
+    """
+    Plays num_games games split into batches across a ProcessPoolExecutor
+    (workers=1 runs in-process) and returns the outcome distribution,
+    per-cell win contributions and throughput in games per second.
+    """
+    seeds = np.random.SeedSequence(seed).spawn((num_games + batch_size - 1) // batch_size)
+    batches = [
+        (min(batch_size, num_games - i * batch_size), seeds[i], p_one)
+        for i in range(len(seeds))
+    ]
+
+    start = time.perf_counter()
+    if workers == 1 or len(batches) == 1:
+        totals = merge_results(map(_run_batch, batches))
+    else:
+        # Fresh interpreters instead of forks of the (multi-threaded) Streamlit server
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count(),
+                                 mp_context=multiprocessing.get_context("spawn")) as executor:
+            totals = merge_results(executor.map(_run_batch, batches))
+    seconds = time.perf_counter() - start
+
+    games = totals["games"]
+    return {
+        "games": games,
+        "seconds": seconds,
+        "games_per_second": games / seconds if seconds else float("inf"),
+        "outcomes": dict(zip(OUTCOMES, totals["outcomes"].tolist())),
+        "probabilities": dict(zip(OUTCOMES, (totals["outcomes"] / games).tolist())),
+        # Share of wins in which each cell (3x3, row-major) is part of the winning line
+        "user_win_cells": (totals["user_win_cells"] / max(totals["outcomes"][0], 1)).reshape(3, 3),
+        "computer_win_cells": (totals["computer_win_cells"] / max(totals["outcomes"][1], 1)).reshape(3, 3),
+        "game_lengths": totals["game_lengths"].tolist(),
+    }
+
+
+if __name__ == "__main__":
+    stats = simulate_games(int(sys.argv[1]) if len(sys.argv) > 1 else 10**6)
+    print(f"{stats['games']} games in {stats['seconds']:.2f} s ({stats['games_per_second']:,.0f} games/s)")
+    for outcome, probability in stats["probabilities"].items():
+        print(f"  {outcome:<16} {probability:.4%}")
+    print("User win contribution per cell:")
+    print(np.array2string(stats["user_win_cells"], precision=3))
+    print("Computer win contribution per cell:")
+    print(np.array2string(stats["computer_win_cells"], precision=3))
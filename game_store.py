@@ -0,0 +1,267 @@
+import os
+import secrets
+import sqlite3
+import threading
+import time
+import tracemalloc
+from collections import OrderedDict
+
+import numpy as np
+
+from game_bitboard import EMPTY_BOARD, validate_bits
+
+DB_PATH = os.environ.get("QUANTUM_GAME_DB")  # unset keeps games in memory only
+MAX_GAMES = 100_000
+MAX_PLAY_ATTEMPTS = 10  # concurrent moves on one game retry this often before giving up
+
+
+def encode_placement(move, value):
+    """One byte per placement: the cell (1-9) in the high bits, the collapsed value in bit 0."""
+    return (move << 1) | value
+
+
+def decode_history(history):
+    """Yields (move, value) pairs from a serialized history."""
+    for byte in history:
+        yield byte >> 1, byte & 1
+
+
+def replay(history):
+    """Returns the BitBoard after every placement, starting with the empty board."""
+    boards = [EMPTY_BOARD]
+    for move, value in decode_history(history):
+        boards.append(boards[-1].place(move, value))
+    return boards
+
+
+class GameState:
+    """
+    A game rebuilt from its history. The history is the whole stored state:
+    placements alternate user, computer, user, ... starting with the user,
+    so a finished game takes at most 9 bytes.
+    """
+
+    def __init__(self, history=b""):
+        self.history = bytes(history)
+        self.board = EMPTY_BOARD
+        for move, value in decode_history(self.history):
+            self.board = self.board.place(move, value)
+        self.status, self.message = validate_bits(self.board)
+
+    @property
+    def game_over(self):
+        return self.status == 0
+
+    @property
+    def player_moves(self):
+        return [move for move, _ in decode_history(self.history[0::2])]
+
+    @property
+    def computer_moves(self):
+        return [move for move, _ in decode_history(self.history[1::2])]
+
+    @property
+    def available_moves(self):
+        return self.board.available_moves()
+
+    def play(self, move, value):
+        """Returns the state after placing move (1-9) collapsed to value (0 or 1)."""
+        if self.game_over:
+            raise ValueError("The game is already over")
+        self.board.place(move, value)  # raises if the cell is taken
+        return GameState(self.history + bytes([encode_placement(move, value)]))
+
+
+class MemoryGameStore:
+    """In-process store of game histories with LRU eviction beyond max_games."""
+
+    def __init__(self, max_games=MAX_GAMES):
+        self.max_games = max_games
+        self._games = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def get(self, game_id):
+        with self._lock:
+            history = self._games.get(game_id)
+            if history is not None:
+                self._games.move_to_end(game_id)
+            return history
+
+    def put(self, game_id, history):
+        with self._lock:
+            self._games[game_id] = bytes(history)
+            self._games.move_to_end(game_id)
+            while len(self._games) > self.max_games:
+                self._games.popitem(last=False)
+                self.evictions += 1
+
+    def replace(self, game_id, expected, history):
+        """Saves history only if the game still holds expected; returns whether it did."""
+        with self._lock:
+            if self._games.get(game_id) != expected:
+                return False
+            self._games[game_id] = bytes(history)
+            self._games.move_to_end(game_id)
+            return True
+
+    def delete(self, game_id):
+        with self._lock:
+            self._games.pop(game_id, None)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "backend": "memory",
+                "games": len(self._games),
+                "max_games": self.max_games,
+                "evictions": self.evictions,
+                "history_bytes": sum(len(h) for h in self._games.values()),
+            }
+
+
+class SQLiteGameStore:
+    """
+    Game histories in a SQLite file on local disk, so games survive restarts
+    and are shared by every worker process on the machine. Every read goes to
+    the database: another process may have changed the game since.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS games (id TEXT PRIMARY KEY, history BLOB NOT NULL, updated REAL NOT NULL)"
+            )
+
+    def get(self, game_id):
+        with self._lock:
+            row = self._conn.execute("SELECT history FROM games WHERE id = ?", (game_id,)).fetchone()
+        return None if row is None else bytes(row[0])
+
+    def put(self, game_id, history):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO games (id, history, updated) VALUES (?, ?, ?)",
+                (game_id, bytes(history), time.time())
+            )
+
+    def replace(self, game_id, expected, history):
+        """Saves history only if the game still holds expected (in one statement); returns whether it did."""
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "UPDATE games SET history = ?, updated = ? WHERE id = ? AND history = ?",
+                (bytes(history), time.time(), game_id, bytes(expected))
+            )
+        return cursor.rowcount == 1
+
+    def delete(self, game_id):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM games WHERE id = ?", (game_id,))
+
+    def stats(self):
+        with self._lock:
+            games, history_bytes = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(LENGTH(history)), 0) FROM games"
+            ).fetchone()
+        return {
+            "backend": "sqlite",
+            "path": self.path,
+            "games": games,
+            "history_bytes": history_bytes,
+        }
+
+
+class GameService:
+    """Creates, loads and updates games in a store, keyed by short random ids."""
+
+    def __init__(self, store):
+        self.store = store
+
+    def new_game(self):
+        game_id = secrets.token_urlsafe(6)
+        self.store.put(game_id, b"")
+        return game_id
+
+    def load(self, game_id):
+        """Returns the GameState of a game, or None if the id is unknown (or was evicted)."""
+        history = self.store.get(game_id) if game_id else None
+        return None if history is None else GameState(history)
+
+    def play(self, game_id, move, value):
+        """
+        Applies one placement and saves the game. The save only succeeds if
+        nobody changed the game since it was loaded; otherwise the placement
+        is retried on the newer state, so concurrent moves are not lost.
+        """
+        for _ in range(MAX_PLAY_ATTEMPTS):
+            state = self.load(game_id)
+            if state is None:
+                raise KeyError(f"Unknown game {game_id!r}")
+            new_state = state.play(move, value)  # raises if the cell was taken meanwhile
+            if self.store.replace(game_id, state.history, new_state.history):
+                return new_state
+        raise RuntimeError(f"Game {game_id!r} keeps changing, try again")
+
+    def replay(self, game_id):
+        """Every board of a game from the first placement on."""
+        state = self.load(game_id)
+        return [] if state is None else replay(state.history)[1:]
+
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def get_game_service():
+    """Process-wide service: SQLite if QUANTUM_GAME_DB is set, otherwise in memory."""
+    global _service
+    with _service_lock:
+        if _service is None:
+            store = SQLiteGameStore(DB_PATH) if DB_PATH else MemoryGameStore()
+            _service = GameService(store)
+        return _service
+
+
+def _random_history(rng):
+    """A random finished game, as the app would store it."""
+    state = GameState()
+    while not state.game_over:
+        state = state.play(int(rng.choice(state.available_moves)), int(rng.integers(2)))
+    return state.history
+
+
+def measure_footprint(num_games=100_000, seed=None):
+    """
+    Fills a fresh MemoryGameStore with num_games finished random games and
+    reports the traced memory it holds, overall and per game.
+    """
+    rng = np.random.default_rng(seed)
+    histories = [_random_history(rng) for _ in range(min(num_games, 1000))]
+
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        store = MemoryGameStore(max_games=num_games)
+        for i in range(num_games):
+            # A fresh bytes object per game, as every game in the app has its own history
+            store.put(secrets.token_urlsafe(6), bytes(bytearray(histories[i % len(histories)])))
+        total = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "games": num_games,
+        "total_bytes": total,
+        "bytes_per_game": total / num_games,
+        "history_bytes_per_game": store.stats()["history_bytes"] / num_games,
+    }
+
+
+if __name__ == "__main__":
+    footprint = measure_footprint()
+    print(f"{footprint['games']} games: {footprint['total_bytes'] / 2**20:.1f} MiB in memory, "
+          f"{footprint['bytes_per_game']:.0f} B per game ({footprint['history_bytes_per_game']:.1f} B of history)")
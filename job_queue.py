@@ -0,0 +1,278 @@
+import itertools
+import multiprocessing
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+
+import streamlit as st
+
+MAX_WORKERS = os.cpu_count() or 1
+MAX_ACTIVE_JOBS = 4 * MAX_WORKERS  # across all sessions
+MAX_JOBS_PER_SESSION = 2
+FINISHED_JOB_TTL_SECONDS = 600  # results nobody collected are dropped this long after the last chunk ends
+POLL_SECONDS = 0.5
+
+
+class Job:
+    """A job split into chunks; each chunk is one task on the process pool."""
+
+    def __init__(self, job_id, session_id, label, futures, combine):
+        self.job_id = job_id
+        self.session_id = session_id
+        self.label = label
+        self.futures = futures
+        self.combine = combine
+        self.submitted = time.time()
+        self.completed = None  # when the last chunk ended, whether or not anyone polls
+        self.finished = None
+        self.cancelled = False
+        self.forgotten = False  # nobody polls it any more
+        self.status = None  # set once the job has finished
+        self.result = None
+        self.error = None
+
+    def _chunk_done(self, future):
+        if self.completed is None and all(f.done() for f in self.futures):
+            self.completed = time.time()
+
+    @property
+    def active(self):
+        """A job holds its admission slot until no chunk is left queued or running, even when cancelled."""
+        return not all(f.done() for f in self.futures)
+
+
+class JobQueue:
+    """
+    Background jobs on a ProcessPoolExecutor with submit, poll and cancel.
+
+    submit() takes a picklable function and one argument tuple per chunk; the
+    chunks run in parallel and progress is the share of finished chunks. When
+    all chunks are done, combine(list of chunk results) gives the job result.
+    Admission control turns jobs away (RuntimeError) once MAX_ACTIVE_JOBS are
+    active overall or MAX_JOBS_PER_SESSION for the same session.
+    """
+
+    def __init__(self, max_workers=MAX_WORKERS, max_active_jobs=MAX_ACTIVE_JOBS,
+                 max_jobs_per_session=MAX_JOBS_PER_SESSION):
+        self.max_workers = max_workers
+        self.max_active_jobs = max_active_jobs
+        self.max_jobs_per_session = max_jobs_per_session
+        self._executor = None
+        self._jobs = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        if self._executor is None:
+            # Fresh interpreters instead of forks of the (multi-threaded) Streamlit server
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers,
+                                                 mp_context=multiprocessing.get_context("spawn"))
+        return self._executor
+
+    def _purge(self):
+        # Jobs with chunks still queued or running stay, so they keep counting towards the limits
+        cutoff = time.time() - FINISHED_JOB_TTL_SECONDS
+        stale = [j.job_id for j in self._jobs.values()
+                 if not j.active and (j.forgotten or j.cancelled or (j.completed and j.completed < cutoff))]
+        for job_id in stale:
+            del self._jobs[job_id]
+
+    def submit(self, session_id, fn, chunks, combine=None, label=""):
+        """Queues fn(*args) for every args in chunks and returns the job id."""
+        chunks = list(chunks)
+        if not chunks:
+            raise ValueError("A job needs at least one chunk")
+
+        with self._lock:
+            self._purge()
+            active = [j for j in self._jobs.values() if j.active]
+            if len(active) >= self.max_active_jobs:
+                raise RuntimeError("The simulator is busy, try again in a moment.")
+            if sum(j.session_id == session_id for j in active) >= self.max_jobs_per_session:
+                raise RuntimeError(f"You already have {self.max_jobs_per_session} jobs running. "
+                                   "Wait for one to finish or cancel it.")
+
+            executor = self._get_executor()
+            futures = [executor.submit(fn, *args) for args in chunks]
+            job_id = f"{next(self._ids)}-{uuid.uuid4().hex[:8]}"
+            job = Job(job_id, session_id, label, futures, combine)
+            self._jobs[job_id] = job
+        for future in futures:
+            future.add_done_callback(job._chunk_done)
+        return job_id
+
+    def poll(self, job_id):
+        """
+        Returns the job's status ("queued", "running", "done", "failed" or
+        "cancelled"), its progress as finished/total chunks and, once done,
+        the combined result.
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is None:
+            raise KeyError(f"Unknown job {job_id}")
+
+        done = sum(f.done() for f in job.futures)
+        total = len(job.futures)
+        with self._lock:
+            if job.finished is None:
+                failed = next((f for f in job.futures if f.done() and not f.cancelled() and f.exception()), None)
+                if job.cancelled:
+                    job.status = "cancelled"
+                elif failed is not None:
+                    job.status, job.error = "failed", str(failed.exception())
+                    self._cancel_futures(job)
+                elif done == total:
+                    try:
+                        results = [f.result() for f in job.futures]
+                        job.result = job.combine(results) if job.combine else results
+                        job.status = "done"
+                    except Exception as e:
+                        job.status, job.error = "failed", str(e)
+                if job.status is not None:
+                    job.finished = time.time()
+
+        if job.finished is not None:
+            status = job.status
+        else:
+            status = "running" if any(f.running() for f in job.futures) else "queued"
+
+        return {
+            "job_id": job_id,
+            "label": job.label,
+            "status": status,
+            "chunks_done": done,
+            "chunks": total,
+            "progress": done / total,
+            "seconds": (job.finished or time.time()) - job.submitted,
+            "result": job.result,
+            "error": job.error,
+        }
+
+    @staticmethod
+    def _cancel_futures(job):
+        for future in job.futures:
+            future.cancel()
+
+    def cancel(self, job_id):
+        """Cancels the chunks that have not started; running chunks finish and their results are discarded."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is not None:
+            job.cancelled = True
+            self._cancel_futures(job)
+
+    def forget(self, job_id):
+        """Drops a job nobody will poll again, as soon as none of its chunks is queued or running."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                job.forgotten = True
+            self._purge()
+
+    def stats(self):
+        with self._lock:
+            active = [j for j in self._jobs.values() if j.active]
+            return {
+                "workers": self.max_workers,
+                "active_jobs": len(active),
+                "queued_chunks": sum(not f.running() and not f.done() for j in active for f in j.futures),
+                "tracked_jobs": len(self._jobs),
+            }
+
+
+_queue = None
+_queue_lock = threading.Lock()
+
+
+def get_job_queue():
+    """Process-wide job queue, shared by every session of this server."""
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            _queue = JobQueue()
+        return _queue
+
+
+def split_shots(shots, chunks=MAX_WORKERS):
+    """Splits shots into at most chunks nearly equal, non-empty parts."""
+    chunks = max(1, min(chunks, shots))
+    return [shots // chunks + (i < shots % chunks) for i in range(chunks)]
+
+
+def merge_counts(results):
+    """Adds up counts dicts from several chunks."""
+    total = {}
+    for counts in results:
+        for state, count in counts.items():
+            total[state] = total.get(state, 0) + count
+    return total
+
+
+# --- Streamlit helpers ---
+
+def session_id():
+    """A random id identifying this browser session for the per-session job limit."""
+    if "job_session_id" not in st.session_state:
+        st.session_state.job_session_id = uuid.uuid4().hex
+    return st.session_state.job_session_id
+
+
+def submit_job(state_key, fn, chunks, combine=None, label=""):
+    """
+    Submits a job for this session and remembers its id under state_key.
+    Returns False (after showing why) when admission control rejects it.
+    """
+    queue = get_job_queue()
+    previous = st.session_state.get(state_key)
+    if previous is not None:
+        # A new run replaces the one still in flight for the same widget; its running
+        # chunks keep counting towards the limits until they finish
+        queue.cancel(previous)
+        queue.forget(previous)
+        st.session_state[state_key] = None
+    try:
+        st.session_state[state_key] = queue.submit(session_id(), fn, chunks, combine, label)
+    except RuntimeError as e:
+        st.error(str(e))
+        return False
+    return True
+
+
+@st.fragment(run_every=POLL_SECONDS)
+def _job_progress(state_key):
+    job_id = st.session_state.get(state_key)
+    if job_id is None:
+        return
+    queue = get_job_queue()
+    try:
+        status = queue.poll(job_id)
+    except KeyError:
+        st.session_state[state_key] = None
+        return
+
+    if status["status"] in ("queued", "running"):
+        st.progress(status["progress"], text=f"{status['label']}: {status['chunks_done']}/{status['chunks']} chunks "
+                                             f"{status['status']} ({status['seconds']:.1f} s)")
+        if st.button("Cancel", key=f"{state_key}_cancel"):
+            queue.cancel(job_id)
+        return
+
+    # Finished: hand the status to the page and rerun it outside the fragment
+    queue.forget(job_id)
+    st.session_state[state_key] = None
+    st.session_state[f"{state_key}_finished"] = status
+    st.rerun()
+
+
+def track_job(state_key):
+    """
+    Shows a self-refreshing progress bar for the job under state_key while it
+    runs. Returns its final status dict once, on the first run after it
+    finished, and None otherwise.
+    """
+    if st.session_state.get(state_key):
+        _job_progress(state_key)
+    return st.session_state.pop(f"{state_key}_finished", None)
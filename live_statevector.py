@@ -0,0 +1,71 @@
+import numpy as np
+
+
+def apply_gate(psi, matrix, qubits):
+    """
+    Applies a k-qubit gate matrix to a statevector stored as an n-dimensional
+    (2, 2, ..., 2) tensor, writing the result back into psi.
+
+    Qubit ordering follows Qiskit: qubit q is bit q of the basis index, which
+    is tensor axis n - 1 - q, and the gate matrix treats qubits[0] as its
+    least significant bit. Only the k touched axes are contracted, so the
+    cost is O(2^n) per gate.
+    """
+    n = psi.ndim
+    k = len(qubits)
+    gate = np.asarray(matrix).reshape((2,) * (2 * k))
+    # Matrix axes are most significant first: qubits[k-1], ..., qubits[0]
+    axes = [n - 1 - q for q in reversed(qubits)]
+    result = np.tensordot(gate, psi, axes=(list(range(k, 2 * k)), axes))
+    psi[...] = np.moveaxis(result, list(range(k)), axes)
+
+
+class LiveStatevector:
+    """
+    Statevector of the circuit builder's circuit, kept in sync gate by gate.
+
+    Every applied gate pushes a delta (its inverse matrix and qubits) onto an
+    undo stack, so undoing is just another O(2^n) gate application.
+    """
+
+    def __init__(self, num_qubits):
+        self.num_qubits = num_qubits
+        self.psi = np.zeros((2,) * num_qubits, dtype=complex)
+        self.psi[(0,) * num_qubits] = 1.0
+        self._undo = []
+
+    def apply(self, operation, qubits):
+        """Evolves the state by a Qiskit gate acting on the given qubit indices."""
+        matrix = operation.to_matrix()
+        apply_gate(self.psi, matrix, qubits)
+        self._undo.append((operation.name, tuple(qubits), matrix.conj().T))
+
+    def undo(self):
+        """Reverts the last applied gate. Returns its (name, qubits), or None if there is nothing to undo."""
+        if not self._undo:
+            return None
+        name, qubits, inverse = self._undo.pop()
+        apply_gate(self.psi, inverse, qubits)
+        return name, qubits
+
+    def rewind(self, depth):
+        """Undoes gates until only the first depth of them remain applied."""
+        while self.depth > depth:
+            self.undo()
+
+    @property
+    def depth(self):
+        """Number of gates applied (and not undone) so far."""
+        return len(self._undo)
+
+    def amplitudes(self):
+        """Flat amplitude vector indexed like Qiskit's Statevector.data."""
+        # Axis 0 is the most significant qubit, so a C-order flatten matches Qiskit's indexing
+        return self.psi.reshape(-1)
+
+    def probabilities(self):
+        """
+        Outcome probabilities when every qubit i is measured into clbit i, as an
+        array indexed by basis state (the outcome's bitstring read as binary).
+        """
+        return np.abs(self.amplitudes()) ** 2
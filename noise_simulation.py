@@ -0,0 +1,334 @@
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from job_queue import MAX_WORKERS, merge_counts, split_shots, submit_job, track_job
+from live_statevector import apply_gate
+from numpy_statevector import apply_gate_batch, outcome_distribution, simulate, supports, unitary_gates
+from probability_sampler import measurement_map, sample_counts
+from transpile_cache import circuit_key
+
+DENSITY_MATRIX_MAX_QUBITS = 8  # 4^8 entries = 1 MiB; every gate costs O(4^n)
+TRAJECTORY_MAX_QUBITS = 16
+TRAJECTORY_MAX_AMPLITUDES = 2**20  # amplitudes held at once by one worker (16 MiB)
+MAX_ERROR_RATE = 0.2
+
+NOISE_METHODS = {
+    "Exact density matrix": "density_matrix",
+    "Monte Carlo trajectories (process pool)": "trajectories",
+}
+
+_I = np.eye(2, dtype=complex)
+_PAULIS = np.array([
+    _I,
+    [[0, 1], [1, 0]],
+    [[0, -1j], [1j, 0]],
+    [[1, 0], [0, -1]],
+], dtype=complex)
+
+
+class NoiseModel:
+    """
+    Noise applied after every gate to each qubit the gate touches, plus
+    readout error on every measured bit:
+
+    - depolarizing: probability of a random X, Y or Z error
+    - amplitude_damping: probability that |1⟩ decays to |0⟩
+    - readout_error: probability that a measured bit is flipped
+    """
+
+    def __init__(self, depolarizing=0.0, amplitude_damping=0.0, readout_error=0.0):
+        for name, value in (("depolarizing", depolarizing), ("amplitude_damping", amplitude_damping),
+                            ("readout_error", readout_error)):
+            if not 0 <= value <= 1:
+                raise ValueError(f"{name} must be between 0 and 1")
+        self.depolarizing = depolarizing
+        self.amplitude_damping = amplitude_damping
+        self.readout_error = readout_error
+
+    def kraus_channels(self):
+        """Single-qubit gate-error channels as lists of Kraus operators, in the order they are applied."""
+        channels = []
+        p = self.depolarizing
+        if p:
+            channels.append([np.sqrt(1 - p) * _I] + [np.sqrt(p / 3) * pauli for pauli in _PAULIS[1:]])
+        gamma = self.amplitude_damping
+        if gamma:
+            channels.append([
+                np.array([[1, 0], [0, np.sqrt(1 - gamma)]], dtype=complex),
+                np.array([[0, np.sqrt(gamma)], [0, 0]], dtype=complex),
+            ])
+        return channels
+
+
+def _check_circuit(qc, max_qubits):
+    if not supports(qc, max_qubits):
+        raise ValueError(f"Noisy simulation needs a circuit of builder gates on at most {max_qubits} qubits, "
+                         "measured at the end")
+
+
+def _readout_probabilities(p, pairs, readout_error):
+    """Applies independent bit flips to the measured qubits of a (2, ..., 2) probability tensor."""
+    n = p.ndim
+    for qubit, _ in pairs:
+        p = (1 - readout_error) * p + readout_error * np.flip(p, axis=n - 1 - qubit)
+    return p
+
+
+def _probability_dict(labels, p):
+    return {label: float(v) for label, v in zip(labels, p) if v > 1e-12}
+
+
+def ideal_probabilities(qc):
+    """Noise-free outcome distribution of qc as a {bitstring: probability} dict."""
+    labels, p = outcome_distribution(qc, measurement_map(qc), np.abs(simulate(qc)) ** 2)
+    return _probability_dict(labels, p)
+
+
+def distribution_fidelity(p, q):
+    """Classical (Bhattacharyya) fidelity of two outcome distributions given as dicts of probabilities or counts."""
+    p_total, q_total = sum(p.values()), sum(q.values())
+    overlap = sum(np.sqrt(p[s] / p_total * q.get(s, 0) / q_total) for s in p)
+    return float(overlap ** 2)
+
+
+# --- Exact density matrix ---
+
+def _evolve_density_matrix(rho, kraus, qubits, n):
+    """rho -> sum K rho K† for a (2,)*2n density matrix tensor, rows first."""
+    # Row qubit q is axis n-1-q, i.e. "qubit" q+n of the 2n-axis tensor; column qubit q is "qubit" q
+    row_qubits = [q + n for q in qubits]
+    if len(kraus) == 1:
+        apply_gate(rho, kraus[0], row_qubits)
+        apply_gate(rho, kraus[0].conj(), qubits)
+        return
+    total = np.zeros_like(rho)
+    for k in kraus:
+        term = rho.copy()
+        apply_gate(term, k, row_qubits)
+        apply_gate(term, k.conj(), qubits)
+        total += term
+    rho[...] = total
+
+
+def density_matrix(qc, noise):
+    """Final density matrix of the unitary part of qc under noise, as a (2^n, 2^n) array."""
+    n = qc.num_qubits
+    rho = np.zeros((2,) * (2 * n), dtype=complex)
+    rho[(0,) * (2 * n)] = 1.0
+    channels = noise.kraus_channels()
+    for matrix, qubits in unitary_gates(qc):
+        _evolve_density_matrix(rho, [matrix], qubits, n)
+        for qubit in qubits:
+            for kraus in channels:
+                _evolve_density_matrix(rho, kraus, [qubit], n)
+    return rho.reshape(2 ** n, 2 ** n)
+
+
+def run_density_matrix(qc, noise, shots=1000, seed=None):
+    """
+    Exact noisy simulation for circuits up to DENSITY_MATRIX_MAX_QUBITS.
+    Returns the noisy outcome probabilities, shots sampled from them, and the
+    state fidelity ⟨ψ|ρ|ψ⟩ with the ideal state ψ.
+    """
+    _check_circuit(qc, DENSITY_MATRIX_MAX_QUBITS)
+    pairs = measurement_map(qc)
+    rho = density_matrix(qc, noise)
+    ideal = simulate(qc)
+
+    p = _readout_probabilities(rho.diagonal().real.reshape((2,) * qc.num_qubits), pairs, noise.readout_error)
+    labels, p = outcome_distribution(qc, pairs, p.reshape(-1))
+    probabilities = _probability_dict(labels, p)
+    return {
+        "counts": sample_counts(probabilities, shots, seed),
+        "probabilities": probabilities,
+        "state_fidelity": float((ideal.conj() @ rho @ ideal).real),
+    }
+
+
+# --- Monte Carlo trajectories ---
+
+def _apply_noise_batch(psi, qubit, noise, rng):
+    """Draws one gate error per trajectory on qubit for a (batch, 2, ..., 2) tensor of statevectors."""
+    batch = psi.shape[0]
+    if noise.depolarizing:
+        # Only the trajectories that got a Pauli error are touched
+        hit = np.flatnonzero(rng.random(batch) < noise.depolarizing)
+        if len(hit):
+            psi[hit] = apply_gate_batch(psi[hit], _PAULIS[rng.integers(1, 4, len(hit))], [qubit])
+
+    gamma = noise.amplitude_damping
+    if gamma:
+        # Quantum jump: decay with probability gamma * P(qubit = 1), otherwise the no-jump
+        # Kraus operator, which only rescales the |0⟩ and |1⟩ halves; both renormalized
+        view = psi.reshape(batch, -1, 2, 2 ** qubit)
+        p1 = (np.abs(view[:, :, 1, :]) ** 2).sum(axis=(1, 2))
+        jump = rng.random(batch) < gamma * p1
+        stay = 1 / np.sqrt(1 - gamma * p1[~jump])[:, None, None]
+        view[~jump, :, 0, :] *= stay
+        view[~jump, :, 1, :] *= stay * np.sqrt(1 - gamma)
+        view[jump, :, 0, :] = view[jump, :, 1, :] / np.sqrt(p1[jump])[:, None, None]
+        view[jump, :, 1, :] = 0
+        psi = view.reshape(psi.shape)
+    return psi
+
+
+def sample_trajectories(qc, noise, trajectories, seed=None):
+    """
+    Runs noisy statevector trajectories of qc, one shot each: every gate error
+    is drawn at random per trajectory, so the average over trajectories is the
+    noisy density matrix. Trajectories are simulated in batches with one einsum
+    per gate. Returns the counts, the summed overlaps |⟨ψ|ψ_t⟩|² with the ideal
+    state (whose mean estimates the state fidelity) and the trajectory count.
+    This is the unit of work of one process-pool chunk.
+    """
+    _check_circuit(qc, TRAJECTORY_MAX_QUBITS)
+    rng = np.random.default_rng(seed)
+    n = qc.num_qubits
+    pairs = measurement_map(qc)
+    gates = unitary_gates(qc)
+    ideal = simulate(qc)
+    batch_size = max(1, TRAJECTORY_MAX_AMPLITUDES // 2 ** n)
+
+    counts = {}
+    fidelity_sum = 0.0
+    for start in range(0, trajectories, batch_size):
+        batch = min(batch_size, trajectories - start)
+        psi = np.zeros((batch,) + (2,) * n, dtype=complex)
+        psi[(slice(None),) + (0,) * n] = 1.0
+        for matrix, qubits in gates:
+            psi = apply_gate_batch(psi, matrix, qubits)
+            for qubit in qubits:
+                psi = _apply_noise_batch(psi, qubit, noise, rng)
+
+        psi = psi.reshape(batch, -1)
+        fidelity_sum += float((np.abs(psi @ ideal.conj()) ** 2).sum())
+
+        # One measurement per trajectory by inverse transform sampling, then readout flips
+        cdf = np.cumsum(np.abs(psi) ** 2, axis=1)
+        states = np.minimum((cdf < rng.random((batch, 1)) * cdf[:, -1:]).sum(axis=1), 2 ** n - 1)
+        outcomes = np.zeros(batch, dtype=np.int64)
+        for qubit, clbit in pairs:
+            bit = (states >> qubit) & 1
+            bit ^= rng.random(batch) < noise.readout_error
+            outcomes |= bit << clbit
+        values, hits = np.unique(outcomes, return_counts=True)
+        counts = merge_counts([counts, {format(int(v), f"0{qc.num_clbits}b"): int(h) for v, h in zip(values, hits)}])
+
+    return {"counts": counts, "fidelity_sum": fidelity_sum, "trajectories": trajectories}
+
+
+def trajectory_chunks(qc, noise, trajectories, chunks=MAX_WORKERS, seed=None):
+    """Argument tuples for sample_trajectories splitting the work into chunks with independent seeds."""
+    sizes = split_shots(trajectories, chunks)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    return [(qc, noise, size, s) for size, s in zip(sizes, seeds)]
+
+
+def merge_trajectories(results):
+    """Combines the results of several sample_trajectories chunks into counts and a state fidelity estimate."""
+    trajectories = sum(r["trajectories"] for r in results)
+    return {
+        "counts": merge_counts(r["counts"] for r in results),
+        "probabilities": None,
+        "state_fidelity": sum(r["fidelity_sum"] for r in results) / trajectories,
+    }
+
+
+def run_trajectories(qc, noise, trajectories=1000, seed=None, max_workers=1):
+    """Monte Carlo noisy simulation; with max_workers > 1 the chunks run on a process pool of that size."""
+    chunks = trajectory_chunks(qc, noise, trajectories, max_workers, seed)
+    if max_workers == 1:
+        return merge_trajectories([sample_trajectories(*args) for args in chunks])
+    with ProcessPoolExecutor(max_workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+        return merge_trajectories(list(executor.map(sample_trajectories, *zip(*chunks))))
+
+
+def run_noisy(qc, noise, method="density_matrix", shots=1000, seed=None, max_workers=1):
+    """Noisy simulation with either method, plus the ideal distribution and both fidelities."""
+    if method == "density_matrix":
+        result = run_density_matrix(qc, noise, shots, seed)
+    elif method == "trajectories":
+        result = run_trajectories(qc, noise, shots, seed, max_workers)
+    else:
+        raise ValueError(f"Unknown noise simulation method: {method}")
+    return _with_fidelities(qc, result)
+
+
+def _with_fidelities(qc, result):
+    ideal = ideal_probabilities(qc)
+    noisy = result["probabilities"] or result["counts"]
+    return {**result, "ideal": ideal, "outcome_fidelity": distribution_fidelity(ideal, noisy)}
+
+
+# --- Streamlit section ---
+
+def display_noise_section(qc, key):
+    """
+    Noise sliders, method choice and results (ideal vs noisy distribution and
+    fidelities) for a measured circuit. key keeps the widgets and results of
+    several sections on one page apart.
+    """
+    if not supports(qc, TRAJECTORY_MAX_QUBITS):
+        st.caption(f"Noisy simulation is available for builder gates on up to {TRAJECTORY_MAX_QUBITS} qubits.")
+        return
+
+    sliders = {"min_value": 0.0, "max_value": MAX_ERROR_RATE, "step": 0.005}
+    depolarizing = st.slider("Depolarizing error per gate", value=0.02, key=f"{key}_depolarizing", **sliders)
+    amplitude_damping = st.slider("Amplitude damping per gate", value=0.02, key=f"{key}_amplitude_damping", **sliders)
+    readout_error = st.slider("Readout error per bit", value=0.01, key=f"{key}_readout_error", **sliders)
+
+    methods = list(NOISE_METHODS)
+    if qc.num_qubits > DENSITY_MATRIX_MAX_QUBITS:
+        methods = methods[1:]
+        st.caption(f"The exact density matrix is available up to {DENSITY_MATRIX_MAX_QUBITS} qubits.")
+    method = NOISE_METHODS[st.radio("Noise simulation", methods, horizontal=True, key=f"{key}_noise_method")]
+    shots = st.select_slider("Shots (one trajectory each)" if method == "trajectories" else "Shots",
+                             options=[100, 1000, 10000, 100000], value=1000, key=f"{key}_noise_shots")
+
+    if st.button("Run Noisy Simulation", key=f"{key}_noise_run"):
+        noise = NoiseModel(depolarizing, amplitude_damping, readout_error)
+        if method == "density_matrix":
+            start = time.perf_counter()
+            result = run_noisy(qc, noise, method, shots)
+            st.session_state[f"{key}_noise_result"] = {
+                **result, "key": circuit_key(qc), "method": method, "seconds": time.perf_counter() - start,
+            }
+        else:
+            # Trajectories are independent, so chunks spread over every worker process
+            st.session_state[f"{key}_noise_pending"] = {"key": circuit_key(qc), "method": method}
+            if not submit_job(f"{key}_noise_job", sample_trajectories,
+                              trajectory_chunks(qc, noise, shots, 4 * MAX_WORKERS),
+                              combine=merge_trajectories, label=f"Sampling {shots} noisy trajectories"):
+                st.session_state.pop(f"{key}_noise_pending", None)
+
+    finished = track_job(f"{key}_noise_job")
+    if finished is not None:
+        if finished['status'] == "done":
+            st.session_state[f"{key}_noise_result"] = {
+                **_with_fidelities(qc, finished['result']), **st.session_state[f"{key}_noise_pending"],
+                "seconds": finished['seconds'],
+            }
+        else:
+            st.warning(f"Noisy simulation {finished['status']}. {finished['error'] or ''}")
+
+    result = st.session_state.get(f"{key}_noise_result")
+    if result is None or result['key'] != circuit_key(qc):
+        return
+
+    counts, ideal = result['counts'], result['ideal']
+    total = sum(counts.values())
+    states = sorted(set(ideal) | set(counts))
+    df = pd.DataFrame({
+        "Ideal": [ideal.get(s, 0.0) for s in states],
+        "Noisy": [counts.get(s, 0) / total for s in states],
+    }, index=pd.Index(states, name="State"))
+    st.bar_chart(df, stack=False, y_label="Probability")
+    st.markdown(f"**State fidelity** ⟨ψ|ρ|ψ⟩: {result['state_fidelity']:.4f} · "
+                f"**Outcome fidelity** (ideal vs noisy counts): {result['outcome_fidelity']:.4f}")
+    st.caption(f"{total} shots with the {result['method'].replace('_', ' ')} method in "
+               f"{result['seconds'] * 1000:.1f} ms")
@@ -0,0 +1,279 @@
+import time
+
+import numpy as np
+
+from live_statevector import apply_gate
+from probability_sampler import measurement_map
+
+NUMPY_MAX_QUBITS = 10  # above this Aer's optimized kernels win over per-gate NumPy calls
+
+
+def _permutation_matrix(dim, swaps):
+    matrix = np.eye(dim, dtype=complex)
+    for a, b in swaps:
+        matrix[[a, b]] = matrix[[b, a]]
+    return matrix
+
+
+# Qiskit matrix convention: the gate's first qubit is the least significant bit of the index
+GATE_MATRICES = {
+    "h": np.array([[1, 1], [1, -1]], dtype=complex) / np.sqrt(2),
+    "x": np.array([[0, 1], [1, 0]], dtype=complex),
+    "y": np.array([[0, -1j], [1j, 0]], dtype=complex),
+    "z": np.array([[1, 0], [0, -1]], dtype=complex),
+    "cx": _permutation_matrix(4, [(1, 3)]),  # control = qubit 0 (bit 0), target = qubit 1
+    "swap": _permutation_matrix(4, [(1, 2)]),
+    "ccx": _permutation_matrix(8, [(3, 7)]),  # controls = bits 0 and 1, target = bit 2
+    "cz": np.diag([1, 1, 1, -1]).astype(complex),
+}
+
+
+def _matrix_stack(rows, angles):
+    """Builds 2x2 matrices from entries that are functions of the angle; a leading axis appears for an array of angles."""
+    matrix = np.array(rows, dtype=complex)
+    return matrix if np.ndim(angles) == 0 else np.moveaxis(matrix, -1, 0)
+
+
+def _rx(a):
+    c, s = np.cos(a / 2), np.sin(a / 2)
+    return _matrix_stack([[c, -1j * s], [-1j * s, c]], a)
+
+
+def _ry(a):
+    c, s = np.cos(a / 2), np.sin(a / 2)
+    return _matrix_stack([[c, -s], [s, c]], a)
+
+
+def _rz(a):
+    zero = np.zeros_like(a)
+    return _matrix_stack([[np.exp(-0.5j * a), zero], [zero, np.exp(0.5j * a)]], a)
+
+
+def _p(a):
+    zero, one = np.zeros_like(a), np.ones_like(a)
+    return _matrix_stack([[one, zero], [zero, np.exp(1j * a)]], a)
+
+
+# Rotation gates: matrix (or stack of matrices) for an angle (or array of angles), same conventions as Qiskit
+PARAMETRIC_GATES = {"rx": _rx, "ry": _ry, "rz": _rz, "p": _p}
+_IGNORED_OPERATIONS = {"measure", "barrier"}
+SWEEP_MAX_AMPLITUDES = 2**22  # amplitudes held at once during a sweep (64 MiB)
+
+
+def gate_matrix(operation):
+    """Matrix of a supported gate with bound parameters."""
+    if operation.name in PARAMETRIC_GATES:
+        return PARAMETRIC_GATES[operation.name](float(operation.params[0]))
+    return GATE_MATRICES[operation.name]
+
+
+def supports(qc, max_qubits=NUMPY_MAX_QUBITS):
+    """
+    True if the engine can run qc: builder gates with bound parameters,
+    measurements at the end, one classical register.
+    """
+    if qc.num_qubits > max_qubits or len(qc.cregs) > 1 or qc.parameters:
+        return False
+    known = GATE_MATRICES.keys() | PARAMETRIC_GATES.keys() | _IGNORED_OPERATIONS
+    if any(i.operation.name not in known for i in qc.data):
+        return False
+    return measurement_map(qc) is not None
+
+
+def unitary_gates(qc):
+    """The gates of qc as (matrix, qubit indices) pairs, skipping measurements and barriers."""
+    return [
+        (gate_matrix(instruction.operation), [qc.find_bit(q).index for q in instruction.qubits])
+        for instruction in qc.data if instruction.operation.name not in _IGNORED_OPERATIONS
+    ]
+
+
+def simulate(qc):
+    """Final statevector of the unitary part of qc, flat and indexed like Qiskit's Statevector.data."""
+    psi = np.zeros((2,) * qc.num_qubits, dtype=complex)
+    psi[(0,) * qc.num_qubits] = 1.0
+    for matrix, qubits in unitary_gates(qc):
+        apply_gate(psi, matrix, qubits)
+    return psi.reshape(-1)
+
+
+def outcome_distribution(qc, pairs, p):
+    """
+    Sums probabilities over basis states (last axis of p) per measured clbit
+    outcome. Returns Aer-format labels (clbit 0 on the right) of the outcomes
+    that ever occur and their probabilities.
+    """
+    # Clbit value of every basis state
+    index = np.arange(p.shape[-1])
+    outcome = np.zeros(p.shape[-1], dtype=np.int64)
+    for qubit, clbit in pairs:
+        outcome |= ((index >> qubit) & 1) << clbit
+
+    totals = np.zeros((2 ** qc.num_clbits,) + p.shape[:-1])
+    np.add.at(totals, outcome, np.moveaxis(p, -1, 0))
+    totals = np.moveaxis(totals, 0, -1)
+    nonzero = np.flatnonzero(totals.reshape(-1, totals.shape[-1]).max(axis=0) > 1e-12)
+    labels = [format(int(o), f"0{qc.num_clbits}b") for o in nonzero]
+    return labels, totals[..., nonzero]
+
+
+def outcome_probabilities(qc):
+    """
+    Exact outcome distribution of the measured clbits, as parallel arrays of
+    Aer-format bitstrings (clbit 0 on the right) and probabilities.
+    """
+    labels, totals = outcome_distribution(qc, measurement_map(qc), np.abs(simulate(qc)) ** 2)
+    return labels, totals / totals.sum()
+
+
+def apply_gate_batch(psi, matrices, qubits):
+    """
+    Applies a k-qubit gate to a batch of statevectors of shape (batch, 2, ..., 2)
+    and returns the result. matrices is one (2^k, 2^k) matrix for the whole
+    batch (one tensordot) or a (batch, 2^k, 2^k) stack with one matrix per
+    state (one einsum); conventions as apply_gate.
+    """
+    n = psi.ndim - 1
+    k = len(qubits)
+    per_state = np.ndim(matrices) == 3
+    if not per_state:
+        axes = [n - q for q in reversed(qubits)]  # qubit q is axis n - q behind the batch axis
+        gate = np.asarray(matrices).reshape((2,) * (2 * k))
+        return np.moveaxis(np.tensordot(gate, psi, axes=(list(range(k, 2 * k)), axes)), list(range(k)), axes)
+    gate = np.asarray(matrices).reshape((psi.shape[0],) + (2,) * (2 * k))
+
+    # Integer einsum labels: 0 is the batch axis, 1..n the qubit axes, n+1..n+k the gate outputs
+    state_axes = list(range(1, n + 1))
+    in_axes = [state_axes[n - 1 - q] for q in reversed(qubits)]
+    out_axes = list(range(n + 1, n + 1 + k))
+    result_axes = [0] + [out_axes[in_axes.index(a)] if a in in_axes else a for a in state_axes]
+    return np.einsum(gate, [0] + out_axes + in_axes, psi, [0] + state_axes, result_axes)
+
+
+def _batch_matrices(operation, parameter, values):
+    """Matrix of a gate for every value of parameter (a single matrix if it does not depend on it)."""
+    name = operation.name
+    if name not in PARAMETRIC_GATES:
+        return GATE_MATRICES[name]
+    angle = operation.params[0]
+    if parameter not in getattr(angle, "parameters", ()):
+        return PARAMETRIC_GATES[name](float(angle))
+    if angle == parameter:
+        angles = values
+    else:
+        angles = np.array([float(angle.assign(parameter, v)) for v in values])
+    return PARAMETRIC_GATES[name](angles)
+
+
+def sweep_probabilities(qc, parameter, values, max_amplitudes=SWEEP_MAX_AMPLITUDES):
+    """
+    Outcome probabilities of qc for every value of parameter, without running
+    the circuit once per value: the statevector gets a leading batch axis over
+    the values, and each gate is applied to the whole batch with one einsum
+    (gates that depend on the parameter get one matrix per value). Values are
+    processed in batches of at most max_amplitudes amplitudes.
+
+    Returns (labels, probabilities): Aer-format outcome labels and an array of
+    shape (len(values), len(labels)).
+    """
+    values = np.asarray(values, dtype=float)
+    pairs = measurement_map(qc)
+    if pairs is None:
+        raise ValueError("Only circuits that measure at the end can be swept")
+    if qc.parameters - {parameter}:
+        raise ValueError("Every parameter other than the swept one must be bound")
+
+    n = qc.num_qubits
+    batch_size = max(1, max_amplitudes // 2 ** n)
+    gates = [
+        (instruction.operation, [qc.find_bit(q).index for q in instruction.qubits])
+        for instruction in qc.data if instruction.operation.name not in _IGNORED_OPERATIONS
+    ]
+
+    probabilities = []
+    for start in range(0, len(values), batch_size):
+        batch = values[start:start + batch_size]
+        psi = np.zeros((len(batch),) + (2,) * n, dtype=complex)
+        psi[(slice(None),) + (0,) * n] = 1.0
+        for operation, qubits in gates:
+            psi = apply_gate_batch(psi, _batch_matrices(operation, parameter, batch), qubits)
+        probabilities.append(np.abs(psi.reshape(len(batch), -1)) ** 2)
+
+    labels, totals = outcome_distribution(qc, pairs, np.concatenate(probabilities))
+    return labels, totals
+
+
+class NumpyResult:
+    """The part of Aer's Result the app uses: get_counts() and get_memory()."""
+
+    def __init__(self, counts, memory, time_taken):
+        self._counts = counts
+        self._memory = memory
+        self.time_taken = time_taken
+
+    def _single(self, values, experiment):
+        if experiment is None:
+            return values[0] if len(values) == 1 else values
+        return values[experiment]
+
+    def get_counts(self, experiment=None):
+        return self._single(self._counts, experiment)
+
+    def get_memory(self, experiment=None):
+        if self._memory is None:
+            raise ValueError("Run with memory=True to get per-shot memory")
+        return self._single(self._memory, experiment)
+
+
+class NumpyJob:
+    def __init__(self, result):
+        self._result = result
+
+    def result(self):
+        return self._result
+
+
+class NumpyStatevectorBackend:
+    """
+    Drop-in stand-in for an AerSimulator on small circuits.
+
+    run() simulates circuits of up to max_qubits qubits built from the
+    builder's gates (H, X, Y, Z, CX, SWAP, CCX, CZ and RX, RY, RZ, P with bound
+    angles) in process with NumPy and samples all shots from the exact
+    distribution in one multinomial draw.
+    Circuits it cannot handle go to the fallback simulator unchanged. Gates
+    are applied as they are, so only circuits for the fallback need transpiling.
+    """
+
+    def __init__(self, fallback, max_qubits=NUMPY_MAX_QUBITS, seed=None):
+        self.fallback = fallback
+        self.max_qubits = max_qubits
+        self.seed = seed
+        self.name = "numpy_statevector"
+
+    def transpile_target(self, qc):
+        """The backend qc has to be transpiled for: None when the engine runs it itself, else the fallback."""
+        return None if qc.num_clbits and supports(qc, self.max_qubits) else self.fallback
+
+    def run(self, circuits, shots=1024, memory=False, seed_simulator=None, **options):
+        batch = circuits if isinstance(circuits, (list, tuple)) else [circuits]
+        if not all(qc.num_clbits and supports(qc, self.max_qubits) for qc in batch):
+            if options.get("method") == "numpy":
+                options.pop("method")
+            if seed_simulator is not None:
+                options["seed_simulator"] = seed_simulator
+            return self.fallback.run(circuits, shots=shots, memory=memory, **options)
+
+        start = time.perf_counter()
+        rng = np.random.default_rng(self.seed if seed_simulator is None else seed_simulator)
+        all_counts, all_memory = [], []
+        for qc in batch:
+            labels, p = outcome_probabilities(qc)
+            if memory:
+                shot_outcomes = rng.choice(len(labels), size=shots, p=p)
+                draws = np.bincount(shot_outcomes, minlength=len(labels))
+                all_memory.append([labels[i] for i in shot_outcomes])
+            else:
+                draws = rng.multinomial(shots, p)
+            all_counts.append({label: int(n) for label, n in zip(labels, draws) if n})
+        return NumpyJob(NumpyResult(all_counts, all_memory if memory else None, time.perf_counter() - start))
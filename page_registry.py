@@ -0,0 +1,107 @@
+import importlib
+import json
+import os
+import sys
+import threading
+import time
+
+try:
+    import resource
+except ImportError:  # Unix only; on Windows the profile goes without memory figures
+    resource = None
+
+# Sidebar entry -> (module, function). Modules are imported the first time
+# their page is opened, so qiskit, qiskit_aer, matplotlib and pandas stay out
+# of the cold start and out of reruns of pages that do not need them.
+PAGES = {
+    "Game Instructions": ("game_instructions", "show_instructions"),
+    "About Game": ("game_about", "show_about"),
+    "Classical Bit vs Qubit": ("bit_vs_qubit", "display_bits_vs_qubits"),
+    "Quantum Gates and Circuits": ("quantum_gates_circuits", "display_quantum_gates_circuit"),
+    "Superposition and Entanglement": ("superpostion_entanglement", "display_superposition_entanglement"),
+    "Quantum Cryptography": ("quantum_cryptography_qkd", "display_quantum_cryptography"),
+}
+
+HEAVY_MODULES = ["qiskit", "qiskit_aer", "matplotlib", "pandas"]
+PROFILE_PATH = os.environ.get("QUANTUM_IMPORT_PROFILE", "import_profile.json")
+
+_lock = threading.Lock()
+_profile = {
+    "pid": os.getpid(),
+    "startup": None,
+    "page_imports": {},
+}
+
+
+def _max_rss_mib():
+    """Peak resident memory of this process in MiB, or None where the resource module is missing."""
+    if resource is None:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in KiB on Linux
+    return max_rss / 2**20 if sys.platform == "darwin" else max_rss / 1024
+
+
+def _snapshot():
+    snapshot = {
+        "modules_loaded": len(sys.modules),
+        "heavy_modules_loaded": [m for m in HEAVY_MODULES if m in sys.modules],
+    }
+    max_rss_mib = _max_rss_mib()
+    if max_rss_mib is not None:
+        snapshot["max_rss_mib"] = max_rss_mib
+    return snapshot
+
+
+def write_import_profile(path=PROFILE_PATH):
+    """Writes the import-time profile of this worker process as JSON."""
+    with _lock:
+        data = json.dumps(_profile, indent=2)
+    try:
+        with open(path, "w") as f:
+            f.write(data)
+    except OSError:
+        # Profiling must never take the app down (e.g. read-only deployments)
+        pass
+
+
+def record_startup():
+    """Records what the app loaded before any page was opened. Only the first call per process counts."""
+    with _lock:
+        if _profile["startup"] is not None:
+            return
+        _profile["startup"] = {"time": time.time(), **_snapshot()}
+    write_import_profile()
+
+
+def load_module(module_name):
+    """Imports a module, timing it and updating the profile if this is its first import."""
+    module = sys.modules.get(module_name)
+    if module is not None:
+        return module
+
+    modules_before = len(sys.modules)
+    start = time.perf_counter()
+    module = importlib.import_module(module_name)
+    seconds = time.perf_counter() - start
+
+    with _lock:
+        _profile["page_imports"].setdefault(module_name, {
+            "seconds": seconds,
+            "new_modules": len(sys.modules) - modules_before,
+            **_snapshot(),
+        })
+    write_import_profile()
+    return module
+
+
+def load_page(name):
+    """Returns the render function of a sidebar page, importing its module on first use."""
+    module_name, function_name = PAGES[name]
+    return getattr(load_module(module_name), function_name)
+
+
+def import_profile():
+    """Returns a copy of the profile collected so far."""
+    with _lock:
+        return json.loads(json.dumps(_profile))
@@ -0,0 +1,80 @@
+import numpy as np
+from qiskit.quantum_info import Statevector
+
+# Instructions that may appear in a circuit whose outcome distribution can be computed exactly
+_IGNORED_OPERATIONS = {"barrier"}
+_NON_UNITARY_OPERATIONS = {"reset", "initialize", "delay"}
+
+
+def measurement_map(qc):
+    """
+    Returns the list of (qubit, clbit) index pairs measured at the end of the
+    circuit, or None when the circuit cannot be handled exactly: a gate after a
+    measurement, a qubit measured twice, a non-unitary operation, or more than
+    one classical register.
+    """
+    if len(qc.cregs) > 1:
+        return None
+
+    measured = {}
+    for instruction in qc.data:
+        name = instruction.operation.name
+        qubits = [qc.find_bit(q).index for q in instruction.qubits]
+
+        if name in _IGNORED_OPERATIONS:
+            continue
+        if name in _NON_UNITARY_OPERATIONS:
+            return None
+        if name == "measure":
+            qubit = qubits[0]
+            if qubit in measured:
+                return None
+            measured[qubit] = qc.find_bit(instruction.clbits[0]).index
+        elif any(q in measured for q in qubits):
+            return None
+
+    return sorted(measured.items())
+
+
+def measured_probabilities(qc):
+    """
+    Exact outcome distribution of a circuit that measures at the end, in the
+    same bitstring format as Aer's get_counts() (clbit 0 on the right).
+    The unitary part is simulated once as a statevector. Returns None when
+    measurement_map() rejects the circuit.
+    """
+    pairs = measurement_map(qc)
+    if pairs is None:
+        return None
+
+    unitary_part = qc.remove_final_measurements(inplace=False)
+    qubits = [q for q, _ in pairs]
+    clbits = [c for _, c in pairs]
+    probabilities = Statevector(unitary_part).probabilities(qargs=qubits)
+
+    outcomes = {}
+    for index in np.flatnonzero(probabilities > 1e-12):
+        bits = ["0"] * qc.num_clbits
+        for k, clbit in enumerate(clbits):
+            if (index >> k) & 1:
+                bits[qc.num_clbits - 1 - clbit] = "1"
+        outcomes["".join(bits)] = float(probabilities[index])
+    return outcomes
+
+
+def sample_counts(probabilities, shots, seed=None):
+    """Draws shots samples from a {bitstring: probability} dict with a single multinomial call."""
+    outcomes = list(probabilities)
+    p = np.array([probabilities[o] for o in outcomes], dtype=float)
+    draws = np.random.default_rng(seed).multinomial(shots, p / p.sum())
+    return {o: int(n) for o, n in zip(outcomes, draws) if n}
+
+
+def sample_basis_counts(probabilities, shots, num_bits, seed=None):
+    """
+    Like sample_counts for an array of probabilities indexed by basis state.
+    Only the drawn outcomes (at most shots of them) get a bitstring label.
+    """
+    p = np.asarray(probabilities, dtype=float)
+    draws = np.random.default_rng(seed).multinomial(shots, p / p.sum())
+    return {format(i, f"0{num_bits}b"): int(draws[i]) for i in np.flatnonzero(draws)}
@@ -0,0 +1,227 @@
+import math
+import time
+
+import numpy as np
+
+CASCADE_PASSES = 4
+DEFAULT_FRAME_BITS = 2**18  # sifted key bits reconciled and hashed together
+SECURITY_MARGIN_BITS = 64  # extra bits removed by privacy amplification
+VERIFY_HASH_BITS = 64  # length of the hash compared after error correction
+
+
+# --- Packed bit helpers ---
+def pack_bits(bits):
+    """Packs an array of 0/1 values into a uint8 bitset. Returns (packed, num_bits)."""
+    bits = np.asarray(bits, dtype=np.uint8)
+    return np.packbits(bits), len(bits)
+
+
+def unpack_bits(packed, num_bits):
+    """Inverse of pack_bits: returns a uint8 array of num_bits 0/1 values."""
+    return np.unpackbits(packed, count=num_bits)
+
+
+def binary_entropy(p):
+    """Shannon entropy of a biased coin, in bits."""
+    if p <= 0 or p >= 1:
+        return 0.0
+    return -p * math.log2(p) - (1 - p) * math.log2(1 - p)
+
+
+# --- Information reconciliation (Cascade) ---
+def _range_parities(prefix, lo, hi):
+    """Parity of bits[lo:hi] for many ranges at once, from a prefix sum of the bits."""
+    return (prefix[hi] - prefix[lo]) & 1
+
+
+def _cascade_pass(alice, bob, perm, block_size, revisit=False):
+    """
+    Runs one Cascade round over the blocks of a permutation: every block whose
+    parity differs is binary-searched (all blocks in lockstep) and the error it
+    contains is flipped in Bob's key. On a revisit Alice's block parities are
+    already public, so only the binary search leaks information.
+    Returns (bits_flipped, bits_leaked).
+    """
+    n = len(alice)
+    a = alice[perm]
+    b = bob[perm]
+    a_prefix = np.concatenate(([0], np.cumsum(a, dtype=np.int64)))
+    b_prefix = np.concatenate(([0], np.cumsum(b, dtype=np.int64)))
+
+    lo = np.arange(0, n, block_size)
+    hi = np.minimum(lo + block_size, n)
+    leaked = 0 if revisit else len(lo)  # one parity disclosed per block
+
+    wrong = _range_parities(a_prefix, lo, hi) != _range_parities(b_prefix, lo, hi)
+    lo = lo[wrong]
+    hi = hi[wrong]
+
+    # Halve every odd-parity range until it holds a single bit
+    while len(lo) and np.any(hi - lo > 1):
+        mid = (lo + hi) // 2
+        left_wrong = _range_parities(a_prefix, lo, mid) != _range_parities(b_prefix, lo, mid)
+        searching = hi - lo > 1
+        leaked += int(np.count_nonzero(searching))
+        hi = np.where(searching & left_wrong, mid, hi)
+        lo = np.where(searching & ~left_wrong, mid, lo)
+
+    bob[perm[lo]] ^= 1
+    return len(lo), leaked
+
+
+def cascade_reconcile(alice, bob, qber, passes=CASCADE_PASSES, seed=None):
+    """
+    Corrects Bob's copy of the sifted key in place so that it matches Alice's.
+
+    alice and bob are uint8 0/1 arrays. The first block size follows the usual
+    0.73 / QBER rule and doubles every pass; each pass uses a fresh public
+    permutation. Whenever a pass flips a bit, earlier passes are revisited
+    until every block parity agrees (the "cascade").
+    Returns a dict with the number of corrected bits and parity bits leaked.
+    """
+    n = len(alice)
+    rng = np.random.default_rng(seed)
+    block_size = max(8, int(math.ceil(0.73 / qber))) if qber > 0 else n
+    block_size = min(block_size, n)
+
+    perms = []
+    corrected = leaked = 0
+    for i in range(passes):
+        perms.append((np.arange(n) if i == 0 else rng.permutation(n), block_size))
+
+        flipped, disclosed = _cascade_pass(alice, bob, *perms[-1])
+        corrected += flipped
+        leaked += disclosed
+
+        while flipped:
+            flipped = 0
+            for perm, size in perms:
+                f, disclosed = _cascade_pass(alice, bob, perm, size, revisit=True)
+                flipped += f
+                corrected += f
+                leaked += disclosed
+
+        block_size = min(2 * block_size, n)
+
+    return {"corrected_bits": corrected, "leaked_bits": leaked}
+
+
+# --- Privacy amplification (Toeplitz hashing) ---
+def toeplitz_hash(bits, out_bits, seed_bits):
+    """
+    Multiplies a 0/1 vector by the out_bits x len(bits) Toeplitz matrix defined
+    by seed_bits (length len(bits) + out_bits - 1) over GF(2).
+    The product is a convolution, so it is computed with one FFT in O(n log n).
+    Returns the hash as a packed uint8 bitset.
+    """
+    n = len(bits)
+    size = 1 << (len(seed_bits) + n - 1).bit_length()
+    product = np.fft.irfft(np.fft.rfft(seed_bits, size) * np.fft.rfft(bits, size), size)
+    window = product[n - 1:n - 1 + out_bits]
+    return np.packbits(np.rint(window).astype(np.int64) & 1)
+
+
+def secure_key_length(num_bits, qber, leaked_bits, margin=SECURITY_MARGIN_BITS):
+    """Final key length after removing Eve's information bound and what reconciliation disclosed."""
+    return max(0, int(num_bits * (1 - binary_entropy(qber))) - leaked_bits - margin)
+
+
+# --- Streaming pipeline ---
+def postprocess_frame(alice_packed, bob_packed, num_bits, qber, seed=None):
+    """
+    Reconciles and privacy-amplifies one frame of sifted key.
+    Takes Alice's and Bob's frames as packed bitsets and returns a dict with
+    both final keys (packed), their length and the reconciliation statistics.
+    """
+    rng = np.random.default_rng(seed)
+    alice = unpack_bits(alice_packed, num_bits)
+    bob = unpack_bits(bob_packed, num_bits)
+
+    stats = cascade_reconcile(alice, bob, qber, seed=rng.integers(2**63))
+
+    # Compare a short hash to confirm reconciliation succeeded
+    verify_seed = rng.integers(0, 2, num_bits + VERIFY_HASH_BITS - 1, dtype=np.uint8)
+    verified = np.array_equal(
+        toeplitz_hash(alice, VERIFY_HASH_BITS, verify_seed),
+        toeplitz_hash(bob, VERIFY_HASH_BITS, verify_seed)
+    )
+    leaked = stats["leaked_bits"] + VERIFY_HASH_BITS
+
+    final_bits = secure_key_length(num_bits, qber, leaked)
+    if not verified or final_bits == 0:
+        empty = np.zeros(0, dtype=np.uint8)
+        return {"alice_key": empty, "bob_key": empty, "final_bits": 0, "verified": verified, **stats}
+
+    pa_seed = rng.integers(0, 2, num_bits + final_bits - 1, dtype=np.uint8)
+    return {
+        "alice_key": toeplitz_hash(alice, final_bits, pa_seed),
+        "bob_key": toeplitz_hash(bob, final_bits, pa_seed),
+        "final_bits": final_bits,
+        "verified": verified,
+        **stats
+    }
+
+
+def frame_arguments(alice_packed, bob_packed, num_bits, qber, frame_bits=DEFAULT_FRAME_BITS, seed=None):
+    """
+    Splits the packed sifted keys into frames and yields the postprocess_frame
+    arguments of each, so frames can also be handed to other processes.
+    frame_bits must be a multiple of 8 so frames can be sliced from the bitsets.
+    """
+    if frame_bits % 8:
+        raise ValueError("frame_bits must be a multiple of 8")
+
+    rng = np.random.default_rng(seed)
+    for start in range(0, num_bits, frame_bits):
+        n = min(frame_bits, num_bits - start)
+        byte_slice = slice(start // 8, (start + n + 7) // 8)
+        yield alice_packed[byte_slice], bob_packed[byte_slice], n, qber, rng.integers(2**63)
+
+
+def postprocess_stream(alice_packed, bob_packed, num_bits, qber, frame_bits=DEFAULT_FRAME_BITS, seed=None):
+    """Yields the post-processed result of each frame as soon as it is done."""
+    for args in frame_arguments(alice_packed, bob_packed, num_bits, qber, frame_bits, seed):
+        yield postprocess_frame(*args)
+
+
+def merge_frames(frames):
+    """Joins per-frame results into Alice's final key (packed) plus the summed statistics."""
+    frames = list(frames)
+    # Frame keys are rarely whole bytes: join them bit by bit so no padding ends up inside the key
+    bits = [unpack_bits(f["alice_key"], f["final_bits"]) for f in frames]
+    return {
+        "key": np.packbits(np.concatenate([np.zeros(0, dtype=np.uint8)] + bits)),
+        "final_bits": sum(f["final_bits"] for f in frames),
+        "corrected_bits": sum(f["corrected_bits"] for f in frames),
+        "leaked_bits": sum(f["leaked_bits"] for f in frames),
+    }
+
+
+def benchmark_postprocessing(num_bits=2**20, qber=0.03, frame_bits=DEFAULT_FRAME_BITS, seed=None):
+    """
+    Runs the pipeline on a random sifted key with errors at the given QBER and
+    reports throughput in final key bits per second.
+    """
+    rng = np.random.default_rng(seed)
+    alice = rng.integers(0, 2, num_bits, dtype=np.uint8)
+    bob = alice ^ (rng.random(num_bits) < qber).astype(np.uint8)
+    alice_packed, _ = pack_bits(alice)
+    bob_packed, _ = pack_bits(bob)
+
+    start = time.perf_counter()
+    final_bits = corrected = mismatched_frames = 0
+    for frame in postprocess_stream(alice_packed, bob_packed, num_bits, qber, frame_bits, seed=rng.integers(2**63)):
+        final_bits += frame["final_bits"]
+        corrected += frame["corrected_bits"]
+        mismatched_frames += int(not np.array_equal(frame["alice_key"], frame["bob_key"]))
+    seconds = time.perf_counter() - start
+
+    return {
+        "sifted_bits": num_bits,
+        "qber": qber,
+        "final_bits": final_bits,
+        "corrected_bits": corrected,
+        "mismatched_frames": mismatched_frames,
+        "seconds": seconds,
+        "final_bits_per_second": final_bits / seconds if seconds else float("inf")
+    }
@@ -1,8 +1,15 @@
 import streamlit as st
-from qiskit import QuantumCircuit, transpile
-from qiskit_aer import Aer
-import random
-import matplotlib.pyplot as plt
+import numpy as np
+import time
+from charts import show_histogram
+import pandas as pd
+from bb84_simulation import (
+    MAX_BB84_BITS, MAX_CIRCUIT_BITS, QBER_ABORT_THRESHOLD, bb84_protocol, benchmark_bb84, distillation_frames,
+    estimate_qber, expected_qber, sweep_eve_rates
+)
+from qkd_postprocessing import merge_frames, postprocess_frame, benchmark_postprocessing
+from job_queue import submit_job, track_job
+
 
 def display_quantum_cryptography():
     st.title("Quantum Cryptography: The Promise and the Reality")
@@ -13,60 +20,6 @@ def display_quantum_cryptography():
     This page introduces the **BB84 protocol**, explains its **security advantages**, and shows how quantum mechanics can be used to create **unbreakable encryption keys**.
     """)
 
-    # --- BB84 Simulation Functions ---
-    def bb84_protocol(num_bits=50):
-        # Alice generates random bits and bases
-        alice_bits = [random.randint(0, 1) for _ in range(num_bits)]
-        alice_bases = [random.randint(0, 1) for _ in range(num_bits)]  # 0 = Z-basis, 1 = X-basis
-
-        # Alice encodes her bits into qubits
-        qubits = []
-        for bit, basis in zip(alice_bits, alice_bases):
-            qc = QuantumCircuit(1, 1)
-            if bit == 1:
-                qc.x(0)
-            if basis == 1:  # X-basis: apply Hadamard
-                qc.h(0)
-            qubits.append(qc)
-
-        # Bob measures using his randomly chosen bases
-        bob_bases = [random.randint(0, 1) for _ in range(num_bits)]
-        bob_bits = []
-
-        backend = Aer.get_backend('qasm_simulator')
-
-        for i in range(num_bits):
-            qc = qubits[i].copy()
-            if bob_bases[i] == 1:
-                qc.h(0)
-            qc.measure(0, 0)
-
-            # Use transpile and run instead of execute
-            compiled_qc = transpile(qc, backend)
-            job = backend.run(compiled_qc, shots=1)
-            result = job.result()
-            counts = result.get_counts()
-
-            measured_bit = int(list(counts.keys())[0], 2)
-            bob_bits.append(measured_bit)
-
-        # Compare bases and extract matching key
-        key = []
-        matching_bases = []
-        for i in range(num_bits):
-            if alice_bases[i] == bob_bases[i]:
-                key.append(alice_bits[i])
-                matching_bases.append(i)
-
-        return {
-            "alice_bits": alice_bits,
-            "alice_bases": alice_bases,
-            "bob_bits": bob_bits,
-            "bob_bases": bob_bases,
-            "key": key,
-            "matching_bases": matching_bases
-        }
-
     # --- BB84 Protocol Section ---
     st.subheader("BB84 Protocol – Quantum Key Distribution")
 
@@ -88,32 +41,151 @@ def display_quantum_cryptography():
     """)
 
     # --- Side-by-Side: Sample Matching + Graph ---
-    if st.button("Simulate BB84 Protocol"):
-        result = bb84_protocol(num_bits=50)
-        key_length = len(result['key'])
-        mismatched = 50 - key_length
+    num_bits = st.number_input(
+        "Number of qubits Alice sends",
+        min_value=10,
+        max_value=MAX_BB84_BITS,
+        value=50,
+        step=50
+    )
+    engine = st.radio(
+        "Simulation engine",
+        ["NumPy (closed form)", "Simulator (single batched job)"],
+        horizontal=True
+    )
+    eve_rate = st.slider("Eve's interception rate", min_value=0.0, max_value=1.0, value=0.0, step=0.05)
+    noise = st.slider("Channel noise (bit-flip probability)", min_value=0.0, max_value=0.2, value=0.0, step=0.01)
 
-        st.success(f"Matched {key_length} bits out of 50 using same measurement basis.")
+    if st.button("Simulate BB84 Protocol"):
+        if engine == "Simulator (single batched job)" and num_bits > MAX_CIRCUIT_BITS:
+            st.error(f"The simulator engine supports at most {MAX_CIRCUIT_BITS} qubits. Use the NumPy engine for larger keys.")
+            st.stop()
+
+        method = "numpy" if engine == "NumPy (closed form)" else "circuit"
+        start = time.perf_counter()
+        result = bb84_protocol(num_bits=num_bits, method=method, eve_rate=eve_rate, noise=noise)
+        elapsed = time.perf_counter() - start
+        qber = estimate_qber(result)
+
+        # Keep only what the page shows, so it survives the reruns while post-processing runs
+        st.session_state.bb84_run = {
+            "num_bits": num_bits,
+            "key_length": len(result['key']),
+            "elapsed": elapsed,
+            "qber": {k: v for k, v in qber.items() if k != "kept_indices"},
+            "expected_qber": expected_qber(eve_rate, noise),
+            "sample": [(i, result['alice_bits'][i], result['bob_bits'][i]) for i in result['matching_bases'][:5]],
+            "distilled": None,
+        }
+        if qber['qber'] <= QBER_ABORT_THRESHOLD:
+            # Error correction + privacy amplification run frame by frame in the background
+            frames, kept_bits = distillation_frames(result, qber)
+            st.session_state.bb84_run["kept_bits"] = kept_bits
+            if frames:
+                submit_job("bb84_job", postprocess_frame, frames, combine=merge_frames,
+                           label=f"Post-processing {kept_bits} sifted bits")
+            else:
+                st.session_state.bb84_run["distilled"] = merge_frames([])
+
+    run = st.session_state.get("bb84_run")
+    if run is not None:
+        key_length = run['key_length']
+        mismatched = run['num_bits'] - key_length
+        qber = run['qber']
+
+        st.success(f"Matched {key_length} bits out of {run['num_bits']} using same measurement basis ({run['elapsed'] * 1000:.1f} ms).")
+
+        st.markdown(
+            f"Alice and Bob sacrificed ``{qber['sampled_bits']}`` sifted bits and found ``{qber['errors']}`` mismatches: "
+            f"estimated QBER ``{qber['qber']:.2%}`` (expected ``{run['expected_qber']:.2%}``)."
+        )
+        if qber['qber'] > QBER_ABORT_THRESHOLD:
+            st.error(f"QBER is above {QBER_ABORT_THRESHOLD:.0%}: eavesdropping detected, the key is discarded.")
+        else:
+            st.info(f"QBER is below {QBER_ABORT_THRESHOLD:.0%}: the remaining key can be used.")
+
+            finished = track_job("bb84_job")
+            if finished is not None:
+                if finished['status'] == "done":
+                    run['distilled'] = finished['result']
+                else:
+                    st.warning(f"Post-processing {finished['status']}. {finished['error'] or ''}")
+
+            distilled = run['distilled']
+            if distilled is not None:
+                st.markdown(
+                    f"Post-processing: Cascade corrected ``{distilled['corrected_bits']}`` errors "
+                    f"(``{distilled['leaked_bits']}`` parity bits disclosed), Toeplitz hashing distilled "
+                    f"``{distilled['final_bits']}`` secret bits from ``{run['kept_bits']}`` sifted bits."
+                )
+                if distilled['final_bits']:
+                    st.code(distilled['key'][:32].tobytes().hex(), language=None)
+                else:
+                    st.warning("The key is too short to leave any secret bits after privacy amplification.")
 
         col1, col2 = st.columns([1, 1])
 
         with col1:
             st.markdown("#### Sample Matching Bases & Key Bits")
-            sample = [(i, result['alice_bits'][i], result['bob_bits'][i]) for i in result['matching_bases'][:5]]
-            for idx, abit, bbit in sample:
+            for idx, abit, bbit in run['sample']:
                 st.write(f"Index {idx}: Alice={abit}, Bob={bbit}")
 
         with col2:
             # Plot histogram with reduced size
-            fig, ax = plt.subplots(figsize=(5, 2.5))  # Compact figure size
-            ax.bar(['Matching Basis', 'Mismatched Basis'], [key_length, mismatched], color=['#4E79A7', '#E15759'])
-            ax.set_ylabel("Number of Bits")
-            ax.set_title("Basis Matching in BB84 Protocol", fontsize=10)
+            show_histogram({'Matching Basis': key_length, 'Mismatched Basis': mismatched},
+                           "Basis Matching in BB84 Protocol", xlabel="", ylabel="Number of Bits",
+                           colors=['#4E79A7', '#E15759'], figsize=(5, 2.5), fontsize=8, title_fontsize=10)
 
-            for p in ax.patches:
-                ax.annotate(str(p.get_height()), (p.get_x() + 0.1, p.get_height() + 1), fontsize=8)
+    # --- Eavesdropper Sweep Section ---
+    st.subheader("Detecting Eve: QBER vs Interception Rate")
 
-            st.pyplot(fig)
+    st.markdown("""
+    An **intercept-resend** attacker measures qubits in a random basis and sends on what she saw.
+    Whenever she guesses the wrong basis, Bob's sifted bit is wrong half the time, so every intercepted
+    qubit adds a **25% error rate** to the sifted key. Alice and Bob spot her by sacrificing part of the key
+    to estimate the **quantum bit error rate (QBER)**.
+
+    The sweep below runs the full protocol for every interception rate and plots each point as soon as it is ready.
+    """)
+
+    sweep_bits = st.select_slider(
+        "Qubits per interception rate",
+        options=[10**4, 10**5, MAX_BB84_BITS],
+        value=10**6
+    )
+    sweep_points = st.slider("Number of interception rates", min_value=3, max_value=21, value=11)
+
+    if st.button("Run Eavesdropper Sweep"):
+        eve_rates = np.linspace(0.0, 1.0, sweep_points)
+        progress = st.progress(0.0)
+        chart = st.empty()
+        rows = []
+
+        for row in sweep_eve_rates(sweep_bits, eve_rates, noise=noise):
+            rows.append(row)
+            progress.progress(len(rows) / sweep_points)
+            df_sweep = pd.DataFrame(rows).set_index("eve_rate")
+            chart.line_chart(df_sweep[["qber", "expected_qber"]])
+
+        st.table(pd.DataFrame(rows))
+
+    with st.expander("Benchmark: post-processing throughput"):
+        st.markdown("""
+        Runs Cascade error correction and Toeplitz privacy amplification on a random sifted key
+        with errors at the chosen QBER, and reports how many final key bits are produced per second.
+        """)
+        bench_qber = st.slider("QBER for benchmark", min_value=0.01, max_value=0.10, value=0.03, step=0.01)
+        if st.button("Run Post-Processing Benchmark"):
+            st.table([benchmark_postprocessing(qber=bench_qber)])
+
+    with st.expander("Benchmark: per-qubit loop vs batched engines"):
+        st.markdown("""
+        The original simulation ran one simulator job per qubit. The batched engines run a single job
+        (or no job at all for the closed-form NumPy engine). Times are in seconds; `None` means the engine
+        was skipped for that size.
+        """)
+        if st.button("Run Benchmark"):
+            st.table(benchmark_bb84())
 
     # --- Security Section ---
     st.subheader("Why Is It Secure? Quantum Properties at Work")
@@ -131,8 +203,6 @@ def display_quantum_cryptography():
     # --- Comparison Table ---
     st.subheader("Classical vs. Quantum Cryptography")
 
-    import pandas as pd
-
     comparison_data = {
         "Feature": [
             "Security Basis",
@@ -1,7 +1,87 @@
 import streamlit as st
-from qiskit import QuantumCircuit, transpile
-from qiskit_aer import Aer
+from qiskit import QuantumCircuit
+from simulator_backends import estimate_memory_bytes, MAX_SIMULATION_BYTES
+import numpy_statevector
+from transpile_cache import circuit_key, transpile_cache_stats
+from circuit_builder import (
+    MAX_QUBITS, ROTATION_GATES, THETA, bind_theta, choose_builder_method, first_theta_gate, measure_circuit,
+    measured_copy, sample_chunk, sweep_theta
+)
+from live_statevector import LiveStatevector
+from circuit_optimizer import sync_optimizer
+from qiskit.quantum_info import Statevector
+from qiskit.visualization import plot_bloch_multivector
 import matplotlib.pyplot as plt
+from charts import show_histogram
+from job_queue import MAX_WORKERS, merge_counts, split_shots, submit_job, track_job
+from noise_simulation import display_noise_section
+import pandas as pd
+import numpy as np
+import time
+
+LIVE_STATE_MAX_QUBITS = 16  # 2^16 amplitudes = 1 MiB per session; wider circuits are only sampled
+BLOCH_MAX_QUBITS = 10
+HISTOGRAM_MAX_BARS = 32
+AMPLITUDE_TABLE_MAX_ROWS = 64
+BACKGROUND_MIN_SHOTS = 10000  # sampling runs this large go to the job queue
+SWEEP_POINTS = [100, 500, 1000, 2000, 5000]
+SWEEP_MAX_LINES = 8  # outcomes plotted against θ
+
+MEASURE_MODES = {
+    "Shot sampling (NumPy engine or Aer)": "sampling",
+    "Exact probabilities + multinomial sampling": "exact",
+}
+
+GATE_OPTIONS = {
+    "Hadamard (H)": "h",
+    "Pauli-X (X)": "x",
+    "Pauli-Y (Y)": "y",
+    "Pauli-Z (Z)": "z",
+    "CNOT (CX)": "cx",
+    "SWAP": "swap",
+    "Toffoli (CCNOT)": "ccx",
+    "Controlled Phase Shift (CZ)": "cz",
+    "Rotation X (RX)": "rx",
+    "Rotation Y (RY)": "ry",
+    "Rotation Z (RZ)": "rz",
+    "Phase (P)": "p",
+}
+
+
+def _instruction_qubits(qc, instruction):
+    return [qc.find_bit(q).index for q in instruction.qubits]
+
+
+def sync_live_state(qc, live_state=None):
+    """
+    Returns a LiveStatevector matching qc. The given one is reused when it
+    tracks a prefix of qc's gates (e.g. after a rewind), applying just the
+    rest; otherwise the state is rebuilt by replaying the circuit (e.g. for a
+    session created before it existed). Returns None for circuits wider than
+    LIVE_STATE_MAX_QUBITS.
+    """
+    if qc.num_qubits > LIVE_STATE_MAX_QUBITS:
+        return None
+    if live_state is not None and live_state.num_qubits == qc.num_qubits and live_state.depth <= len(qc.data):
+        for instruction in list(qc.data)[live_state.depth:]:
+            live_state.apply(instruction.operation, _instruction_qubits(qc, instruction))
+        return live_state
+
+    live_state = LiveStatevector(qc.num_qubits)
+    for instruction in qc.data:
+        live_state.apply(instruction.operation, _instruction_qubits(qc, instruction))
+    return live_state
+
+
+def undo_last_gate(qc, live_state):
+    """Removes the last gate from qc and reverts it in live_state (if any). Returns the new circuit."""
+    if live_state is not None:
+        live_state.undo()
+    qc_undone = qc.copy_empty_like()
+    for instruction in list(qc.data)[:-1]:
+        qc_undone.append(instruction.operation, instruction.qubits, instruction.clbits)
+    return qc_undone
+
 
 def display_quantum_gates_circuit():
     # Set page config
@@ -12,7 +92,8 @@ def display_quantum_gates_circuit():
     Welcome to this simple quantum circuit builder.  
     You can add various quantum gates to build your own circuit and visualize it below.
 
-    **Available Gates**: Hadamard (H), Pauli-X (X), Pauli-Y (Y), Pauli-Z (Z), CNOT (CX), SWAP, Toffoli (CCNOT), Controlled Phase Shift (CZ).
+    **Available Gates**: Hadamard (H), Pauli-X (X), Pauli-Y (Y), Pauli-Z (Z), CNOT (CX), SWAP, Toffoli (CCNOT), Controlled Phase Shift (CZ),
+    and the rotations RX, RY, RZ and Phase (P) with a fixed angle or the symbolic parameter θ.
     """)
 
     # Constants
@@ -43,7 +124,7 @@ def display_quantum_gates_circuit():
     num_qubits = st.slider(
         "Select number of qubits",
         min_value=1,
-        max_value=10,
+        max_value=MAX_QUBITS,
         value=st.session_state.qubit_slider,
         key="qubit_slider_interact"
     )
@@ -54,28 +135,36 @@ def display_quantum_gates_circuit():
     # Reset circuit if qubit count changes
     if 'last_qubits' not in st.session_state or st.session_state.last_qubits != num_qubits:
         st.session_state.qc = QuantumCircuit(num_qubits, num_qubits)
+        st.session_state.live_state = None
+        st.session_state.optimizer = None
         st.session_state.last_qubits = num_qubits
 
     qc = st.session_state.qc
 
+    # Circuits using θ are simulated with the value picked here; the sweep below covers all values
+    theta = None
+    if THETA in qc.parameters:
+        theta = st.slider("Value of θ (radians)", min_value=0.0, max_value=float(2 * np.pi),
+                          value=float(np.pi / 2), step=0.01, key="theta_value")
+    if st.session_state.get('live_theta') != theta:
+        # Gates before the first use of θ do not depend on it: only the rest is undone and replayed
+        if st.session_state.get('live_state') is not None:
+            st.session_state.live_state.rewind(first_theta_gate(qc))
+        st.session_state.live_theta = theta
+    bound_qc = bind_theta(qc, theta)
+
+    st.session_state.live_state = sync_live_state(bound_qc, st.session_state.get('live_state'))
+    live_state = st.session_state.live_state
+    st.session_state.optimizer = sync_optimizer(qc, st.session_state.get('optimizer'))
+    optimizer = st.session_state.optimizer
+
     # --- Gate Selection UI ---
     st.subheader("Choose a gate")
 
-    gate_options = {
-        "Hadamard (H)": "h",
-        "Pauli-X (X)": "x",
-        "Pauli-Y (Y)": "y",
-        "Pauli-Z (Z)": "z",
-        "CNOT (CX)": "cx",
-        "SWAP": "swap",
-        "Toffoli (CCNOT)": "ccx",
-        "Controlled Phase Shift (CZ)": "cz"
-    }
-
     selected_gate_name = st.selectbox(
         "Select a gate",
-        list(gate_options.keys()),
-        index=list(gate_options.keys()).index(st.session_state.selected_gate_name),
+        list(GATE_OPTIONS.keys()),
+        index=list(GATE_OPTIONS.keys()).index(st.session_state.selected_gate_name),
         key="gate_selector"
     )
 
@@ -109,10 +198,18 @@ def display_quantum_gates_circuit():
             key="single_gate"
         )
 
+    angle = None
+    if GATE_OPTIONS[selected_gate_name] in ROTATION_GATES:
+        angle_kind = st.radio("Angle", ["Fixed angle", "Parameter θ"], horizontal=True, key="angle_kind")
+        if angle_kind == "Fixed angle":
+            angle = st.number_input("Angle (multiples of π)", value=0.5, step=0.125, key="angle_value") * np.pi
+        else:
+            angle = THETA
+
     # Apply gate on button click
     st.subheader("Add Gate to Circuit")
     if st.button("Add Gate to Circuit"):
-        gate_key = gate_options[selected_gate_name]
+        gate_key = GATE_OPTIONS[selected_gate_name]
         if gate_key == "h":
             qc.h(single_qubit)
         elif gate_key == "x":
@@ -130,51 +227,194 @@ def display_quantum_gates_circuit():
             qc.ccx(control_qubit, target_qubit, third_qubit)
         elif gate_key == "cz":
             qc.cz(control_qubit, target_qubit)
+        elif gate_key in ROTATION_GATES:
+            getattr(qc, gate_key)(angle, single_qubit)
+        optimizer.append_instruction(qc, qc.data[-1])
+
+        # Evolve the live statevector by just the new gate
+        if angle is THETA and theta is None:
+            # First use of θ: the slider appears on the rerun and the state is rebuilt with its value
+            st.rerun()
+        bound_qc = bind_theta(qc, theta)
+        if live_state is not None:
+            last = bound_qc.data[-1]
+            live_state.apply(last.operation, _instruction_qubits(bound_qc, last))
 
         st.success(f"{selected_gate_name} applied to the circuit.")
 
+    if st.button("Undo Last Gate", disabled=len(qc.data) == 0):
+        st.session_state.qc = undo_last_gate(qc, live_state)
+        st.rerun()
+
     # --- Display Current Circuit ---
     st.subheader("Your Quantum Circuit")
     st.text(qc.draw(output='text'))
 
+    # Redundant gates are optimized away as they are added; the optimized circuit is the one simulated
+    optimized_qc = optimizer.to_circuit()
+    sim_qc = bind_theta(optimized_qc, theta)
+    st.table(pd.DataFrame({
+        "Gates": [qc.size(), optimized_qc.size()],
+        "Depth": [qc.depth(), optimized_qc.depth()],
+    }, index=["Original", "Optimized"]))
+    if optimized_qc.size() < qc.size():
+        with st.expander("Optimized circuit"):
+            st.markdown("""
+            Inverse pairs (H·H, X·X, SWAP·SWAP, CX·CX on the same qubits) cancel, rotations about the same
+            axis merge, and gates are moved past the gates they commute with to find such partners.
+            Results may differ from the original by a global phase only, which no measurement can detect.
+            """)
+            st.text(optimized_qc.draw(output='text'))
+
+    if live_state is not None:
+        with st.expander("Statevector & Bloch Spheres"):
+            st.markdown("""
+            The statevector is kept up to date as you add gates, so showing it never re-simulates the circuit.
+            Amplitudes are listed for basis states with non-zero probability (qubit 0 is the rightmost bit).
+            """)
+            amplitudes = live_state.amplitudes()
+            nonzero = np.flatnonzero(np.abs(amplitudes) > 1e-9)
+            if len(nonzero) > AMPLITUDE_TABLE_MAX_ROWS:
+                st.caption(f"Showing the first {AMPLITUDE_TABLE_MAX_ROWS} of {len(nonzero)} non-zero amplitudes.")
+                nonzero = nonzero[:AMPLITUDE_TABLE_MAX_ROWS]
+            st.table(pd.DataFrame({
+                "State": [f"|{format(i, f'0{num_qubits}b')}⟩" for i in nonzero],
+                "Amplitude": [f"{amplitudes[i].real:+.4f}{amplitudes[i].imag:+.4f}j" for i in nonzero],
+                "Probability": [abs(amplitudes[i]) ** 2 for i in nonzero],
+            }))
+            if num_qubits <= BLOCH_MAX_QUBITS and st.checkbox("Show Bloch spheres"):
+                fig = plot_bloch_multivector(Statevector(amplitudes))
+                st.pyplot(fig)
+                plt.close(fig)
+    else:
+        st.caption(f"Statevector view is available up to {LIVE_STATE_MAX_QUBITS} qubits.")
+
     # --- Measure Circuit Button ---
     st.subheader("Measure Circuit")
+    measure_modes = list(MEASURE_MODES.keys()) if live_state is not None else list(MEASURE_MODES.keys())[:1]
+    measure_mode = MEASURE_MODES[st.radio("Simulation mode", measure_modes, horizontal=True)]
+    shots = st.select_slider("Shots", options=[100, 1000, 10000, 100000, 1000000], value=1000)
+
+    method = choose_builder_method(sim_qc, measure_mode)
+    memory = estimate_memory_bytes(sim_qc, method)
+    st.caption(f"Simulation method: **{method}** · estimated memory: {memory / 2**20:,.2f} MiB")
+
     if st.button("Measure Circuit"):
-        # Make a copy of the circuit and measure all qubits
-        qc_meas = qc.copy()
-        for i in range(num_qubits):
-            qc_meas.measure(i, i)
-
-        # Run on simulator
-        backend = Aer.get_backend('qasm_simulator')
-        compiled_qc = transpile(qc_meas, backend)
-        job = backend.run(compiled_qc, shots=1000)
-        result = job.result()
-        counts = result.get_counts()
+        if memory > MAX_SIMULATION_BYTES:
+            st.error(f"This circuit needs about {memory / 2**30:.1f} GiB with the {method} method. Reduce the number of qubits or entangling gates.")
+            st.stop()
+
+        background = method != "numpy" and (shots >= BACKGROUND_MIN_SHOTS or num_qubits > LIVE_STATE_MAX_QUBITS)
+        if measure_mode == "sampling" and background:
+            # Large runs are split into shot chunks on the job queue so the page stays responsive
+            st.session_state.measure_pending = {"key": circuit_key(sim_qc), "shots": shots, "method": method}
+            if not submit_job("measure_job", sample_chunk,
+                              [(sim_qc.copy(), n, method) for n in split_shots(shots, 4 * MAX_WORKERS)],
+                              combine=merge_counts, label=f"Sampling {shots} shots"):
+                st.session_state.pop("measure_pending", None)
+        else:
+            # The live statevector already holds the exact probabilities
+            probabilities = live_state.probabilities() if measure_mode == "exact" else None
+
+            start = time.perf_counter()
+            counts, probabilities = measure_circuit(sim_qc, shots=shots, mode=measure_mode, probabilities=probabilities, method=method)
+            st.session_state.measure_result = {
+                "key": circuit_key(sim_qc), "counts": counts, "probabilities": probabilities,
+                "shots": shots, "method": method, "seconds": time.perf_counter() - start,
+            }
+
+    finished = track_job("measure_job")
+    if finished is not None:
+        if finished['status'] == "done":
+            st.session_state.measure_result = {
+                **st.session_state.measure_pending, "counts": finished['result'],
+                "probabilities": None, "seconds": finished['seconds'],
+            }
+        else:
+            st.warning(f"Measurement {finished['status']}. {finished['error'] or ''}")
+
+    # Results stay on the page until the circuit changes
+    result = st.session_state.get("measure_result")
+    if result is not None and result['key'] == circuit_key(sim_qc):
+        counts, probabilities, shots = result['counts'], result['probabilities'], result['shots']
 
         # Plot histogram
         st.subheader("Measurement Results")
-        fig, ax = plt.subplots()
-        bars = ax.bar(counts.keys(), counts.values(), color=['#4E79A7', '#F28E2B', '#E15759', '#76B7B2', '#59A869'])
-
-        ax.set_xlabel("State")
-        ax.set_ylabel("Count")
-        ax.set_title("Measurement Outcomes")
-
-        # Add value labels on top of bars
-        for bar in bars:
-            height = bar.get_height()
-            ax.text(bar.get_x() + bar.get_width()/2., height,
-                    f'{int(height)}',
-                    ha='center', va='bottom', fontsize=10)
-
-        st.pyplot(fig)
+        shown_counts = counts
+        if len(counts) > HISTOGRAM_MAX_BARS:
+            st.caption(f"Showing the {HISTOGRAM_MAX_BARS} most frequent of {len(counts)} observed states.")
+            shown_counts = dict(sorted(counts.items(), key=lambda item: item[1], reverse=True)[:HISTOGRAM_MAX_BARS])
+        show_histogram(shown_counts, "Measurement Outcomes")
+        st.caption(f"{shots} shots measured in {result['seconds'] * 1000:.1f} ms with the {result['method']} method")
+
+        if probabilities is not None:
+            st.markdown("#### Exact Probabilities vs Sampled Frequencies")
+            # Probabilities stay an array over all 2^n basis states; only the shown rows get labels
+            observed = np.array([int(s, 2) for s in counts], dtype=np.int64)
+            candidates = np.union1d(np.flatnonzero(probabilities > 1e-12), observed)
+            top = candidates[np.argsort(probabilities[candidates], kind="stable")[::-1][:AMPLITUDE_TABLE_MAX_ROWS]]
+            states = [format(i, f"0{num_qubits}b") for i in np.sort(top)]
+            df = pd.DataFrame({
+                "State": states,
+                "Exact Probability": probabilities[np.sort(top)],
+                "Sampled Count": [counts.get(s, 0) for s in states],
+                "Sampled Frequency": [counts.get(s, 0) / shots for s in states],
+            })
+            st.table(df)
+
+        stats = transpile_cache_stats()
+        st.caption(f"Transpile cache: {stats['hits']} hits, {stats['misses']} misses ({stats['entries']} circuits cached)")
+
+    # --- Noisy Simulation ---
+    st.subheader("Noisy Simulation")
+    with st.expander("Simulate with gate and readout errors"):
+        st.markdown("""
+        Real qubits are imperfect: gates randomly depolarize or let |1⟩ decay to |0⟩, and measurements
+        sometimes read the wrong bit. Compare the ideal distribution of your circuit with a noisy one.
+        """)
+        display_noise_section(measured_copy(sim_qc), "builder")
+
+    # --- Parameter Sweep ---
+    if THETA in optimized_qc.parameters:
+        st.subheader("Parameter Sweep")
+        if num_qubits > numpy_statevector.NUMPY_MAX_QUBITS:
+            st.caption(f"Sweeping θ is available up to {numpy_statevector.NUMPY_MAX_QUBITS} qubits.")
+        else:
+            st.markdown("""
+            Exact outcome probabilities for every value of θ between 0 and 2π. All angles are simulated
+            together as one batch of statevectors instead of one circuit run per angle.
+            """)
+            points = st.select_slider("Values of θ", options=SWEEP_POINTS, value=1000, key="sweep_points")
+            sweep_key = (circuit_key(optimized_qc), points)
+            if st.button("Sweep θ"):
+                start = time.perf_counter()
+                angles, labels, probabilities = sweep_theta(optimized_qc, points)
+                seconds = time.perf_counter() - start
+
+                # Keep only the outcomes that get most likely somewhere along the sweep
+                top = np.argsort(probabilities.max(axis=0))[::-1][:SWEEP_MAX_LINES]
+                caption = f"{points} angles simulated in {seconds * 1000:.1f} ms"
+                if len(labels) > SWEEP_MAX_LINES:
+                    caption += f"; showing the {SWEEP_MAX_LINES} most likely of {len(labels)} outcomes"
+                st.session_state.sweep_result = {
+                    "key": sweep_key, "caption": caption,
+                    "df": pd.DataFrame(probabilities[:, top], columns=[labels[i] for i in top],
+                                       index=pd.Index(angles, name="θ")),
+                }
+
+            # Shown again on later reruns until the circuit or the number of angles changes
+            sweep = st.session_state.get("sweep_result")
+            if sweep is not None and sweep["key"] == sweep_key:
+                st.line_chart(sweep["df"], x_label="θ (radians)", y_label="Probability")
+                st.caption(sweep["caption"])
 
     # --- Reset Circuit Button ---
     st.subheader("Reset Circuit")
     if st.button("Reset Circuit"):
         # Reset circuit
         st.session_state.qc = QuantumCircuit(default_qubits, default_qubits)
+        st.session_state.live_state = None
+        st.session_state.optimizer = None
 
         # Reset UI inputs
         st.session_state.selected_gate_name = "Hadamard (H)"
@@ -202,7 +442,11 @@ def display_quantum_gates_circuit():
         "CNOT (CX)": "Applies X gate to target if control is |1⟩.",
         "SWAP": "Swaps the states of two qubits.",
         "Toffoli (CCNOT)": "Applies X to target if both controls are |1⟩.",
-        "Controlled Phase Shift (CZ)": "Adds a phase shift if both qubits are |1⟩."
+        "Controlled Phase Shift (CZ)": "Adds a phase shift if both qubits are |1⟩.",
+        "Rotation X (RX)": "Rotates the qubit around the X-axis by the chosen angle.",
+        "Rotation Y (RY)": "Rotates the qubit around the Y-axis by the chosen angle.",
+        "Rotation Z (RZ)": "Rotates the qubit around the Z-axis by the chosen angle.",
+        "Phase (P)": "Adds the chosen phase to the |1⟩ state.",
     }
 
     for name, desc in gate_descriptions.items():
@@ -0,0 +1,121 @@
+import threading
+import time
+from collections import OrderedDict
+
+from probability_sampler import measured_probabilities, sample_counts
+from simulator_backends import get_backend
+from transpile_cache import cached_transpile, circuit_key
+
+DEFAULT_MAX_ENTRIES = 128
+DEFAULT_TTL_SECONDS = 600
+
+
+class ResultCache:
+    """
+    Opt-in cache for circuits that are run again and again with the same inputs.
+
+    Seeded runs are cached as counts under (circuit hash, shots, seed) and
+    replayed exactly. Unseeded runs cache the circuit's exact outcome
+    probabilities instead, and every repeat draws a fresh multinomial sample
+    from them, so results still vary like real measurements. Entries expire
+    after ttl_seconds and the least recently used ones are evicted beyond
+    max_entries.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, ttl_seconds=DEFAULT_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            stored_at, value = entry
+            if time.monotonic() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def _put(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def run(self, qc, shots=1000, seed=None, use_case="demos"):
+        """Returns measurement counts for qc, skipping the simulator whenever the cache allows."""
+        ckey = circuit_key(qc)
+
+        if seed is None:
+            probabilities = self._get(("probabilities", ckey))
+            if probabilities is None:
+                probabilities = measured_probabilities(qc)
+                if probabilities is None:
+                    # Mid-circuit measurements etc.: no exact distribution to cache
+                    return _simulate(qc, shots, None, use_case)
+                self._put(("probabilities", ckey), probabilities)
+            return sample_counts(probabilities, shots)
+
+        counts = self._get(("counts", ckey, shots, seed))
+        if counts is None:
+            counts = _simulate(qc, shots, seed, use_case)
+            self._put(("counts", ckey, shots, seed), counts)
+        return dict(counts)
+
+    def configure(self, max_entries=None, ttl_seconds=None):
+        with self._lock:
+            if max_entries is not None:
+                self.max_entries = max_entries
+            if ttl_seconds is not None:
+                self.ttl_seconds = ttl_seconds
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+
+def _simulate(qc, shots, seed, use_case):
+    backend = get_backend(use_case)
+    compiled_qc = cached_transpile(qc, backend)
+    options = {} if seed is None else {"seed_simulator": seed}
+    return backend.run(compiled_qc, shots=shots, **options).result().get_counts()
+
+
+_cache = ResultCache()
+
+
+def cached_run(qc, shots=1000, seed=None, use_case="demos"):
+    """Runs qc through the process-wide result cache."""
+    return _cache.run(qc, shots=shots, seed=seed, use_case=use_case)
+
+
+def configure_result_cache(max_entries=None, ttl_seconds=None):
+    """Changes the size and TTL limits of the process-wide result cache."""
+    _cache.configure(max_entries=max_entries, ttl_seconds=ttl_seconds)
+
+
+def result_cache_stats():
+    return _cache.stats()
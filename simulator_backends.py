@@ -0,0 +1,129 @@
+import threading
+
+from qiskit_aer import AerSimulator
+
+from numpy_statevector import NumpyStatevectorBackend
+
+# Simulator settings for each part of the app.
+#   method:  Aer simulation method ("automatic", "statevector", "stabilizer", ...), or "numpy"
+#            for the in-process NumPy engine, which hands anything it cannot run to Aer ("automatic")
+#   threads: maximum parallel threads (0 = use every core)
+#   seed:    simulator seed; leave as None unless you want every run to repeat
+BACKEND_CONFIGS = {
+    "default": {"method": "automatic", "threads": 0, "seed": None},
+    # One-qubit circuits: extra threads only add scheduling overhead. Stays on Aer rather than
+    # the NumPy engine, so the game's random bits are measured on a circuit simulator
+    "game": {"method": "statevector", "threads": 1, "seed": None},
+    # BB84 circuits only contain X, H and measurements
+    "bb84": {"method": "stabilizer", "threads": 0, "seed": None},
+    "demos": {"method": "numpy", "threads": 1, "seed": None},
+    # GHZ and graph states are Clifford circuits on up to hundreds of qubits
+    "entanglement": {"method": "stabilizer", "threads": 0, "seed": None},
+    # Small builder circuits run in NumPy, wider ones on Aer with the method passed to run()
+    "circuit_builder": {"method": "numpy", "threads": 0, "seed": None},
+}
+
+# --- Simulation method selection ---
+CLIFFORD_GATES = {"id", "h", "x", "y", "z", "s", "sdg", "sx", "sxdg", "cx", "cy", "cz", "swap"}
+_NON_GATE_OPERATIONS = {"measure", "barrier"}
+# log2 of the operator Schmidt rank: how much a gate can grow the bond dimension of any cut it spans
+_ENTANGLING_BITS = {"cx": 1, "cy": 1, "cz": 1, "ccx": 1, "swap": 2}
+STATEVECTOR_MAX_QUBITS = 16  # up to here a dense statevector is the quickest option anyway
+MPS_MAX_BOND_BITS = 8  # treat a circuit as low-entanglement if every bond stays <= 2^8
+MAX_SIMULATION_BYTES = 4 * 2**30
+
+_backends = {}
+_lock = threading.Lock()
+
+
+def _build_backend(config):
+    method = "automatic" if config["method"] == "numpy" else config["method"]
+    options = {"method": method, "max_parallel_threads": config["threads"]}
+    if config["seed"] is not None:
+        options["seed_simulator"] = config["seed"]
+    if config["method"] == "numpy":
+        return NumpyStatevectorBackend(fallback=AerSimulator(**options), seed=config["seed"])
+    return AerSimulator(**options)
+
+
+def get_backend(use_case="default"):
+    """
+    Returns the shared simulator for a use case, creating it the first time it
+    is requested. Instances live for the whole process, so Streamlit reruns and
+    concurrent sessions all reuse the same object.
+    """
+    if use_case not in BACKEND_CONFIGS:
+        raise KeyError(f"Unknown simulator use case: {use_case}")
+
+    with _lock:
+        backend = _backends.get(use_case)
+        if backend is None:
+            backend = _build_backend(BACKEND_CONFIGS[use_case])
+            _backends[use_case] = backend
+        return backend
+
+
+def configure_backend(use_case, method=None, threads=None, seed=None):
+    """
+    Changes the settings of a use case (adding it if it is new). The cached
+    simulator is dropped and rebuilt with the new settings on the next request.
+    """
+    with _lock:
+        config = dict(BACKEND_CONFIGS.get(use_case, BACKEND_CONFIGS["default"]))
+        if method is not None:
+            config["method"] = method
+        if threads is not None:
+            config["threads"] = threads
+        if seed is not None:
+            config["seed"] = seed
+        BACKEND_CONFIGS[use_case] = config
+        _backends.pop(use_case, None)
+        return config
+
+
+def _gate_names(qc):
+    return {instruction.operation.name for instruction in qc.data} - _NON_GATE_OPERATIONS
+
+
+def bond_bits(qc):
+    """
+    Upper bound on log2 of the MPS bond dimension at each cut between qubit
+    i and i + 1. Every multi-qubit gate spanning a cut can grow that bond by
+    its operator Schmidt rank, and no bond can exceed the smaller side.
+    """
+    n = qc.num_qubits
+    bits = [0] * max(n - 1, 0)
+    for instruction in qc.data:
+        qubits = [qc.find_bit(q).index for q in instruction.qubits]
+        if len(qubits) < 2 or instruction.operation.name in _NON_GATE_OPERATIONS:
+            continue
+        growth = _ENTANGLING_BITS.get(instruction.operation.name, 2)
+        for cut in range(min(qubits), max(qubits)):
+            bits[cut] += growth
+    return [min(b, cut + 1, n - cut - 1) for cut, b in enumerate(bits)]
+
+
+def choose_simulation_method(qc):
+    """
+    Picks an Aer method from the gates actually in the circuit:
+    stabilizer when every gate is Clifford (polynomial cost), matrix product
+    state for wide circuits whose bonds stay small, statevector otherwise.
+    """
+    if _gate_names(qc) <= CLIFFORD_GATES:
+        return "stabilizer"
+    if qc.num_qubits > STATEVECTOR_MAX_QUBITS and max(bond_bits(qc), default=0) <= MPS_MAX_BOND_BITS:
+        return "matrix_product_state"
+    return "statevector"
+
+
+def estimate_memory_bytes(qc, method):
+    """Rough memory needed to simulate qc with the given method."""
+    n = qc.num_qubits
+    if method == "stabilizer":
+        # Tableau of 2n stabilizers/destabilizers over n qubits (X and Z bits plus phase)
+        return 2 * n * (2 * n + 1) // 8 + 1
+    if method == "matrix_product_state":
+        chi = [1] + [2 ** b for b in bond_bits(qc)] + [1]
+        # One (chi_left, 2, chi_right) complex tensor per qubit
+        return sum(16 * 2 * chi[i] * chi[i + 1] for i in range(n))
+    return 16 * 2 ** n
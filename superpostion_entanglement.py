@@ -1,8 +1,38 @@
+import time
+
+import pandas as pd
 import streamlit as st
-from qiskit import QuantumCircuit, transpile
-from qiskit_aer import Aer
+from matplotlib.figure import Figure
 from qiskit.visualization import plot_histogram
-import matplotlib.pyplot as plt
+from charts import show_histogram
+from noise_simulation import display_noise_section
+
+from entanglement_circuits import (
+    MULTIQUBIT_MAX_QUBITS, bell_circuit, ghz_circuit, graph_edges, graph_state_circuit, max_multiqubit_shots,
+    parity_statistics, run_circuit, run_memory, stabilizer_expectations, superposition_circuit
+)
+from simulator_backends import estimate_memory_bytes
+
+GRAPH_KINDS = {"Line": "line", "Ring": "ring", "Star": "star"}
+
+
+def _show_correlations(matrix, title):
+    # A standalone Figure stays out of pyplot's global registry, as in charts.py
+    fig = Figure(figsize=(5, 4))
+    ax = fig.subplots()
+    image = ax.imshow(matrix, cmap="RdBu_r", vmin=-1, vmax=1, interpolation="nearest")
+    ax.set_title(title)
+    ax.set_xlabel("Qubit j")
+    ax.set_ylabel("Qubit i")
+    fig.colorbar(image, ax=ax)
+    st.pyplot(fig)
+
+
+def _cost_caption(qc, seconds):
+    stabilizer_bytes = estimate_memory_bytes(qc, "stabilizer")
+    st.caption(f"Simulated in {seconds * 1000:.1f} ms with a {stabilizer_bytes:,}-byte stabilizer tableau; "
+               f"a statevector of {qc.num_qubits} qubits would need 2^{qc.num_qubits + 4} bytes.")
+
 
 def display_superposition_entanglement():
     # st.set_page_config(page_title="Superposition & Entanglement", layout="wide")
@@ -14,15 +44,13 @@ def display_superposition_entanglement():
     Use the buttons below to simulate each concept and see how they differ from classical behavior.
     """)
 
-    # --- Helper Function to Run Circuit ---
-    def run_circuit(qc, shots=1000):
-        backend = Aer.get_backend('qasm_simulator')
-        compiled_qc = transpile(qc, backend)
-        job = backend.run(compiled_qc, shots=shots)
-        result = job.result()
-        counts = result.get_counts()
-        return counts
-
+    use_cache = st.checkbox(
+        "Reuse cached results on repeat clicks",
+        help="Repeat clicks sample from the cached exact probabilities instead of running the simulator again."
+    )
+    seed = None
+    if use_cache and st.checkbox("Seeded replay (identical counts every click)"):
+        seed = st.number_input("Seed", min_value=0, value=42, step=1)
 
     # --- Superposition Section ---
     st.subheader("1. Superposition: One Qubit in Two States at Once")
@@ -39,24 +67,10 @@ def display_superposition_entanglement():
     """)
 
     if st.button("Simulate Superposition"):
-        qc_super = QuantumCircuit(1, 1)
-        qc_super.h(0)
-        qc_super.measure(0, 0)
-
-        counts = run_circuit(qc_super)
-        fig, ax = plt.subplots()
-        bars = ax.bar(counts.keys(), counts.values(), color=['#4E79A7', '#F28E2B'])
-        ax.set_title("Measurement Outcomes (Superposition)")
-        ax.set_xlabel("State")
-        ax.set_ylabel("Count")
-
-        for bar in bars:
-            height = bar.get_height()
-            ax.text(bar.get_x() + bar.get_width()/2., height,
-                    f'{int(height)}',
-                    ha='center', va='bottom', fontsize=10)
-
-        st.pyplot(fig)
+        qc_super = superposition_circuit()
+
+        counts = run_circuit(qc_super, use_cache=use_cache, seed=seed)
+        show_histogram(counts, "Measurement Outcomes (Superposition)", colors=['#4E79A7', '#F28E2B'])
         st.code(qc_super.draw(output='text'))
 
 
@@ -76,28 +90,90 @@ def display_superposition_entanglement():
     """)
 
     if st.button("Simulate Entanglement"):
-        qc_entangle = QuantumCircuit(2, 2)
-        qc_entangle.h(0)
-        qc_entangle.cx(0, 1)
-        qc_entangle.measure([0, 1], [0, 1])
-
-        counts = run_circuit(qc_entangle)
-        fig, ax = plt.subplots()
-        bars = ax.bar(counts.keys(), counts.values(), color=['#4E79A7', '#F28E2B', '#E15759', '#76B7B2'])
-        ax.set_title("Measurement Outcomes (Entanglement)")
-        ax.set_xlabel("State")
-        ax.set_ylabel("Count")
-
-        for bar in bars:
-            height = bar.get_height()
-            ax.text(bar.get_x() + bar.get_width()/2., height,
-                    f'{int(height)}',
-                    ha='center', va='bottom', fontsize=10)
-
-        st.pyplot(fig)
+        qc_entangle = bell_circuit()
+
+        counts = run_circuit(qc_entangle, use_cache=use_cache, seed=seed)
+        show_histogram(counts, "Measurement Outcomes (Entanglement)", colors=['#4E79A7', '#F28E2B', '#E15759', '#76B7B2'])
         st.code(qc_entangle.draw(output='text'))
 
 
+    # --- Noise Section ---
+    st.subheader("3. Noise: Fragile Superpositions")
+
+    st.markdown("""
+    Real hardware disturbs quantum states: gate errors scramble the qubit (depolarizing noise),
+    excited qubits relax to |0⟩ (amplitude damping) and measurements occasionally flip a bit (readout error).
+    Entangled states are especially fragile — noise on either qubit weakens the correlation.
+    """)
+
+    noisy_demo = st.radio("Circuit", ["Superposition", "Bell state"], horizontal=True, key="noise_demo")
+    display_noise_section(superposition_circuit() if noisy_demo == "Superposition" else bell_circuit(), "demo")
+
+
+    # --- Many-qubit Entanglement Section ---
+    st.subheader("4. Scaling Up: GHZ and Graph States on Hundreds of Qubits")
+
+    st.markdown("""
+    Entanglement does not have to make simulation exponentially expensive. Circuits built only from
+    **Clifford gates** (H, CNOT, CZ, ...) are simulated with a **stabilizer tableau** whose size grows as $n^2$,
+    so hundreds of entangled qubits take well under a second.
+
+    The **GHZ state** extends the Bell state to $n$ qubits:
+
+    $$
+    |GHZ\\rangle = \\frac{|0\\ldots0\\rangle + |1\\ldots1\\rangle}{\\sqrt{2}}
+    $$
+
+    In the Z basis all qubits always agree. In the X basis any two qubits look uncorrelated,
+    yet the parity of all $n$ results is always even — the entanglement is genuinely multi-qubit.
+    """)
+
+    num_qubits = st.slider("Number of qubits", min_value=2, max_value=MULTIQUBIT_MAX_QUBITS, value=50, key="ghz_qubits")
+    shots = st.select_slider("Shots", options=[100, 1000, 5000], value=1000, key="ghz_shots")
+    if shots > max_multiqubit_shots(num_qubits):
+        shots = max_multiqubit_shots(num_qubits)
+        st.caption(f"Limited to {shots} shots at {num_qubits} qubits: sampling time grows with shots × qubits².")
+
+    if st.button("Simulate GHZ State"):
+        start = time.perf_counter()
+        with st.spinner(f"Sampling {shots} shots of a {num_qubits}-qubit GHZ state in two bases..."):
+            stats = {basis: parity_statistics(run_memory(ghz_circuit(num_qubits, basis), shots))
+                     for basis in ("z", "x")}
+        seconds = time.perf_counter() - start
+
+        st.table(pd.DataFrame({
+            "All qubits agree": [stats[b]["all_equal"] for b in ("z", "x")],
+            "Even parity": [stats[b]["even_parity"] for b in ("z", "x")],
+            "Mean pairwise correlation": [stats[b]["mean_pairwise_correlation"] for b in ("z", "x")],
+        }, index=["Z basis", "X basis"]))
+        _show_correlations(stats["z"]["correlations"], "⟨Z_i Z_j⟩ of the GHZ state")
+        _show_correlations(stats["x"]["correlations"], "⟨X_i X_j⟩ of the GHZ state")
+        _cost_caption(ghz_circuit(num_qubits), seconds)
+
+    st.markdown("""
+    A **graph state** puts every qubit in |+⟩ and applies CZ along the edges of a graph. It is fixed by one
+    **stabilizer** per vertex $v$: $K_v = X_v \\prod_{u \\sim v} Z_u$ always measures +1. Qubits that share no edge
+    are measured in X together while their neighbors are measured in Z, so a few circuits check every stabilizer.
+    """)
+
+    graph_kind = GRAPH_KINDS[st.radio("Graph", list(GRAPH_KINDS.keys()), horizontal=True, key="graph_kind")]
+    if st.button("Simulate Graph State"):
+        edges = graph_edges(graph_kind, num_qubits)
+        start = time.perf_counter()
+        with st.spinner(f"Checking the stabilizers of a {num_qubits}-qubit graph state..."):
+            expectations, circuits = stabilizer_expectations(num_qubits, edges, shots)
+            z_stats = parity_statistics(run_memory(graph_state_circuit(num_qubits, edges), shots))
+        seconds = time.perf_counter() - start
+
+        st.bar_chart(pd.DataFrame({"⟨K_v⟩": expectations}, index=pd.Index(range(num_qubits), name="Vertex")),
+                     y_label="Stabilizer expectation")
+        st.caption(f"All {num_qubits} stabilizers checked with {circuits} circuits: "
+                   f"minimum ⟨K_v⟩ = {expectations.min():.3f}")
+        _show_correlations(z_stats["correlations"], "⟨Z_i Z_j⟩ of the graph state")
+        st.caption("Measured in Z alone, the graph state looks random; its order only shows up in the stabilizers.")
+        _cost_caption(graph_state_circuit(num_qubits, edges), seconds)
+
+
     # --- Enhanced Summary Section ---
     st.subheader("Superposition + Entanglement = Quantum Power")
 
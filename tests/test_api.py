@@ -0,0 +1,82 @@
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("qiskit_aer")
+pytest.importorskip("fastapi")
+pytest.importorskip("httpx")
+
+from fastapi.testclient import TestClient
+
+import api
+
+client = TestClient(api.app)
+
+
+def test_api_does_not_import_streamlit_pages():
+    pages = ("quantum_cryptography_qkd", "quantum_gates_circuits", "superpostion_entanglement")
+    assert not any(name in sys.modules for name in pages)
+
+
+def test_move_on_a_game_evicted_mid_request_is_404(monkeypatch):
+    game_id = client.post("/games").json()["game_id"]
+
+    def evicted(game_id, move, value):
+        raise KeyError(f"Unknown game {game_id!r}")
+
+    monkeypatch.setattr(api.game, "get_bit_pool", lambda: SimpleNamespace(get_bit=lambda: 0))
+    monkeypatch.setattr(api.get_game_service(), "play", evicted)
+    response = client.post(f"/games/{game_id}/moves", json={"move": 1})
+    assert response.status_code == 404
+
+
+@pytest.mark.parametrize("board", [
+    [["|0>", "|1>", "|ψ>"]] * 2,
+    [["|0>", "|1>", "|ψ>"], ["|0>", "|1>"], ["|0>", "|1>", "|ψ>"]],
+    [["|0>", "|1>", "X"], ["|0>", "|1>", "|ψ>"], ["|0>", "|1>", "|ψ>"]],
+])
+def test_validate_rejects_bad_boards(board):
+    assert client.post("/validate", json={"board": board}).status_code == 422
+
+
+def test_validate_accepts_a_well_formed_board():
+    board = [["|ψ>"] * 3 for _ in range(3)]
+    response = client.post("/validate", json={"board": board})
+    assert response.status_code == 200
+    assert "status" in response.json()
+
+
+def test_bb84_reports_qber_and_a_distilled_key():
+    response = client.post("/bb84", json={"num_bits": 20000, "eve_rate": 0.0, "noise": 0.02, "seed": 4})
+    assert response.status_code == 200
+    body = response.json()
+    assert not body["aborted"] and body["qber"] < 0.05
+    assert len(body["key_hex"]) * 4 >= body["final_bits"] > 0
+
+
+def test_bb84_with_a_full_eavesdropper_aborts():
+    body = client.post("/bb84", json={"num_bits": 20000, "eve_rate": 1.0, "seed": 4}).json()
+    assert body["aborted"] and "key_hex" not in body
+
+
+def test_measure_runs_a_builder_circuit():
+    request = {"num_qubits": 2, "gates": [{"gate": "h", "qubits": [0]}, {"gate": "cx", "qubits": [0, 1]}],
+               "shots": 1000, "mode": "exact"}
+    body = client.post("/circuits/measure", json=request).json()
+    assert set(body["counts"]) <= {"00", "11"} and sum(body["counts"].values()) == 1000
+
+
+@pytest.mark.parametrize("gates", [
+    [{"gate": "t", "qubits": [0]}],
+    [{"gate": "cx", "qubits": [0, 0]}],
+    [{"gate": "rx", "qubits": [0]}],
+])
+def test_measure_rejects_circuits_the_builder_cannot_make(gates):
+    assert client.post("/circuits/measure", json={"num_qubits": 2, "gates": gates}).status_code == 422
+
+
+def test_seeded_demos_replay():
+    first = client.get("/demos/bell", params={"shots": 500, "seed": 9}).json()
+    assert client.get("/demos/bell", params={"shots": 500, "seed": 9}).json() == first
+    assert client.get("/demos/bell", params={"shots": 0}).status_code == 422
@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("qiskit")
+
+from bb84_simulation import (
+    MAX_BB84_BITS, MAX_CIRCUIT_BITS, bb84_protocol, estimate_qber, expected_qber, sweep_eve_rates
+)
+
+KEYS = ("alice_bits", "alice_bases", "bob_bits", "bob_bases", "key", "bob_key", "matching_bases")
+
+
+@pytest.mark.parametrize("method", ["numpy", "circuit"])
+def test_without_eve_or_noise_bob_gets_alices_sifted_key(method):
+    if method == "circuit":
+        pytest.importorskip("qiskit_aer")
+    result = bb84_protocol(2000, method=method, seed=11)
+    assert set(result) == set(KEYS)
+    assert np.array_equal(result["matching_bases"], np.flatnonzero(result["alice_bases"] == result["bob_bases"]))
+    assert np.array_equal(result["key"], result["alice_bits"][result["matching_bases"]])
+    assert np.array_equal(result["bob_key"], result["key"])
+    assert 900 < len(result["key"]) < 1100  # bases match about half the time
+
+
+@pytest.mark.parametrize("method", ["numpy", "circuit"])
+def test_mismatched_bases_give_fair_coins(method):
+    if method == "circuit":
+        pytest.importorskip("qiskit_aer")
+    result = bb84_protocol(4000, method=method, seed=12)
+    other = result["alice_bases"] != result["bob_bases"]
+    agreement = np.mean(result["alice_bits"][other] == result["bob_bits"][other])
+    assert agreement == pytest.approx(0.5, abs=0.05)
+
+
+def test_numpy_engine_is_seeded_and_scales_to_the_limit():
+    first = bb84_protocol(MAX_BB84_BITS, seed=5)
+    second = bb84_protocol(MAX_BB84_BITS, seed=5)
+    assert all(np.array_equal(first[k], second[k]) for k in KEYS)
+    assert first["alice_bits"].dtype == np.uint8
+
+
+@pytest.mark.parametrize("kwargs", [
+    {"num_bits": 0}, {"num_bits": MAX_BB84_BITS + 1}, {"num_bits": MAX_CIRCUIT_BITS + 1, "method": "circuit"},
+    {"num_bits": 10, "method": "qasm"},
+])
+def test_bad_arguments_raise(kwargs):
+    with pytest.raises(ValueError):
+        bb84_protocol(**kwargs)
+
+
+@pytest.mark.parametrize("eve_rate, noise", [(1.0, 0.0), (0.4, 0.0), (0.0, 0.05), (0.5, 0.03)])
+def test_measured_error_rate_matches_the_theory(eve_rate, noise):
+    result = bb84_protocol(200000, seed=21, eve_rate=eve_rate, noise=noise)
+    error_rate = np.mean(result["key"] != result["bob_key"])
+    assert error_rate == pytest.approx(expected_qber(eve_rate, noise), abs=0.005)
+
+
+def test_circuit_engine_sees_eve_like_the_numpy_engine():
+    pytest.importorskip("qiskit_aer")
+    result = bb84_protocol(MAX_CIRCUIT_BITS, method="circuit", seed=22, eve_rate=1.0)
+    assert np.mean(result["key"] != result["bob_key"]) == pytest.approx(0.25, abs=0.03)
+
+
+def test_qber_estimate_samples_and_keeps_disjoint_bits():
+    result = bb84_protocol(100000, seed=23, eve_rate=0.4)
+    qber = estimate_qber(result, sample_fraction=0.25, seed=1)
+    assert qber["sampled_bits"] + len(qber["kept_indices"]) == len(result["key"])
+    assert qber["sampled_bits"] == pytest.approx(0.25 * len(result["key"]), rel=0.05)
+    assert qber["qber"] == pytest.approx(expected_qber(0.4), abs=0.01)
+
+
+def test_sweep_streams_one_estimate_per_rate_across_chunks():
+    rates = [0.0, 0.5, 1.0]
+    rows = list(sweep_eve_rates(300000, rates, noise=0.01, chunk_size=2**16, seed=24))
+    assert [row["eve_rate"] for row in rows] == rates
+    for row in rows:
+        assert row["sifted_bits"] == pytest.approx(150000, rel=0.02)
+        assert row["qber"] == pytest.approx(row["expected_qber"], abs=0.01)
+
+
+def test_sweep_is_capped_at_max_bits():
+    with pytest.raises(ValueError):
+        next(sweep_eve_rates(MAX_BB84_BITS + 1, [0.0]))
+
@@ -0,0 +1,23 @@
+from benchmarks import compare
+
+RESULT = {"p50": 0.01, "peak_memory_bytes": 2**20}
+
+
+def test_failing_and_missing_benchmarks_are_regressions():
+    baseline = {"results": {"a": RESULT, "b": RESULT, "c": RESULT}}
+    report = {"names": [], "results": {"a": RESULT, "b": {"error": "RuntimeError: boom"}}}
+    rows = {name: regressed for name, _, _, regressed in compare(report, baseline)}
+    assert rows == {"a": False, "b": True, "c": True}
+
+
+def test_baseline_entries_outside_the_name_filter_are_not_missing():
+    baseline = {"results": {"bb84[1]": RESULT, "ghz[1]": RESULT}}
+    report = {"names": ["bb84"], "results": {"bb84[1]": RESULT}}
+    assert [row[0] for row in compare(report, baseline)] == ["bb84[1]"]
+
+
+def test_slower_benchmark_is_a_regression():
+    baseline = {"results": {"a": RESULT}}
+    report = {"results": {"a": {**RESULT, "p50": 0.02}}}
+    [(_, time_ratio, memory_ratio, regressed)] = compare(report, baseline)
+    assert (time_ratio, memory_ratio, regressed) == (2.0, 1.0, True)
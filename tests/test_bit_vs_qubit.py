@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("qiskit_aer")
+
+import bit_vs_qubit
+from bit_vs_qubit import RunningBitStats, compare_bits_vs_qubits
+
+
+class RecordingBackend:
+    """Returns alternating 0/1 memory and records the shots of every run."""
+
+    def __init__(self):
+        self.runs = []
+
+    def run(self, qc, shots, memory=False, **options):
+        self.runs.append(shots)
+        result = type("Result", (), {"get_memory": lambda _: ["0", "1"] * (shots // 2) + ["0"] * (shots % 2)})
+        return type("Job", (), {"result": lambda _: result()})()
+
+
+def test_running_stats_match_the_whole_stream():
+    bits = np.random.default_rng(0).integers(0, 2, 5000, dtype=np.uint8)
+    stats = RunningBitStats(len(bits))
+    for chunk in np.array_split(bits, 7):
+        stats.update(chunk)
+    assert stats.counts() == {"0": int((bits == 0).sum()), "1": int(bits.sum())}
+    assert stats.chi_square == pytest.approx((2 * bits.sum() - len(bits)) ** 2 / len(bits))
+    for shots, mean in stats.curve:
+        assert mean == pytest.approx(bits[:shots].mean())
+
+
+def test_qubit_side_is_one_simulator_run_per_chunk(monkeypatch):
+    backend = RecordingBackend()
+    monkeypatch.setattr(bit_vs_qubit, "get_backend", lambda use_case: backend)
+    monkeypatch.setattr(bit_vs_qubit, "cached_transpile", lambda qc, backend: qc)
+
+    *_, (classical, qubit) = compare_bits_vs_qubits(2500, chunk_size=1000, seed=1)
+    assert backend.runs == [1000, 1000, 500]
+    assert qubit.counts() == {"0": 1250, "1": 1250}
+    assert classical.shots == 2500
+
+
+def test_seeded_runs_are_reproducible():
+    first = [q.ones for _, q in compare_bits_vs_qubits(3000, chunk_size=1000, seed=7)]
+    second = [q.ones for _, q in compare_bits_vs_qubits(3000, chunk_size=1000, seed=7)]
+    assert first == second
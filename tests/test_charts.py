@@ -0,0 +1,44 @@
+import pytest
+
+pytest.importorskip("streamlit")
+pytest.importorskip("matplotlib")
+
+import matplotlib.pyplot as plt
+
+import charts
+from charts import chart_cache_stats, render_histogram_png
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+@pytest.fixture(autouse=True)
+def empty_cache(monkeypatch):
+    monkeypatch.setattr(charts, "_png_cache", type(charts._png_cache)())
+    monkeypatch.setattr(charts, "_figures", {})
+
+
+def test_identical_histograms_are_drawn_once(monkeypatch):
+    draws = []
+    draw = charts._draw
+    monkeypatch.setattr(charts, "_draw", lambda *args: (draws.append(args[1]), draw(*args)))
+    first = render_histogram_png({"0": 480, "1": 520}, "Coin")
+    assert first.startswith(PNG_SIGNATURE)
+    assert render_histogram_png({"0": 480, "1": 520}, "Coin") is first
+    render_histogram_png({"0": 481, "1": 519}, "Coin")
+    assert len(draws) == 2
+
+
+def test_rendering_leaves_no_pyplot_figures_and_reuses_one_per_size():
+    before = plt.get_fignums()
+    for shots in range(20):
+        render_histogram_png({"00": shots, "11": 100 - shots}, "Bell")
+    render_histogram_png({"0": 1}, "Small", figsize=(3, 2))
+    assert plt.get_fignums() == before
+    assert chart_cache_stats() == {"png_entries": 21, "figures": 2}
+
+
+def test_png_cache_is_bounded(monkeypatch):
+    monkeypatch.setattr(charts, "PNG_CACHE_MAX_ENTRIES", 3)
+    for shots in range(5):
+        render_histogram_png({"0": shots}, "Bounded")
+    assert chart_cache_stats()["png_entries"] == 3
@@ -0,0 +1,83 @@
+import math
+
+import numpy as np
+import pytest
+
+pytest.importorskip("qiskit")
+
+from circuit_builder import GATE_ARITY, ROTATION_GATES, THETA, bind_theta, build_circuit
+from circuit_optimizer import commute, optimize_circuit, sync_optimizer
+from numpy_statevector import simulate
+
+SEED = 7
+NUM_CIRCUITS = 200
+NUM_QUBITS = 3
+# Multiples of π/2 make merged rotations hit the identity and π special cases often
+ANGLES = [math.pi / 2, math.pi, 3 * math.pi / 2, 2 * math.pi, 0.3]
+
+
+def random_gates(rng, num_gates, theta=False):
+    """Random builder gates, drawn from a small pool so that cancellations and merges are common."""
+    gates = []
+    for _ in range(num_gates):
+        name = rng.choice(sorted(GATE_ARITY))
+        qubits = [int(q) for q in rng.choice(NUM_QUBITS, GATE_ARITY[name], replace=False)]
+        if name in ROTATION_GATES:
+            angle = THETA if theta and rng.random() < 0.5 else float(rng.choice(ANGLES))
+            gates.append((name, qubits, angle))
+        else:
+            gates.append((name, qubits))
+        if rng.random() < 0.3:
+            gates.append(gates[-1])  # an immediate repeat cancels or merges
+    return gates
+
+
+def assert_equivalent(qc, optimized):
+    """Equal statevectors up to a global phase."""
+    psi, phi = simulate(qc), simulate(optimized)
+    assert abs(np.vdot(psi, phi)) == pytest.approx(1.0, abs=1e-9)
+
+
+def test_optimized_circuits_are_equivalent():
+    rng = np.random.default_rng(SEED)
+    removed = 0
+    for _ in range(NUM_CIRCUITS):
+        qc = build_circuit(NUM_QUBITS, random_gates(rng, 20))
+        optimizer = optimize_circuit(qc)
+        assert_equivalent(qc, optimizer.to_circuit())
+        removed += len(qc.data) - len(optimizer.gates)
+    assert removed > NUM_CIRCUITS  # the pool is built to give the optimizer plenty to do
+
+
+def test_optimizing_before_binding_theta_is_equivalent():
+    rng = np.random.default_rng(SEED + 1)
+    for _ in range(NUM_CIRCUITS):
+        qc = build_circuit(NUM_QUBITS, random_gates(rng, 20, theta=True))
+        optimized = optimize_circuit(qc).to_circuit()
+        for theta in (0.0, 1.1, math.pi):
+            assert_equivalent(bind_theta(qc, theta), bind_theta(optimized, theta))
+
+
+def test_inverse_pairs_cancel_across_commuting_gates():
+    qc = build_circuit(3, [("cx", [0, 1]), ("rz", [0], 0.4), ("cx", [0, 2]), ("cx", [0, 1])])
+    assert optimize_circuit(qc).gates == [("rz", [0], [0.4]), ("cx", [0, 2], [])]
+
+
+def test_rotations_merge_and_vanish_at_two_pi():
+    qc = build_circuit(1, [("rx", [0], math.pi / 2), ("x", [0]), ("rx", [0], math.pi / 2)])
+    assert optimize_circuit(qc).gates == []
+
+
+def test_commute_only_on_matching_local_bases():
+    assert commute(("cx", [0, 1], []), ("cx", [0, 2], []))
+    assert commute(("rz", [0], [0.1]), ("cx", [0, 1], []))
+    assert not commute(("rx", [0], [0.1]), ("cx", [0, 1], []))
+    assert not commute(("h", [0], []), ("z", [0], []))
+
+
+def test_sync_optimizer_reuses_or_rebuilds():
+    qc = build_circuit(2, [("h", [0]), ("cx", [0, 1])])
+    optimizer = optimize_circuit(qc)
+    assert sync_optimizer(qc, optimizer) is optimizer
+    shorter = build_circuit(2, [("h", [0])])
+    assert sync_optimizer(shorter, optimizer).source_gates == 1
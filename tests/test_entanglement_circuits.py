@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("qiskit_aer")
+
+import entanglement_circuits
+from entanglement_circuits import (
+    MULTIQUBIT_MAX_QUBITS, correlation_matrix, ghz_circuit, graph_edges, greedy_coloring, max_multiqubit_shots,
+    parity_statistics, run_memory, stabilizer_expectations
+)
+
+NUM_QUBITS = 8
+SHOTS = 400
+
+
+def test_ghz_qubits_agree_in_z_and_have_even_parity_in_x():
+    z = parity_statistics(run_memory(ghz_circuit(NUM_QUBITS), SHOTS, seed=1))
+    x = parity_statistics(run_memory(ghz_circuit(NUM_QUBITS, "x"), SHOTS, seed=1))
+    assert z["all_equal"] == 1.0 and z["mean_pairwise_correlation"] == pytest.approx(1.0)
+    assert x["even_parity"] == 1.0
+    assert abs(x["mean_pairwise_correlation"]) < 0.2  # pairs alone look uncorrelated
+    assert 0.3 < run_memory(ghz_circuit(NUM_QUBITS), SHOTS, seed=2)[:, 0].mean() < 0.7
+
+
+@pytest.mark.parametrize("kind", ["line", "ring", "star"])
+def test_every_graph_state_stabilizer_measures_plus_one(kind):
+    expectations, circuits = stabilizer_expectations(NUM_QUBITS, graph_edges(kind, NUM_QUBITS), SHOTS, seed=3)
+    assert np.all(expectations == 1.0)
+    assert circuits == 2  # all three graphs are bipartite
+
+
+def test_memory_columns_follow_the_clbit_index(monkeypatch):
+    class Backend:
+        def run(self, qc, shots, memory, **options):
+            result = type("Result", (), {"get_memory": lambda _: ["001", "110"]})
+            return type("Job", (), {"result": lambda _: result()})()
+
+    monkeypatch.setattr(entanglement_circuits, "get_backend", lambda use_case: Backend())
+    qc = ghz_circuit(3)
+    assert run_memory(qc, shots=2).tolist() == [[1, 0, 0], [0, 1, 1]]
+
+
+def test_correlations_of_known_bits():
+    bits = np.array([[0, 0, 1], [1, 1, 0], [0, 0, 1], [1, 1, 0]], dtype=np.uint8)
+    assert correlation_matrix(bits).tolist() == [[1, 1, -1], [1, 1, -1], [-1, -1, 1]]
+    stats = parity_statistics(bits)
+    assert stats["all_equal"] == 0.0 and stats["even_parity"] == 0.5
+    assert stats["mean_pairwise_correlation"] == pytest.approx(-1 / 3)
+
+
+@pytest.mark.parametrize("kind", ["line", "ring", "star"])
+def test_greedy_coloring_separates_neighbors(kind):
+    for num_qubits in (2, 3, 7, 50):
+        edges = graph_edges(kind, num_qubits)
+        colors = greedy_coloring(num_qubits, edges)
+        assert all(colors[a] != colors[b] for a, b in edges)
+        assert colors.max() + 1 <= 3
+
+
+def test_shot_budget_shrinks_with_width_but_not_below_100():
+    assert max_multiqubit_shots(2) >= 5000
+    assert max_multiqubit_shots(MULTIQUBIT_MAX_QUBITS) == 100
+    with pytest.raises(ValueError):
+        graph_edges("tree", 4)
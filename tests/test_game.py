@@ -0,0 +1,90 @@
+import threading
+import time
+
+import numpy as np
+import pytest
+
+pytest.importorskip("qiskit")
+
+from game import QuantumBitPool
+
+
+class SlowPool(QuantumBitPool):
+    """Pool whose simulator run takes a while and is counted."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.runs = 0
+        self.running = threading.Event()
+
+    def _measure_bits(self, shots):
+        self.runs += 1
+        self.running.set()
+        time.sleep(0.2)
+        return np.arange(shots, dtype=np.uint8) % 2
+
+
+def test_fill_runs_outside_the_lock_and_only_once():
+    pool = SlowPool(pool_size=64, low_water=0)
+    bits = []
+    readers = [threading.Thread(target=lambda: bits.append(pool.get_bit())) for _ in range(8)]
+    for reader in readers:
+        reader.start()
+
+    pool.running.wait()
+    start = time.perf_counter()
+    pool.bias_report()  # takes the lock while the simulator runs
+    assert time.perf_counter() - start < 0.1
+
+    for reader in readers:
+        reader.join()
+    assert pool.runs == 1
+    assert sorted(bits) == [0] * 4 + [1] * 4
+
+
+class SequencePool(QuantumBitPool):
+    """Pool whose simulator runs return a known, numbered bit pattern."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.runs = []
+
+    def _measure_bits(self, shots):
+        self.runs.append(shots)
+        return ((np.arange(shots) + 3 * len(self.runs)) % 2).astype(np.uint8)
+
+
+def test_bits_are_served_in_order_with_one_run_per_fill():
+    pool = SequencePool(pool_size=10, low_water=0)
+    bits = [pool.get_bit() for _ in range(25)]
+    assert pool.runs == [10, 10, 10]
+    assert bits == [1, 0] * 5 + [0, 1] * 5 + [1, 0, 1, 0, 1]
+
+
+def test_background_refill_starts_at_the_low_water_mark():
+    pool = SequencePool(pool_size=8, low_water=4)
+    for _ in range(5):
+        pool.get_bit()
+    deadline = time.monotonic() + 5
+    while len(pool.runs) < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert pool.runs == [8, 8]
+    for _ in range(4):
+        pool.get_bit()  # the refill topped the buffer up to 8, so 4 stay above the mark
+    time.sleep(0.05)
+    assert len(pool.runs) == 2
+
+
+def test_bias_report_matches_the_chi_square_test():
+    pool = SequencePool(pool_size=100)
+    for _ in range(100):
+        pool.get_bit()
+    report = pool.bias_report()
+    assert report["bits"] == 100 and report["ones"] == 50
+    assert report["chi_square"] == 0.0 and report["p_value"] == 1.0
+    assert QuantumBitPool(pool_size=4).bias_report()["ones_fraction"] is None
+
+
+def test_pool_size_must_be_positive():
+    with pytest.raises(ValueError):
+        QuantumBitPool(pool_size=0)
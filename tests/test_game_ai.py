@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+
+import game_ai
+from game_ai import NO_MOVE, ExpectimaxSolver, ai_move, computer_to_move, load_policy, solve_policy, state_index
+from game_bitboard import EMPTY_BOARD, validate_bits
+
+
+def test_shipped_policy_matches_a_fresh_solve():
+    assert np.array_equal(load_policy(), solve_policy())
+
+
+def test_policy_moves_are_legal_exactly_where_the_computer_moves():
+    policy = load_policy()
+    for index, board in game_ai._all_boards():
+        assert state_index(board) == index
+        playable = computer_to_move(board) and validate_bits(board)[0] == 1
+        if playable:
+            assert int(policy[index]) in board.available_moves()
+        else:
+            assert policy[index] == NO_MOVE
+
+
+def test_policy_moves_are_optimal():
+    # Ties may be broken differently on symmetric boards, so only the move's value is checked
+    solver = ExpectimaxSolver()
+    policy = load_policy()
+    for index, board in game_ai._all_boards():
+        if policy[index] == NO_MOVE:
+            continue
+        best = max(solver.move_value(board, move) for move in board.available_moves())
+        assert solver.move_value(board, int(policy[index])) == pytest.approx(best)
+
+
+def test_ai_move_refuses_when_it_is_not_the_computers_turn():
+    with pytest.raises(ValueError):
+        ai_move(EMPTY_BOARD)
@@ -0,0 +1,68 @@
+import pytest
+
+from game_bitboard import EMPTY_BOARD, ONE_KET, PSI, ZERO_KET, from_string_board, to_string_board, validate_bits
+
+
+def string_validate(board):
+    """The string-board validate that game.py used before the bitboard engine."""
+    if board[0, 0] == board[1, 1] == board[2, 2] == ONE_KET:
+        return 0, "User wins!"
+    if board[0, 0] == board[1, 1] == board[2, 2] == ZERO_KET:
+        return 0, "Computer wins!"
+    if board[0, 2] == board[1, 1] == board[2, 0] == ONE_KET:
+        return 0, "User wins!"
+    if board[0, 2] == board[1, 1] == board[2, 0] == ZERO_KET:
+        return 0, "Computer wins!"
+    for row in range(3):
+        if all(cell == ONE_KET for cell in board[row]):
+            return 0, "User wins!"
+        if all(cell == ZERO_KET for cell in board[row]):
+            return 0, "Computer wins!"
+    for col in range(3):
+        if all(cell == ONE_KET for cell in board[:, col]):
+            return 0, "User wins!"
+        if all(cell == ZERO_KET for cell in board[:, col]):
+            return 0, "Computer wins!"
+    if PSI not in board:
+        return 0, "It is a draw!"
+    return 1, ""
+
+
+def reachable_boards():
+    """Every board a game can pass through: any free cell collapses to 0 or 1 until the game ends."""
+    seen = {EMPTY_BOARD}
+    stack = [EMPTY_BOARD]
+    while stack:
+        board = stack.pop()
+        if validate_bits(board)[0] == 0:
+            continue
+        for move in board.available_moves():
+            for value in (0, 1):
+                child = board.place(move, value)
+                if child not in seen:
+                    seen.add(child)
+                    stack.append(child)
+    return seen
+
+
+def test_validate_bits_matches_the_string_validate_on_every_reachable_board():
+    boards = reachable_boards()
+    assert len(boards) > 5000
+    for board in boards:
+        assert validate_bits(board) == string_validate(to_string_board(board)), to_string_board(board)
+
+
+def test_string_conversion_round_trips():
+    for board in reachable_boards():
+        assert from_string_board(to_string_board(board)) == board
+
+
+def test_move_numbers_are_row_major():
+    board = EMPTY_BOARD.place(1, 1).place(6, 0)
+    assert to_string_board(board).tolist() == [[ONE_KET, PSI, PSI], [PSI, PSI, ZERO_KET], [PSI, PSI, PSI]]
+    assert board.available_moves() == [2, 3, 4, 5, 7, 8, 9]
+
+
+def test_placing_on_a_taken_cell_raises():
+    with pytest.raises(ValueError):
+        EMPTY_BOARD.place(5, 1).place(5, 0)
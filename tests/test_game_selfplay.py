@@ -0,0 +1,47 @@
+import functools
+
+import pytest
+
+from game_bitboard import EMPTY_BOARD, validate_bits
+from game_selfplay import OUTCOMES, simulate_batch, simulate_games
+
+
+@functools.lru_cache(maxsize=None)
+def exact_outcomes(board, p_one=0.5):
+    """Outcome probabilities of random play from board, by exhaustive recursion over the bitboard engine."""
+    status, message = validate_bits(board)
+    if status == 0:
+        return tuple(float(message == outcome) for outcome in OUTCOMES)
+    moves = board.available_moves()
+    totals = [0.0] * len(OUTCOMES)
+    for move in moves:
+        for value, weight in ((1, p_one), (0, 1 - p_one)):
+            for i, p in enumerate(exact_outcomes(board.place(move, value), p_one)):
+                totals[i] += weight * p / len(moves)
+    return tuple(totals)
+
+
+@pytest.mark.parametrize("p_one", [0.5, 0.7])
+def test_outcome_frequencies_match_exact_random_play(p_one):
+    batch = simulate_batch(200000, seed=1, p_one=p_one)
+    assert batch["outcomes"].sum() == 200000
+    for observed, expected in zip(batch["outcomes"] / 200000, exact_outcomes(EMPTY_BOARD, p_one)):
+        assert observed == pytest.approx(expected, abs=0.005)
+
+
+def test_game_lengths_and_winning_cells_are_consistent():
+    batch = simulate_batch(50000, seed=2)
+    lengths = batch["game_lengths"]
+    assert lengths.sum() == 50000
+    assert lengths[:3].sum() == 0  # a line needs three cells
+    # Every win credits exactly the three cells of one line
+    assert batch["user_win_cells"].sum() == 3 * batch["outcomes"][0]
+    assert batch["computer_win_cells"].sum() == 3 * batch["outcomes"][1]
+
+
+def test_results_do_not_depend_on_the_number_of_workers():
+    in_process = simulate_games(30000, batch_size=10000, workers=1, seed=3)
+    pooled = simulate_games(30000, batch_size=10000, workers=2, seed=3)
+    assert in_process["outcomes"] == pooled["outcomes"]
+    assert in_process["game_lengths"] == pooled["game_lengths"]
+    assert sum(in_process["probabilities"].values()) == pytest.approx(1.0)
@@ -0,0 +1,46 @@
+import threading
+
+import pytest
+
+from game_store import GameService, MemoryGameStore, SQLiteGameStore
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def make_store(request, tmp_path):
+    if request.param == "memory":
+        store = MemoryGameStore()
+        return lambda: store
+    # Every call opens its own connection, like separate worker processes
+    return lambda: SQLiteGameStore(str(tmp_path / "games.db"))
+
+
+def test_concurrent_moves_are_not_lost(make_store):
+    # Four cells that never complete a line, so the game goes on whatever the order
+    moves = [1, 2, 6, 7]
+    game_id = GameService(make_store()).new_game()
+    services = [GameService(make_store()) for _ in moves]
+    barrier = threading.Barrier(len(services))
+
+    def play(service, move):
+        barrier.wait()
+        service.play(game_id, move, 0)
+
+    threads = [threading.Thread(target=play, args=(service, move)) for move, service in zip(moves, services)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    state = GameService(make_store()).load(game_id)
+    assert sorted(state.player_moves + state.computer_moves) == moves
+
+
+def test_sqlite_reads_see_other_connections(tmp_path):
+    path = str(tmp_path / "games.db")
+    first, second = GameService(SQLiteGameStore(path)), GameService(SQLiteGameStore(path))
+    game_id = first.new_game()
+    first.load(game_id)
+    second.play(game_id, 5, 1)
+    first.play(game_id, 1, 0)
+    assert first.load(game_id).player_moves == [5]
+    assert first.load(game_id).computer_moves == [1]
@@ -0,0 +1,39 @@
+import time
+
+import pytest
+
+pytest.importorskip("streamlit")
+
+import job_queue
+from job_queue import JobQueue
+
+
+def test_cancelled_jobs_hold_their_slot_until_their_chunks_finish():
+    queue = JobQueue(max_workers=1, max_active_jobs=4, max_jobs_per_session=1)
+    job_id = queue.submit("session", time.sleep, [(1.0,)])
+    while queue.poll(job_id)["status"] != "running":
+        time.sleep(0.05)
+
+    # Cancel and resubmit, as the page does: the running chunk still counts for the session
+    queue.cancel(job_id)
+    queue.forget(job_id)
+    with pytest.raises(RuntimeError):
+        queue.submit("session", time.sleep, [(0,)])
+    assert queue.stats()["active_jobs"] == 1
+
+    while queue.stats()["active_jobs"]:
+        time.sleep(0.05)
+    queue.submit("session", time.sleep, [(0,)])
+    assert queue.stats()["tracked_jobs"] == 1
+
+
+def test_jobs_nobody_polls_expire_after_the_ttl(monkeypatch):
+    monkeypatch.setattr(job_queue, "FINISHED_JOB_TTL_SECONDS", 0.1)
+    queue = JobQueue(max_workers=1)
+    queue.submit("closed session", time.sleep, [(0,)])
+    while queue.stats()["active_jobs"]:
+        time.sleep(0.05)
+
+    time.sleep(0.2)
+    queue.submit("session", time.sleep, [(0,)])
+    assert queue.stats()["tracked_jobs"] == 1
@@ -0,0 +1,103 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("qiskit")
+
+from qiskit.quantum_info import Statevector
+
+from circuit_builder import THETA, bind_theta, build_circuit, first_theta_gate, measure_circuit
+from live_statevector import LiveStatevector
+from probability_sampler import sample_basis_counts
+
+GATES = [("h", [0]), ("cx", [0, 1]), ("ry", [2], THETA), ("x", [1]), ("rz", [0], THETA), ("swap", [1, 2])]
+
+
+def replay(live_state, qc):
+    for instruction in list(qc.data)[live_state.depth:]:
+        live_state.apply(instruction.operation, [qc.find_bit(q).index for q in instruction.qubits])
+
+
+def prefix(qc, depth):
+    """The first depth gates of qc."""
+    qc_prefix = qc.copy_empty_like()
+    for instruction in list(qc.data)[:depth]:
+        qc_prefix.append(instruction.operation, instruction.qubits, instruction.clbits)
+    return qc_prefix
+
+
+def test_probabilities_are_an_array_over_basis_states():
+    qc = bind_theta(build_circuit(3, GATES), 0.3)
+    live_state = LiveStatevector(3)
+    replay(live_state, qc)
+    probabilities = live_state.probabilities()
+    assert probabilities.shape == (8,)
+    assert np.allclose(probabilities, Statevector(qc).probabilities())
+
+
+def test_rewinding_to_the_first_theta_gate_tracks_a_new_theta():
+    qc = build_circuit(3, GATES)
+    assert first_theta_gate(qc) == 2
+    live_state = LiveStatevector(3)
+    replay(live_state, bind_theta(qc, 0.3))
+
+    live_state.rewind(first_theta_gate(qc))
+    assert live_state.depth == 2
+    replay(live_state, bind_theta(qc, 1.9))
+    assert np.allclose(live_state.amplitudes(), Statevector(bind_theta(qc, 1.9)).data)
+
+
+def test_sample_basis_counts_labels_only_drawn_outcomes():
+    probabilities = np.zeros(2**16)
+    probabilities[[0, 5, 2**16 - 1]] = [0.5, 0.25, 0.25]
+    counts = sample_basis_counts(probabilities, 1000, 16, seed=1)
+    assert set(counts) <= {"0" * 16, format(5, "016b"), "1" * 16}
+    assert sum(counts.values()) == 1000
+
+
+def test_exact_measurement_reuses_the_live_probabilities():
+    qc = bind_theta(build_circuit(3, GATES), 0.3)
+    live_state = LiveStatevector(3)
+    replay(live_state, qc)
+    counts, probabilities = measure_circuit(qc, 5000, mode="exact", probabilities=live_state.probabilities())
+    assert probabilities is not None and sum(counts.values()) == 5000
+    for state, n in counts.items():
+        assert probabilities[int(state, 2)] > 0
+
+
+def test_gates_match_the_reference_statevector_one_by_one():
+    rng = np.random.default_rng(9)
+    gates = [("h", [0]), ("ccx", [2, 0, 3]), ("swap", [3, 1]), ("cx", [1, 0]), ("ry", [3], 0.8), ("cz", [2, 1])]
+    for _ in range(20):
+        order = [gates[i] for i in rng.permutation(len(gates))]
+        qc = build_circuit(4, [("h", [1]), ("x", [2])] + order)
+        live_state = LiveStatevector(4)
+        for depth in range(1, len(qc.data) + 1):
+            replay(live_state, prefix(qc, depth))
+            assert np.allclose(live_state.amplitudes(), Statevector(prefix(qc, depth)).data)
+
+
+def test_undo_restores_the_previous_state():
+    qc = build_circuit(3, [("h", [0]), ("cx", [0, 1]), ("rx", [2], 1.3), ("ccx", [0, 2, 1])])
+    live_state = LiveStatevector(3)
+    replay(live_state, qc)
+    for depth in range(len(qc.data) - 1, -1, -1):
+        instruction = qc.data[depth]
+        qubits = tuple(qc.find_bit(q).index for q in instruction.qubits)
+        assert live_state.undo() == (instruction.operation.name, qubits)
+        assert np.allclose(live_state.amplitudes(), Statevector(prefix(qc, depth)).data)
+    assert live_state.undo() is None
+
+
+def test_builder_page_keeps_the_live_state_in_step_with_the_circuit():
+    pytest.importorskip("streamlit")
+    from quantum_gates_circuits import sync_live_state, undo_last_gate
+
+    qc = build_circuit(3, GATES[:2])
+    live_state = sync_live_state(qc)
+    assert live_state.depth == 2
+    qc = build_circuit(3, [("h", [0]), ("cx", [0, 1]), ("x", [2])])
+    assert sync_live_state(qc, live_state) is live_state  # only the new gate is applied
+    qc = undo_last_gate(qc, live_state)
+    assert len(qc.data) == live_state.depth == 2
+    assert np.allclose(live_state.amplitudes(), Statevector(qc).data)
+    assert sync_live_state(build_circuit(2, [("h", [0])]), live_state) is not live_state
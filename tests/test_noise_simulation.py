@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("qiskit")
+pytest.importorskip("streamlit")
+
+from circuit_builder import build_circuit, measured_copy
+from noise_simulation import NoiseModel, density_matrix, run_density_matrix, run_noisy, run_trajectories
+
+TRAJECTORIES = 20000
+NOISE = NoiseModel(depolarizing=0.05, amplitude_damping=0.1, readout_error=0.03)
+CIRCUITS = {
+    "bell": [("h", [0]), ("cx", [0, 1])],
+    "ghz": [("h", [0]), ("cx", [0, 1]), ("cx", [1, 2])],
+    "rotations": [("ry", [0], 1.1), ("x", [1]), ("cz", [0, 1]), ("rx", [2], 0.4), ("ccx", [0, 1, 2])],
+}
+
+
+def builder_circuit(name):
+    gates = CIRCUITS[name]
+    return measured_copy(build_circuit(1 + max(q for _, qubits, *_ in gates for q in qubits), gates))
+
+
+def total_variation(probabilities, counts):
+    shots = sum(counts.values())
+    states = set(probabilities) | set(counts)
+    return 0.5 * sum(abs(probabilities.get(s, 0.0) - counts.get(s, 0) / shots) for s in states)
+
+
+@pytest.mark.parametrize("name", CIRCUITS)
+def test_trajectories_agree_with_the_density_matrix(name):
+    qc = builder_circuit(name)
+    exact = run_density_matrix(qc, NOISE, shots=1)
+    sampled = run_trajectories(qc, NOISE, TRAJECTORIES, seed=3)
+    assert sum(sampled["counts"].values()) == TRAJECTORIES
+    # Sampling error of 20000 shots over at most 8 outcomes stays well below 0.02
+    assert total_variation(exact["probabilities"], sampled["counts"]) < 0.02
+    assert sampled["state_fidelity"] == pytest.approx(exact["state_fidelity"], abs=0.01)
+
+
+def test_density_matrix_is_a_valid_state():
+    rho = density_matrix(builder_circuit("rotations"), NOISE)
+    assert np.trace(rho).real == pytest.approx(1.0)
+    assert np.allclose(rho, rho.conj().T)
+    assert np.linalg.eigvalsh(rho).min() > -1e-12
+
+
+def test_without_noise_both_methods_reproduce_the_ideal_distribution():
+    qc = builder_circuit("bell")
+    for method in ("density_matrix", "trajectories"):
+        result = run_noisy(qc, NoiseModel(), method=method, shots=5000, seed=1)
+        assert set(result["counts"]) == {"00", "11"}
+        assert result["state_fidelity"] == pytest.approx(1.0)
+        assert result["outcome_fidelity"] == pytest.approx(1.0, abs=1e-3)
+
+
+def test_full_amplitude_damping_resets_to_zero():
+    qc = measured_copy(build_circuit(1, [("x", [0])]))
+    noise = NoiseModel(amplitude_damping=1.0)
+    assert run_density_matrix(qc, noise)["probabilities"] == {"0": pytest.approx(1.0)}
+    assert run_trajectories(qc, noise, 1000, seed=0)["counts"] == {"0": 1000}
+
+
+def test_seeded_trajectories_are_reproducible():
+    qc = builder_circuit("ghz")
+    assert run_trajectories(qc, NOISE, 2000, seed=5) == run_trajectories(qc, NOISE, 2000, seed=5)
+
+
+def test_noise_rates_are_checked():
+    with pytest.raises(ValueError):
+        NoiseModel(depolarizing=1.5)
@@ -0,0 +1,102 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("qiskit_aer")
+
+from qiskit import QuantumCircuit
+from qiskit.circuit import Parameter
+from qiskit.quantum_info import Statevector
+from qiskit_aer import AerSimulator
+
+import transpile_cache
+from numpy_statevector import (GATE_MATRICES, NUMPY_MAX_QUBITS, PARAMETRIC_GATES, NumpyStatevectorBackend,
+                               outcome_probabilities, simulate, sweep_probabilities)
+
+SEED = 2024
+NUM_CIRCUITS = 50
+NUM_GATES = 30
+SHOTS = 20000
+
+
+def random_builder_circuit(rng, num_qubits, num_gates, theta=None):
+    """
+    A random measured circuit of the builder's gates. Rotations get random
+    angles, or (about half of them) theta, or theta plus a random offset,
+    when theta is given.
+    """
+    qc = QuantumCircuit(num_qubits, num_qubits)
+    arity = {name: int(np.log2(m.shape[0])) for name, m in GATE_MATRICES.items()}
+    arity.update(dict.fromkeys(PARAMETRIC_GATES, 1))
+    names = [name for name in arity if arity[name] <= num_qubits]
+    for _ in range(num_gates):
+        name = names[rng.integers(len(names))]
+        qubits = [int(q) for q in rng.choice(num_qubits, arity[name], replace=False)]
+        if name not in PARAMETRIC_GATES:
+            getattr(qc, name)(*qubits)
+            continue
+        angle = float(rng.uniform(-2 * np.pi, 2 * np.pi))
+        if theta is not None and rng.random() < 0.5:
+            angle = theta if rng.random() < 0.5 else theta + angle
+        getattr(qc, name)(angle, *qubits)
+    qc.measure(range(num_qubits), range(num_qubits))
+    return qc
+
+
+@pytest.fixture(scope="module")
+def circuits():
+    rng = np.random.default_rng(SEED)
+    return [random_builder_circuit(rng, int(rng.integers(1, NUMPY_MAX_QUBITS + 1)), NUM_GATES)
+            for _ in range(NUM_CIRCUITS)]
+
+
+def test_statevector_matches_qiskit(circuits):
+    for qc in circuits:
+        expected = Statevector(qc.remove_final_measurements(inplace=False)).data
+        np.testing.assert_allclose(simulate(qc), expected, atol=1e-9)
+
+
+@pytest.mark.parametrize("engine", ["numpy", "aer"])
+def test_counts_follow_the_exact_distribution(circuits, engine):
+    aer = AerSimulator(method="statevector", seed_simulator=SEED)
+    backend = NumpyStatevectorBackend(fallback=aer, seed=SEED) if engine == "numpy" else aer
+    for qc in circuits:
+        labels, p = outcome_probabilities(qc)
+        exact = dict(zip(labels, p))
+        counts = backend.run(qc, shots=SHOTS).result().get_counts()
+        assert set(counts) <= set(exact)
+        # The mean TV distance of an empirical distribution is at most sqrt(outcomes / shots) / 2
+        tv = sum(abs(counts.get(o, 0) / SHOTS - q) for o, q in exact.items()) / 2
+        assert tv <= 1.5 * np.sqrt(len(labels) / SHOTS) + 0.01
+
+
+def test_sweep_matches_qiskit_at_every_angle():
+    rng = np.random.default_rng(SEED)
+    theta = Parameter("θ")
+    angles = [-np.pi, 0.0, 0.7, np.pi / 2, 3.0]
+    for _ in range(10):
+        qc = random_builder_circuit(rng, int(rng.integers(1, 6)), NUM_GATES, theta)
+        labels, probabilities = sweep_probabilities(qc, theta, angles)
+        for angle, row in zip(angles, probabilities):
+            bound = qc.assign_parameters({theta: angle}).remove_final_measurements(inplace=False)
+            expected = np.abs(Statevector(bound).data) ** 2
+            # Every qubit is measured into the clbit of the same index: labels are basis indices
+            np.testing.assert_allclose(row, [expected[int(label, 2)] for label in labels], atol=1e-9)
+            assert row.sum() == pytest.approx(1)
+
+
+def test_only_circuits_for_the_fallback_are_transpiled(monkeypatch):
+    targets = []
+    monkeypatch.setattr(transpile_cache, "transpile", lambda qc, backend, **options: targets.append(backend) or qc)
+    aer = AerSimulator(method="statevector")
+    cache = transpile_cache.TranspileCache()
+    backend = NumpyStatevectorBackend(fallback=aer)
+
+    small, large = QuantumCircuit(2, 2), QuantumCircuit(NUMPY_MAX_QUBITS + 1, NUMPY_MAX_QUBITS + 1)
+    for qc in (small, large):
+        qc.h(0)
+        qc.measure(range(qc.num_qubits), range(qc.num_qubits))
+
+    assert cache.transpile(small, backend) is small
+    cache.transpile(large, backend)
+    assert targets == [aer]
+    assert cache.stats()["misses"] == 1
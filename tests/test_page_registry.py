@@ -0,0 +1,35 @@
+import sys
+
+import page_registry
+
+
+def test_snapshot_without_the_resource_module(monkeypatch):
+    monkeypatch.setattr(page_registry, "resource", None)
+    snapshot = page_registry._snapshot()
+    assert "max_rss_mib" not in snapshot
+    assert snapshot["modules_loaded"] == len(sys.modules)
+
+
+def test_max_rss_is_scaled_per_platform(monkeypatch):
+    class FakeResource:
+        RUSAGE_SELF = 0
+
+        @staticmethod
+        def getrusage(who):
+            return type("Usage", (), {"ru_maxrss": 2**21})
+
+    monkeypatch.setattr(page_registry, "resource", FakeResource)
+    monkeypatch.setattr(sys, "platform", "linux")
+    assert page_registry._max_rss_mib() == 2048  # KiB
+    monkeypatch.setattr(sys, "platform", "darwin")
+    assert page_registry._max_rss_mib() == 2  # bytes
+
+
+def test_load_module_records_the_first_import_only(monkeypatch):
+    monkeypatch.setattr(page_registry, "write_import_profile", lambda path=None: None)
+    monkeypatch.delitem(sys.modules, "colorsys", raising=False)
+    module = page_registry.load_module("colorsys")
+    assert module is sys.modules["colorsys"]
+    profile = page_registry.import_profile()["page_imports"]["colorsys"]
+    assert profile["new_modules"] >= 1
+    assert page_registry.load_module("colorsys") is module
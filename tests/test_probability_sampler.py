@@ -0,0 +1,59 @@
+import pytest
+
+pytest.importorskip("qiskit")
+
+from qiskit import ClassicalRegister, QuantumCircuit, QuantumRegister
+
+from circuit_builder import build_circuit, measure_circuit
+from probability_sampler import measured_probabilities, measurement_map, sample_counts
+
+
+def test_outcomes_follow_the_clbit_each_qubit_is_measured_into():
+    qc = QuantumCircuit(3, 3)
+    qc.x(0)
+    qc.h(2)
+    qc.measure(0, 2)  # qubit 0 (always 1) lands on the leftmost bit
+    qc.measure(2, 0)
+    assert measured_probabilities(qc) == {"100": pytest.approx(0.5), "101": pytest.approx(0.5)}
+
+
+def test_unmeasured_qubits_are_marginalized():
+    qc = QuantumCircuit(2, 1)
+    qc.h(0)
+    qc.cx(0, 1)
+    qc.measure(1, 0)
+    assert measured_probabilities(qc) == {"0": pytest.approx(0.5), "1": pytest.approx(0.5)}
+
+
+def test_circuits_without_an_exact_distribution_are_rejected():
+    gate_after_measure = QuantumCircuit(1, 1)
+    gate_after_measure.measure(0, 0)
+    gate_after_measure.h(0)
+    measured_twice = QuantumCircuit(1, 2)
+    measured_twice.measure(0, 0)
+    measured_twice.measure(0, 1)
+    reset = QuantumCircuit(1, 1)
+    reset.reset(0)
+    reset.measure(0, 0)
+    two_registers = QuantumCircuit(QuantumRegister(1), ClassicalRegister(1), ClassicalRegister(1))
+    for qc in (gate_after_measure, measured_twice, reset, two_registers):
+        assert measurement_map(qc) is None
+        assert measured_probabilities(qc) is None
+
+
+def test_sample_counts_draws_every_shot_from_possible_outcomes():
+    counts = sample_counts({"00": 0.5, "01": 0.0, "11": 0.5}, 100000, seed=3)
+    assert set(counts) == {"00", "11"}
+    assert sum(counts.values()) == 100000
+    assert counts["00"] / 100000 == pytest.approx(0.5, abs=0.01)
+    assert sample_counts({"00": 0.5, "11": 0.5}, 1000, seed=3) == sample_counts({"00": 0.5, "11": 0.5}, 1000, seed=3)
+
+
+def test_exact_mode_samples_the_circuit_distribution():
+    qc = build_circuit(3, [("h", [0]), ("cx", [0, 1]), ("ry", [2], 0.7)])
+    counts, probabilities = measure_circuit(qc, shots=10**6, mode="exact")
+    assert sum(counts.values()) == 10**6
+    assert len(probabilities) == 8
+    for state, n in counts.items():
+        assert n / 10**6 == pytest.approx(probabilities[int(state, 2)], abs=0.003)
+    assert set(counts) == {"000", "011", "100", "111"}
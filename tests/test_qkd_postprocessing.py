@@ -0,0 +1,28 @@
+import numpy as np
+
+from qkd_postprocessing import merge_frames, pack_bits, postprocess_stream, unpack_bits
+
+
+def test_merge_frames_joins_frame_bits_without_padding():
+    # Three frames whose final keys are not whole bytes
+    num_bits = 2**19 + 1000
+    rng = np.random.default_rng(0)
+    alice = rng.integers(0, 2, num_bits, dtype=np.uint8)
+    bob = alice ^ (rng.random(num_bits) < 0.03).astype(np.uint8)
+    alice_packed, _ = pack_bits(alice)
+    bob_packed, _ = pack_bits(bob)
+
+    frames = list(postprocess_stream(alice_packed, bob_packed, num_bits, 0.03, seed=1))
+    assert len(frames) > 1
+    assert any(f["final_bits"] % 8 for f in frames)
+
+    merged = merge_frames(frames)
+    expected = np.concatenate([unpack_bits(f["alice_key"], f["final_bits"]) for f in frames])
+    assert merged["final_bits"] == len(expected)
+    np.testing.assert_array_equal(unpack_bits(merged["key"], merged["final_bits"]), expected)
+
+
+def test_merge_frames_of_nothing_is_an_empty_key():
+    merged = merge_frames([])
+    assert merged["final_bits"] == 0
+    assert len(merged["key"]) == 0
@@ -0,0 +1,78 @@
+import pytest
+
+pytest.importorskip("qiskit")
+
+from qiskit import QuantumCircuit
+
+import result_cache
+from result_cache import ResultCache
+
+
+def bell():
+    qc = QuantumCircuit(2, 2)
+    qc.h(0)
+    qc.cx(0, 1)
+    qc.measure([0, 1], [0, 1])
+    return qc
+
+
+@pytest.fixture
+def runs(monkeypatch):
+    """Counts simulator runs; each one returns counts that depend on the seed."""
+    calls = []
+
+    def fake_simulate(qc, shots, seed, use_case):
+        calls.append(seed)
+        return {"00": shots - (seed or 0), "11": seed or 0}
+
+    monkeypatch.setattr(result_cache, "_simulate", fake_simulate)
+    return calls
+
+
+def test_seeded_runs_replay_the_cached_counts(runs):
+    cache = ResultCache()
+    first = cache.run(bell(), shots=100, seed=7)
+    assert cache.run(bell(), shots=100, seed=7) == first
+    assert runs == [7]
+    cache.run(bell(), shots=100, seed=8)
+    cache.run(bell(), shots=200, seed=7)
+    assert runs == [7, 8, 7]
+
+
+def test_unseeded_runs_resample_the_cached_probabilities(runs):
+    cache = ResultCache()
+    samples = [cache.run(bell(), shots=1000) for _ in range(5)]
+    assert runs == []
+    assert all(set(counts) <= {"00", "11"} and sum(counts.values()) == 1000 for counts in samples)
+    assert len({tuple(sorted(counts.items())) for counts in samples}) > 1  # fresh draws, not a replay
+    assert cache.stats()["entries"] == 1 and cache.stats()["hits"] == 4
+
+
+def test_mid_circuit_measurements_are_simulated_every_time(runs):
+    qc = QuantumCircuit(1, 1)
+    qc.h(0)
+    qc.measure(0, 0)
+    qc.h(0)
+    cache = ResultCache()
+    cache.run(qc, shots=10)
+    cache.run(qc, shots=10)
+    assert runs == [None, None]
+
+
+def test_entries_expire_after_the_ttl(runs, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(result_cache.time, "monotonic", lambda: now[0])
+    cache = ResultCache(ttl_seconds=60)
+    cache.run(bell(), seed=1)
+    now[0] += 59
+    cache.run(bell(), seed=1)
+    now[0] += 2
+    cache.run(bell(), seed=1)
+    assert runs == [1, 1]
+
+
+def test_least_recently_used_entries_are_evicted(runs):
+    cache = ResultCache(max_entries=2)
+    for seed in (1, 2, 1, 3, 1, 2):
+        cache.run(bell(), seed=seed)
+    assert runs == [1, 2, 3, 2]
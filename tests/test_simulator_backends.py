@@ -0,0 +1,87 @@
+import threading
+
+import pytest
+
+pytest.importorskip("qiskit_aer")
+
+from qiskit_aer import AerSimulator
+
+import simulator_backends
+from circuit_builder import build_circuit
+from numpy_statevector import NumpyStatevectorBackend
+
+
+@pytest.mark.parametrize("use_case", ["demos", "circuit_builder"])
+def test_small_circuit_use_cases_run_on_the_numpy_engine(use_case):
+    assert isinstance(simulator_backends.get_backend(use_case), NumpyStatevectorBackend)
+
+
+def test_game_bits_come_from_aer():
+    backend = simulator_backends.get_backend("game")
+    assert isinstance(backend, AerSimulator)
+    assert not isinstance(backend, NumpyStatevectorBackend)
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    """A private copy of the registry, so configure_backend cannot leak into other tests."""
+    monkeypatch.setattr(simulator_backends, "BACKEND_CONFIGS", dict(simulator_backends.BACKEND_CONFIGS))
+    monkeypatch.setattr(simulator_backends, "_backends", {})
+    return simulator_backends
+
+
+def test_each_use_case_gets_one_shared_instance(registry):
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(registry.get_backend("bb84"))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert all(backend is results[0] for backend in results)
+    assert registry.get_backend("bb84") is results[0]
+    assert registry.get_backend("default") is not results[0]
+
+
+def test_unknown_use_case_raises(registry):
+    with pytest.raises(KeyError):
+        registry.get_backend("no such page")
+
+
+def test_configure_backend_rebuilds_on_the_next_request(registry):
+    before = registry.get_backend("default")
+    config = registry.configure_backend("default", method="stabilizer", seed=3)
+    assert config == {"method": "stabilizer", "threads": 0, "seed": 3}
+    after = registry.get_backend("default")
+    assert after is not before
+    assert after.options.method == "stabilizer"
+
+
+def test_new_use_cases_start_from_the_default_settings(registry):
+    assert registry.configure_backend("experiments", threads=2) == {"method": "automatic", "threads": 2, "seed": None}
+    assert isinstance(registry.get_backend("experiments"), AerSimulator)
+
+
+def test_clifford_circuits_use_the_stabilizer_method():
+    qc = build_circuit(30, [("h", [0])] + [("cx", [i, i + 1]) for i in range(29)])
+    assert simulator_backends.choose_simulation_method(qc) == "stabilizer"
+    assert simulator_backends.estimate_memory_bytes(qc, "stabilizer") < 2**12
+
+
+def test_wide_low_entanglement_circuits_use_matrix_product_states():
+    qc = build_circuit(30, [("ry", [i], 0.3) for i in range(30)] + [("cx", [i, i + 1]) for i in range(29)])
+    assert simulator_backends.bond_bits(qc) == [1] * 29
+    assert simulator_backends.choose_simulation_method(qc) == "matrix_product_state"
+    assert simulator_backends.estimate_memory_bytes(qc, "matrix_product_state") < 2**20
+
+
+def test_bond_bits_are_capped_by_the_smaller_side():
+    qc = build_circuit(4, [("ccx", [0, 1, 3])] * 5 + [("ry", [0], 0.1)])
+    assert simulator_backends.bond_bits(qc) == [1, 2, 1]
+
+
+def test_small_or_highly_entangled_circuits_use_the_statevector():
+    assert simulator_backends.choose_simulation_method(build_circuit(3, [("ry", [0], 0.1)])) == "statevector"
+    gates = [("ry", [0], 0.1)] + [("swap", [0, 29])] * 5
+    qc = build_circuit(30, gates)
+    assert simulator_backends.choose_simulation_method(qc) == "statevector"
+    assert simulator_backends.estimate_memory_bytes(qc, "statevector") == 16 * 2**30
@@ -0,0 +1,78 @@
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("qiskit")
+
+from qiskit import QuantumCircuit
+
+import transpile_cache
+from transpile_cache import TranspileCache, circuit_key
+
+BACKEND = SimpleNamespace(name="target", num_qubits=None, operation_names={"h", "cx", "rz", "measure"})
+
+
+def bell(angle=None):
+    qc = QuantumCircuit(2, 2)
+    qc.h(0)
+    qc.cx(0, 1)
+    if angle is not None:
+        qc.rz(angle, 1)
+    qc.measure([0, 1], [0, 1])
+    return qc
+
+
+@pytest.fixture
+def compiles(monkeypatch):
+    """Records every real compilation; the 'compiled' circuit is a fresh copy."""
+    calls = []
+
+    def fake_transpile(qc, backend, **options):
+        calls.append((circuit_key(qc), options))
+        return qc.copy()
+
+    monkeypatch.setattr(transpile_cache, "transpile", fake_transpile)
+    return calls
+
+
+def test_structurally_equal_circuits_share_a_key():
+    assert circuit_key(bell()) == circuit_key(bell())
+    assert circuit_key(bell(0.5)) == circuit_key(bell(0.5))
+    assert circuit_key(bell(0.5)) != circuit_key(bell(0.6))
+    assert circuit_key(bell()) != circuit_key(bell(0.5))
+
+
+def test_repeat_circuits_compile_once(compiles):
+    cache = TranspileCache()
+    first = cache.transpile(bell(), BACKEND)
+    assert cache.transpile(bell(), BACKEND) is first
+    assert len(compiles) == 1
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+
+def test_options_and_backends_are_part_of_the_key(compiles):
+    cache = TranspileCache()
+    cache.transpile(bell(), BACKEND)
+    cache.transpile(bell(), BACKEND, optimization_level=3)
+    cache.transpile(bell(), SimpleNamespace(name="other", num_qubits=5, operation_names={"h", "cx"}))
+    assert len(compiles) == 3
+
+
+def test_least_recently_used_entries_are_evicted(compiles):
+    cache = TranspileCache(max_entries=2)
+    cache.transpile(bell(0.1), BACKEND)
+    cache.transpile(bell(0.2), BACKEND)
+    cache.transpile(bell(0.1), BACKEND)  # 0.2 is now the oldest
+    cache.transpile(bell(0.3), BACKEND)
+    assert cache.stats()["evictions"] == 1
+    cache.transpile(bell(0.1), BACKEND)
+    assert len(compiles) == 3
+    cache.transpile(bell(0.2), BACKEND)
+    assert len(compiles) == 4
+
+
+def test_in_process_engines_skip_compilation(compiles):
+    engine = SimpleNamespace(transpile_target=lambda qc: None)
+    qc = bell()
+    assert TranspileCache().transpile(qc, engine) is qc
+    assert compiles == []
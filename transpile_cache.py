@@ -0,0 +1,111 @@
+import threading
+from collections import OrderedDict
+
+from qiskit import transpile
+
+DEFAULT_MAX_ENTRIES = 256
+
+
+def _param_key(param):
+    """Hashable form of a gate parameter (numbers stay numbers, symbols become their name)."""
+    if isinstance(param, (int, float, complex, str)):
+        return param
+    return str(param)
+
+
+def circuit_key(qc):
+    """
+    Structural key of a circuit: register layout plus the gate sequence with
+    parameters, qubit and clbit indices. Two circuits with the same key
+    transpile (and simulate) identically, whatever their Python identity.
+    """
+    ops = tuple(
+        (
+            instruction.operation.name,
+            tuple(_param_key(p) for p in instruction.operation.params),
+            tuple(qc.find_bit(q).index for q in instruction.qubits),
+            tuple(qc.find_bit(c).index for c in instruction.clbits),
+        )
+        for instruction in qc.data
+    )
+    registers = (
+        tuple((r.name, r.size) for r in qc.qregs),
+        tuple((r.name, r.size) for r in qc.cregs),
+    )
+    return registers, ops
+
+
+def backend_key(backend):
+    """Identifies the compilation target of a backend."""
+    return backend.name, backend.num_qubits, frozenset(backend.operation_names)
+
+
+class TranspileCache:
+    """LRU cache of transpiled circuits keyed by circuit structure and backend target."""
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def transpile(self, qc, backend, **options):
+        """Returns transpile(qc, backend, **options), compiling only on a cache miss."""
+        if hasattr(backend, "transpile_target"):
+            # In-process engines (numpy_statevector) apply the builder's gates directly
+            # and hand everything else to a simulator that does need transpiled circuits
+            backend = backend.transpile_target(qc)
+            if backend is None:
+                return qc
+        key = (circuit_key(qc), backend_key(backend), tuple(sorted(options.items())))
+
+        with self._lock:
+            compiled = self._entries.get(key)
+            if compiled is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return compiled
+            self.misses += 1
+
+        # Compile outside the lock so other sessions are not held up
+        compiled = transpile(qc, backend, **options)
+
+        with self._lock:
+            self._entries[key] = compiled
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return compiled
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+
+_cache = TranspileCache()
+
+
+def cached_transpile(qc, backend, **options):
+    """Drop-in replacement for qiskit.transpile backed by the process-wide cache."""
+    return _cache.transpile(qc, backend, **options)
+
+
+def transpile_cache_stats():
+    """Hit/miss statistics of the process-wide transpile cache."""
+    return _cache.stats()